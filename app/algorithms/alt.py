@@ -0,0 +1,141 @@
+"""A* search with landmark lower bounds (ALT) for directed graphs."""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Tuple
+
+from app.algorithms.dijkstra import Adjacency, PathResult, shortest_path_tree
+
+
+@dataclass(frozen=True)
+class Landmarks:
+    """
+    Precomputed distances to and from a small set of landmark nodes.
+
+    By the triangle inequality, for any landmark L:
+        d(v, t) >= d(v, L) - d(t, L)
+        d(v, t) >= d(L, t) - d(L, v)
+    The maximum over all landmarks is an admissible, consistent heuristic.
+    """
+    nodes: Tuple[str, ...]
+    # from_landmark[i][v] = d(L_i, v), via a forward search from L_i
+    from_landmark: Tuple[Mapping[str, int], ...]
+    # to_landmark[i][v] = d(v, L_i), via a backward search from L_i
+    to_landmark: Tuple[Mapping[str, int], ...]
+
+    def lower_bound(self, node: str, target: str) -> int:
+        """Return a lower bound on d(node, target) from all landmarks."""
+        best = 0
+        for d_from, d_to in zip(self.from_landmark, self.to_landmark):
+            # Skip terms where a distance is infinite (unreachable).
+            if node in d_to and target in d_to:
+                best = max(best, d_to[node] - d_to[target])
+            if target in d_from and node in d_from:
+                best = max(best, d_from[target] - d_from[node])
+        return best
+
+
+def select_landmarks(graph: Adjacency, reverse: Adjacency, count: int) -> Landmarks:
+    """
+    Pick landmarks with the farthest-point heuristic and precompute distances.
+
+    The first landmark is the lexicographically smallest node; each next one
+    maximises its distance (in either direction) from the landmarks chosen
+    so far, which spreads them around the periphery of the network.
+    """
+    nodes = set(graph)
+    for out in graph.values():
+        nodes.update(v for v, _ in out)
+    if not nodes or count <= 0:
+        return Landmarks(nodes=(), from_landmark=(), to_landmark=())
+
+    chosen: List[str] = []
+    from_maps: List[Dict[str, int]] = []
+    to_maps: List[Dict[str, int]] = []
+    candidate = min(nodes)
+
+    while candidate is not None and len(chosen) < count:
+        chosen.append(candidate)
+        from_maps.append(dict(shortest_path_tree(graph, candidate).dist))
+        to_maps.append(dict(shortest_path_tree(reverse, candidate).dist))
+
+        # Next landmark: farthest from its closest chosen landmark.
+        candidate = None
+        best = -1
+        for node in sorted(nodes.difference(chosen)):
+            gaps = [
+                max(d_from.get(node, 0), d_to.get(node, 0))
+                for d_from, d_to in zip(from_maps, to_maps)
+            ]
+            score = min(gaps)
+            if score > best:
+                best = score
+                candidate = node
+
+    return Landmarks(
+        nodes=tuple(chosen),
+        from_landmark=tuple(from_maps),
+        to_landmark=tuple(to_maps),
+    )
+
+
+def alt_shortest_path(
+    graph: Adjacency,
+    landmarks: Landmarks,
+    start: str,
+    target: str,
+) -> PathResult | None:
+    """
+    A* search guided by landmark lower bounds.
+
+    Args:
+        graph: Directed adjacency (u -> [(v, w)]).
+        landmarks: Landmarks precomputed for this graph (select_landmarks()).
+        start: Starting node id.
+        target: Target node id.
+
+    Returns:
+        PathResult (with settled = nodes settled), or None if unreachable.
+    """
+    h_cache: Dict[str, int] = {}
+
+    def h(node: str) -> int:
+        value = h_cache.get(node)
+        if value is None:
+            value = h_cache[node] = landmarks.lower_bound(node, target)
+        return value
+
+    # Min-heap: (distance_so_far + heuristic, node)
+    heap: List[Tuple[int, str]] = [(h(start), start)]
+    dist: Dict[str, int] = {start: 0}
+    prev: Dict[str, str] = {}
+    visited = set()
+
+    while heap:
+        _, node = heapq.heappop(heap)
+        if node in visited:
+            continue
+        visited.add(node)
+
+        if node == target:
+            break
+
+        cur_dist = dist[node]
+        for neighbor, weight in graph.get(node, ()):
+            new_dist = cur_dist + weight
+            if neighbor not in dist or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                prev[neighbor] = node
+                heapq.heappush(heap, (new_dist + h(neighbor), neighbor))
+
+    if target not in visited:
+        return None
+
+    path = [target]
+    while path[-1] != start:
+        path.append(prev[path[-1]])
+    path.reverse()
+
+    return PathResult(path=path, total_weight=dist[target], settled=len(visited))
@@ -0,0 +1,92 @@
+"""Bidirectional Dijkstra for directed, positively weighted graphs."""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Tuple
+
+from app.algorithms.dijkstra import Adjacency, PathResult
+
+
+def bidirectional_shortest_path(
+    graph: Adjacency,
+    reverse: Adjacency,
+    start: str,
+    target: str,
+) -> PathResult | None:
+    """
+    Search forward from start and backward from target until they meet.
+
+    Gates are directed and asymmetric, so the backward search runs over the
+    transpose graph (see build_reverse_adjacency / GraphSnapshot).
+
+    Args:
+        graph: Directed adjacency (u -> [(v, w)]).
+        reverse: Transpose adjacency (v -> [(u, w)]).
+        start: Starting node id.
+        target: Target node id.
+
+    Returns:
+        PathResult (with settled = nodes settled by both searches), or None
+        if the target is unreachable.
+    """
+    if start == target:
+        return PathResult(path=[start], total_weight=0, settled=1)
+
+    dist_f: Dict[str, int] = {start: 0}
+    dist_b: Dict[str, int] = {target: 0}
+    prev_f: Dict[str, str] = {}
+    next_b: Dict[str, str] = {}
+    heap_f: List[Tuple[int, str]] = [(0, start)]
+    heap_b: List[Tuple[int, str]] = [(0, target)]
+    done_f: set = set()
+    done_b: set = set()
+
+    best = None
+    meet = None
+
+    while heap_f and heap_b:
+        # Stop once no undiscovered path can beat the best meeting found.
+        if best is not None and heap_f[0][0] + heap_b[0][0] >= best:
+            break
+
+        # Expand the side with the smaller frontier key.
+        if heap_f[0][0] <= heap_b[0][0]:
+            heap, dist, other, done, links, adj = (
+                heap_f, dist_f, dist_b, done_f, prev_f, graph)
+        else:
+            heap, dist, other, done, links, adj = (
+                heap_b, dist_b, dist_f, done_b, next_b, reverse)
+
+        cur_dist, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        done.add(node)
+
+        for neighbor, weight in adj.get(node, ()):
+            new_dist = cur_dist + weight
+            if neighbor not in dist or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                links[neighbor] = node
+                heapq.heappush(heap, (new_dist, neighbor))
+            if neighbor in other:
+                total = dist[neighbor] + other[neighbor]
+                if best is None or total < best:
+                    best = total
+                    meet = neighbor
+
+    if best is None:
+        return None
+
+    path = [meet]
+    while path[-1] != start:
+        path.append(prev_f[path[-1]])
+    path.reverse()
+    while path[-1] != target:
+        path.append(next_b[path[-1]])
+
+    return PathResult(
+        path=path,
+        total_weight=best,
+        settled=len(done_f) + len(done_b),
+    )
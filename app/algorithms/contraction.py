@@ -0,0 +1,334 @@
+"""Contraction hierarchies for fast point-to-point queries on large networks."""
+
+from __future__ import annotations
+
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from app.algorithms.dijkstra import Adjacency, PathResult
+
+# Witness searches give up after settling this many nodes. Giving up only
+# adds a (possibly redundant) shortcut, so the limit trades preprocessing
+# time against hierarchy size, never correctness.
+DEFAULT_WITNESS_SETTLE_LIMIT = 200
+# Cheaper cap used only when estimating node priorities.
+ESTIMATE_SETTLE_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class ContractionHierarchy:
+    """
+    Preprocessed network answering queries with two small upward searches.
+
+    Every node has a rank (its contraction order). up[u] holds edges u -> w
+    with rank[w] > rank[u]; down[w] holds edges u -> w with rank[u] > rank[w],
+    stored from w's side so a backward search from the target also only
+    climbs. middle maps a shortcut (u * n + w) to the node it bypasses.
+    """
+    version: int
+    codes: Tuple[str, ...]
+    index: Mapping[str, int]
+    rank: Tuple[int, ...]
+    up: Tuple[Tuple[Tuple[int, int], ...], ...]
+    down: Tuple[Tuple[Tuple[int, int], ...], ...]
+    middle: Mapping[int, int]
+    build_seconds: float
+
+    @property
+    def shortcut_count(self) -> int:
+        """Number of shortcut edges added during contraction."""
+        return len(self.middle)
+
+    def path(self, start: str, target: str) -> PathResult | None:
+        """
+        Bidirectional upward search, then unpack shortcuts into the gate path.
+
+        Returns:
+            PathResult (settled = nodes settled by both searches), or None if
+            either node is unknown or the target is unreachable.
+        """
+        s = self.index.get(start)
+        t = self.index.get(target)
+        if s is None or t is None:
+            return None
+        if s == t:
+            return PathResult(path=[start], total_weight=0, settled=1)
+
+        dist_f, prev_f, settled_f = self._upward(s, self.up, self.down)
+        dist_b, prev_b, settled_b = self._upward(t, self.down, self.up)
+
+        best = None
+        meet = None
+        for node, d in dist_f.items():
+            other = dist_b.get(node)
+            if other is not None and (best is None or d + other < best):
+                best = d + other
+                meet = node
+        if best is None:
+            return None
+
+        # Packed edge sequence s -> meet (forward) then meet -> t (backward).
+        hops: List[Tuple[int, int]] = []
+        node = meet
+        while node != s:
+            hops.append((prev_f[node], node))
+            node = prev_f[node]
+        hops.reverse()
+        node = meet
+        while node != t:
+            hops.append((node, prev_b[node]))
+            node = prev_b[node]
+
+        ids = [s]
+        for u, w in hops:
+            self._unpack(u, w, ids)
+
+        return PathResult(
+            path=[self.codes[i] for i in ids],
+            total_weight=best,
+            settled=settled_f + settled_b,
+        )
+
+    def _upward(
+        self,
+        source: int,
+        graph: Tuple[Tuple[Tuple[int, int], ...], ...],
+        opposite: Tuple[Tuple[Tuple[int, int], ...], ...],
+    ) -> Tuple[Dict[int, int], Dict[int, int], int]:
+        # Dijkstra restricted to upward edges; the search space is small
+        # because only higher-ranked nodes are reachable. Stall-on-demand:
+        # a node reachable more cheaply via a higher-ranked neighbour cannot
+        # lie on a shortest up-down path, so its edges are not relaxed.
+        dist: Dict[int, int] = {source: 0}
+        prev: Dict[int, int] = {}
+        done = set()
+        heap: List[Tuple[int, int]] = [(0, source)]
+        while heap:
+            cur_dist, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            stalled = False
+            for higher, weight in opposite[node]:
+                d = dist.get(higher)
+                if d is not None and d + weight < cur_dist:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+            for neighbor, weight in graph[node]:
+                new_dist = cur_dist + weight
+                if neighbor not in dist or new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    prev[neighbor] = node
+                    heapq.heappush(heap, (new_dist, neighbor))
+        return dist, prev, len(done)
+
+    def _unpack(self, u: int, w: int, out: List[int]) -> None:
+        # Iterative unpacking: replace each shortcut by its two halves.
+        n = len(self.codes)
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            mid = self.middle.get(a * n + b)
+            if mid is None:
+                out.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+
+
+def _witness_distances(
+    out_w: List[Dict[int, int]],
+    source: int,
+    skip: int,
+    targets: set,
+    bound: int,
+    settle_limit: int,
+) -> Dict[int, int]:
+    """Bounded Dijkstra from source in the remaining graph, avoiding skip."""
+    dist: Dict[int, int] = {source: 0}
+    done = set()
+    heap: List[Tuple[int, int]] = [(0, source)]
+    remaining = len(targets)
+    while heap and len(done) < settle_limit:
+        cur_dist, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        if cur_dist > bound:
+            break
+        done.add(node)
+        if node in targets:
+            remaining -= 1
+            if remaining == 0:
+                break
+        for neighbor, weight in out_w[node].items():
+            if neighbor == skip:
+                continue
+            new_dist = cur_dist + weight
+            if neighbor not in dist or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                heapq.heappush(heap, (new_dist, neighbor))
+    return dist
+
+
+def _shortcuts_for(
+    v: int,
+    out_w: List[Dict[int, int]],
+    in_w: List[Dict[int, int]],
+    settle_limit: int,
+) -> List[Tuple[int, int, int]]:
+    """Return the (u, w, weight) shortcuts needed to contract v."""
+    shortcuts = []
+    outgoing = out_w[v]
+    if not outgoing:
+        return shortcuts
+    max_out = max(outgoing.values())
+
+    for u, w_uv in in_w[v].items():
+        targets = {w for w in outgoing if w != u}
+        if not targets:
+            continue
+        dist = _witness_distances(
+            out_w, u, v, targets, w_uv + max_out, settle_limit)
+        for w in targets:
+            via = w_uv + outgoing[w]
+            witness = dist.get(w)
+            if witness is None or witness > via:
+                shortcuts.append((u, w, via))
+    return shortcuts
+
+
+def build_contraction_hierarchy(
+    adjacency: Adjacency,
+    nodes: Iterable[str] = (),
+    version: int = 0,
+    witness_settle_limit: int = DEFAULT_WITNESS_SETTLE_LIMIT,
+) -> ContractionHierarchy:
+    """
+    Contract every node in edge-difference order, adding shortcuts as needed.
+
+    Edge direction is respected throughout: a shortcut u -> w is only added
+    for an existing u -> v -> w path, and only when a bounded witness search
+    finds no path from u to w (avoiding v) that is at least as cheap.
+
+    Args:
+        adjacency: Validated directed adjacency (e.g. GraphSnapshot.adjacency).
+        nodes: Extra node ids to index even if they have no edges.
+        version: Graph version the hierarchy is built from.
+        witness_settle_limit: Settle cap for each witness search.
+
+    Returns:
+        ContractionHierarchy ready for path() queries.
+    """
+    started = time.perf_counter()
+
+    all_nodes = set(nodes)
+    for u, out in adjacency.items():
+        all_nodes.add(u)
+        all_nodes.update(v for v, _ in out)
+    codes = tuple(sorted(all_nodes))
+    index = {code: i for i, code in enumerate(codes)}
+    n = len(codes)
+
+    # Working graph of not-yet-contracted nodes (cheapest parallel edge wins).
+    out_w: List[Dict[int, int]] = [{} for _ in range(n)]
+    in_w: List[Dict[int, int]] = [{} for _ in range(n)]
+    for u, out in adjacency.items():
+        ui = index[u]
+        for v, w in out:
+            vi = index[v]
+            if ui == vi:
+                continue
+            if w < out_w[ui].get(vi, w + 1):
+                out_w[ui][vi] = w
+                in_w[vi][ui] = w
+
+    # Every edge ever present (original or shortcut), keyed u * n + w.
+    all_edges: Dict[int, int] = {}
+    for ui in range(n):
+        for vi, w in out_w[ui].items():
+            all_edges[ui * n + vi] = w
+    middle: Dict[int, int] = {}
+
+    contracted_neighbors = [0] * n
+    level = [0] * n
+    # Priorities are estimated with cheaper witness searches; the real
+    # shortcut set is always computed with the full limit.
+    estimate_limit = min(witness_settle_limit, ESTIMATE_SETTLE_LIMIT)
+
+    def evaluate(
+        v: int, settle_limit: int = witness_settle_limit
+    ) -> Tuple[int, List[Tuple[int, int, int]]]:
+        shortcuts = _shortcuts_for(v, out_w, in_w, settle_limit)
+        removed = len(out_w[v]) + len(in_w[v])
+        edge_difference = len(shortcuts) - removed
+        return 2 * edge_difference + contracted_neighbors[v] + level[v], shortcuts
+
+    prio = [evaluate(v, estimate_limit)[0] for v in range(n)]
+    heap = [(p, v) for v, p in enumerate(prio)]
+    heapq.heapify(heap)
+    rank = [0] * n
+    contracted = [False] * n
+    order = 0
+
+    while heap:
+        key_prio, v = heapq.heappop(heap)
+        if contracted[v] or key_prio != prio[v]:
+            continue
+        # Lazy update: re-evaluate and defer if no longer the cheapest.
+        current, shortcuts = evaluate(v)
+        if heap and current > heap[0][0]:
+            prio[v] = current
+            heapq.heappush(heap, (current, v))
+            continue
+
+        for u, w, weight in shortcuts:
+            if weight < out_w[u].get(w, weight + 1):
+                out_w[u][w] = weight
+                in_w[w][u] = weight
+                key = u * n + w
+                if weight < all_edges.get(key, weight + 1):
+                    all_edges[key] = weight
+                    middle[key] = v
+
+        neighbors = set(in_w[v]) | set(out_w[v])
+        for u in in_w[v]:
+            del out_w[u][v]
+        for w in out_w[v]:
+            del in_w[w][v]
+        out_w[v] = {}
+        in_w[v] = {}
+
+        contracted[v] = True
+        rank[v] = order
+        order += 1
+
+        # Neighbours' degrees changed, so refresh their priorities now.
+        for x in neighbors:
+            contracted_neighbors[x] += 1
+            level[x] = max(level[x], level[v] + 1)
+            prio[x] = evaluate(x, estimate_limit)[0]
+            heapq.heappush(heap, (prio[x], x))
+
+    up: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+    down: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+    for key, weight in all_edges.items():
+        u, w = divmod(key, n)
+        if rank[w] > rank[u]:
+            up[u].append((w, weight))
+        else:
+            down[w].append((u, weight))
+
+    return ContractionHierarchy(
+        version=version,
+        codes=codes,
+        index=index,
+        rank=tuple(rank),
+        up=tuple(tuple(edges) for edges in up),
+        down=tuple(tuple(edges) for edges in down),
+        middle=middle,
+        build_seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,173 @@
+"""Compact integer-indexed CSR graph and a Dijkstra that runs over it."""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, List, Mapping, Tuple
+
+from app.algorithms.dijkstra import PathResult
+
+# Heap entries pack (distance, node) into one int so the hot loop pushes
+# plain ints instead of allocating a tuple per relaxation.
+_NODE_BITS = 32
+_NODE_MASK = (1 << _NODE_BITS) - 1
+
+# Sentinel for "no distance" / "no predecessor" in the array-backed state.
+_UNSET = -1
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """
+    Directed graph in compressed sparse row form.
+
+    Gate codes are interned to dense integer ids. The outgoing edges of node
+    i are targets[offsets[i]:offsets[i + 1]] with matching weights, so the
+    whole edge set lives in three flat machine-word arrays (or read-only
+    memoryviews over a shared file; see app.services.shared_graph).
+    """
+    codes: Tuple[str, ...]
+    index: Mapping[str, int]
+    offsets: array
+    targets: array
+    weights: array
+
+    @property
+    def node_count(self) -> int:
+        """Number of interned nodes."""
+        return len(self.codes)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of directed edges."""
+        return len(self.targets)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the CSR arrays, in bytes."""
+        return sum(
+            len(a) * a.itemsize for a in (self.offsets, self.targets, self.weights)
+        )
+
+
+def csr_from_edges(
+    edges: Iterable[Tuple[str, str, int]],
+    nodes: Iterable[str] = (),
+) -> CSRGraph:
+    """
+    Convert (from, to, weight) edges into a CSRGraph.
+
+    Args:
+        edges: Directed edges as (from_node, to_node, weight).
+        nodes: Extra node ids to intern even if they have no edges.
+
+    Raises:
+        ValueError: If any edge has a non-positive weight (Dijkstra precondition).
+    """
+    edge_list = list(edges)
+
+    all_nodes = set(nodes)
+    for u, v, w in edge_list:
+        if w <= 0:
+            raise ValueError("Dijkstra requires all weights to be positive")
+        all_nodes.add(u)
+        all_nodes.add(v)
+
+    codes = tuple(sorted(all_nodes))
+    index = {code: i for i, code in enumerate(codes)}
+    if len(codes) > _NODE_MASK:
+        raise ValueError("graph has too many nodes for CSR packing")
+
+    # Counting sort of edges by source id.
+    n = len(codes)
+    counts = [0] * (n + 1)
+    for u, _, _ in edge_list:
+        counts[index[u] + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+
+    offsets = array("q", counts)
+    cursor = counts[:n]
+    targets = array("l", [0]) * len(edge_list)
+    weights = array("q", [0]) * len(edge_list)
+    for u, v, w in edge_list:
+        slot = cursor[index[u]]
+        cursor[index[u]] += 1
+        targets[slot] = index[v]
+        weights[slot] = w
+
+    return CSRGraph(
+        codes=codes,
+        index=index,
+        offsets=offsets,
+        targets=targets,
+        weights=weights,
+    )
+
+
+def csr_shortest_path(graph: CSRGraph, start: str, target: str) -> PathResult | None:
+    """
+    Run Dijkstra over a CSRGraph with array-backed dist/prev state.
+
+    Args:
+        graph: Graph built by csr_from_edges().
+        start: Starting node id.
+        target: Target node id.
+
+    Returns:
+        PathResult with path=[start..target] and total_weight, or None if
+        either node is unknown or the target is unreachable.
+    """
+    s = graph.index.get(start)
+    t = graph.index.get(target)
+    if s is None or t is None:
+        return None
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = graph.node_count
+    dist = array("q", [_UNSET]) * n
+    prev = array("l", [_UNSET]) * n
+    done = bytearray(n)
+    dist[s] = 0
+
+    heap: List[int] = [s]
+    settled = 0
+    push, pop = heapq.heappush, heapq.heappop
+
+    while heap:
+        key = pop(heap)
+        node = key & _NODE_MASK
+        if done[node]:
+            continue
+        done[node] = 1
+        settled += 1
+
+        if node == t:
+            break
+
+        cur_dist = key >> _NODE_BITS
+        for i in range(offsets[node], offsets[node + 1]):
+            # Index in place: slicing would copy both arrays per settled node.
+            neighbor = targets[i]
+            new_dist = cur_dist + weights[i]
+            old = dist[neighbor]
+            if old == _UNSET or new_dist < old:
+                dist[neighbor] = new_dist
+                prev[neighbor] = node
+                push(heap, (new_dist << _NODE_BITS) | neighbor)
+
+    if dist[t] == _UNSET:
+        return None
+
+    ids = [t]
+    while ids[-1] != s:
+        ids.append(prev[ids[-1]])
+    ids.reverse()
+
+    return PathResult(
+        path=[graph.codes[i] for i in ids],
+        total_weight=dist[t],
+        settled=settled,
+    )
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import heapq
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+# Adjacency: node -> outgoing (neighbor, weight) pairs.
+Adjacency = Mapping[str, Sequence[Tuple[str, int]]]
 
 
 @dataclass(frozen=True)
@@ -12,35 +15,48 @@ class PathResult:
     """Shortest-path output: full path plus total weight."""
     path: List[str]
     total_weight: int
+    # Nodes popped and finalised by the search; diagnostic only, so two
+    # engines agreeing on a path compare equal even if they did more work.
+    settled: int = field(default=0, compare=False)
 
 
-def dijkstra_shortest_path(
-    edges: List[Tuple[str, str, int]],
-    start: str,
-    target: str,
-) -> PathResult | None:
+def build_adjacency(
+    edges: Iterable[Tuple[str, str, int]],
+) -> Dict[str, List[Tuple[str, int]]]:
     """
-    Compute the shortest path in a directed, positively weighted graph.
-
-    Args:
-        edges: Directed edges as (from_node, to_node, weight).
-        start: Starting node id.
-        target: Target node id.
-
-    Returns:
-        PathResult with path=[start..target] and total_weight, or None if
-        the target is unreachable.
+    Build a directed adjacency list, validating every edge weight.
 
     Raises:
         ValueError: If any edge has a non-positive weight (Dijkstra precondition).
     """
-    # Build adjacency list to preserve directed edge weights.
     graph: Dict[str, List[Tuple[str, int]]] = {}
     for u, v, w in edges:
         if w <= 0:
             raise ValueError("Dijkstra requires all weights to be positive")
         graph.setdefault(u, []).append((v, w))
+    return graph
+
+
+def build_reverse_adjacency(graph: Adjacency) -> Dict[str, List[Tuple[str, int]]]:
+    """Return the transpose graph: v -> (u, w) for every edge u -> v."""
+    reverse: Dict[str, List[Tuple[str, int]]] = {}
+    for u, out in graph.items():
+        for v, w in out:
+            reverse.setdefault(v, []).append((u, w))
+    return reverse
 
+
+def _search(
+    graph: Adjacency,
+    start: str,
+    target: str | None,
+) -> Tuple[Dict[str, int], Dict[str, str], int]:
+    """
+    Core Dijkstra loop shared by point-to-point and full-tree searches.
+
+    Stops as soon as target is settled; with target=None it settles every
+    node reachable from start. Also returns the number of settled nodes.
+    """
     # Min-heap: (distance_so_far, node)
     heap: List[Tuple[int, str]] = [(0, start)]
     dist: Dict[str, int] = {start: 0}
@@ -57,20 +73,101 @@ def dijkstra_shortest_path(
         if node == target:
             break
 
-        for neighbor, weight in graph.get(node, []):
+        for neighbor, weight in graph.get(node, ()):
             new_dist = cur_dist + weight
             if neighbor not in dist or new_dist < dist[neighbor]:
                 dist[neighbor] = new_dist
                 prev[neighbor] = node
                 heapq.heappush(heap, (new_dist, neighbor))
 
-    if target not in dist:
-        return None
+    return dist, prev, len(visited)
 
-    # Reconstruct path
+
+def _reconstruct(prev: Mapping[str, str], start: str, target: str) -> List[str]:
+    """Walk predecessor links back from target to start."""
     path = [target]
     while path[-1] != start:
         path.append(prev[path[-1]])
     path.reverse()
+    return path
+
+
+@dataclass(frozen=True)
+class ShortestPathTree:
+    """Distances and predecessors from one source to every reachable node."""
+    source: str
+    dist: Mapping[str, int]
+    prev: Mapping[str, str]
+
+    def path_to(self, target: str) -> PathResult | None:
+        """Return the shortest path from the source to target, or None."""
+        if target not in self.dist:
+            return None
+        return PathResult(
+            path=_reconstruct(self.prev, self.source, target),
+            total_weight=self.dist[target],
+        )
+
+
+def shortest_path_on_adjacency(
+    graph: Adjacency,
+    start: str,
+    target: str,
+) -> PathResult | None:
+    """
+    Run Dijkstra over a prebuilt, already-validated adjacency list.
+
+    Args:
+        graph: Directed adjacency as produced by build_adjacency().
+        start: Starting node id.
+        target: Target node id.
+
+    Returns:
+        PathResult with path=[start..target] and total_weight, or None if
+        the target is unreachable.
+    """
+    dist, prev, settled = _search(graph, start, target)
+
+    if target not in dist:
+        return None
+
+    return PathResult(
+        path=_reconstruct(prev, start, target),
+        total_weight=dist[target],
+        settled=settled,
+    )
 
-    return PathResult(path=path, total_weight=dist[target])
+
+def shortest_path_tree(graph: Adjacency, start: str) -> ShortestPathTree:
+    """
+    Run one full Dijkstra from start (no early exit) over a prebuilt adjacency.
+
+    The resulting tree answers start -> X for every reachable X without
+    repeating the search.
+    """
+    dist, prev, _ = _search(graph, start, None)
+    return ShortestPathTree(source=start, dist=dist, prev=prev)
+
+
+def dijkstra_shortest_path(
+    edges: List[Tuple[str, str, int]],
+    start: str,
+    target: str,
+) -> PathResult | None:
+    """
+    Compute the shortest path in a directed, positively weighted graph.
+
+    Args:
+        edges: Directed edges as (from_node, to_node, weight).
+        start: Starting node id.
+        target: Target node id.
+
+    Returns:
+        PathResult with path=[start..target] and total_weight, or None if
+        the target is unreachable.
+
+    Raises:
+        ValueError: If any edge has a non-positive weight (Dijkstra precondition).
+    """
+    # Build adjacency list to preserve directed edge weights.
+    return shortest_path_on_adjacency(build_adjacency(edges), start, target)
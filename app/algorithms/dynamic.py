@@ -0,0 +1,206 @@
+"""Incremental repair of an all-pairs routing table after a few edge changes."""
+
+from __future__ import annotations
+
+import heapq
+import time
+from array import array
+from dataclasses import dataclass, replace
+from typing import Dict, List, Sequence, Set, Tuple
+
+from app.algorithms.dijkstra import Adjacency
+from app.algorithms.routing_table import UNREACHABLE, RoutingTable
+
+
+@dataclass(frozen=True)
+class EdgeChange:
+    """One directed edge whose weight differs between two graph versions."""
+    from_code: str
+    to_code: str
+    # None means the edge does not exist on that side (insert/delete).
+    old_weight: int | None
+    new_weight: int | None
+
+
+def _edge_weights(adjacency: Adjacency) -> Dict[Tuple[str, str], int]:
+    # Parallel routes collapse to the cheapest one, as in any shortest path.
+    weights: Dict[Tuple[str, str], int] = {}
+    for u, out in adjacency.items():
+        for v, w in out:
+            key = (u, v)
+            if key not in weights or w < weights[key]:
+                weights[key] = w
+    return weights
+
+
+def diff_adjacency(old: Adjacency, new: Adjacency) -> List[EdgeChange]:
+    """Return the edge insertions, deletions and reweightings from old to new."""
+    before = _edge_weights(old)
+    after = _edge_weights(new)
+    changes = []
+    for key in sorted(before.keys() | after.keys()):
+        old_weight, new_weight = before.get(key), after.get(key)
+        if old_weight != new_weight:
+            changes.append(EdgeChange(key[0], key[1], old_weight, new_weight))
+    return changes
+
+
+class _Workspace:
+    """Mutable copies of a table's matrices plus the evolving weighted graph."""
+
+    def __init__(self, table: RoutingTable, weights: Dict[Tuple[str, str], int]) -> None:
+        self.n = len(table.codes)
+        self.index = table.index
+        # Fresh writable arrays; the table's may be read-only shared memory.
+        self.dist = array("q", memoryview(table.dist).tobytes())
+        self.next_hop = array("i", memoryview(table.next_hop).tobytes())
+        self.forward: List[Dict[int, int]] = [{} for _ in range(self.n)]
+        self.reverse: List[Dict[int, int]] = [{} for _ in range(self.n)]
+        for (u, v), w in weights.items():
+            self.set_weight(self.index[u], self.index[v], w)
+
+    def set_weight(self, u: int, v: int, w: int | None) -> None:
+        if w is None:
+            self.forward[u].pop(v, None)
+            self.reverse[v].pop(u, None)
+        else:
+            self.forward[u][v] = w
+            self.reverse[v][u] = w
+
+    def decrease(self, u: int, v: int, w: int) -> None:
+        """Apply a cheaper (or new) edge u -> v by relaxing every pair through it."""
+        self.set_weight(u, v, w)
+        n, dist, next_hop = self.n, self.dist, self.next_hop
+        # Targets reachable from v; neither dist[s][u] nor dist[v][t] can use
+        # u -> v itself (that would be a cycle), so both rows are still exact.
+        from_v = [
+            (t, dist[v * n + t]) for t in range(n) if dist[v * n + t] != UNREACHABLE
+        ]
+        for s in range(n):
+            to_u = dist[s * n + u]
+            if to_u == UNREACHABLE:
+                continue
+            via = to_u + w
+            current = dist[s * n + v]
+            if current != UNREACHABLE and via >= current:
+                continue  # no path from s improves through this edge
+            hop = v if s == u else next_hop[s * n + u]
+            row = s * n
+            for t, rest in from_v:
+                old = dist[row + t]
+                if old == UNREACHABLE or via + rest < old:
+                    dist[row + t] = via + rest
+                    next_hop[row + t] = hop
+
+    def increase(self, u: int, v: int, old_weight: int, w: int | None) -> None:
+        """
+        Apply a dearer (or deleted) edge u -> v, repairing affected pairs.
+
+        A pair (s, t) is affected only if some shortest s -> t path used the
+        edge; every other distance and next hop stays valid. Each source's
+        affected targets are re-settled by a Dijkstra seeded from the
+        unaffected nodes around them.
+        """
+        n, dist = self.n, self.dist
+        from_v = [
+            (t, dist[v * n + t]) for t in range(n) if dist[v * n + t] != UNREACHABLE
+        ]
+        affected_rows: List[Tuple[int, List[int]]] = []
+        for s in range(n):
+            to_u = dist[s * n + u]
+            if to_u == UNREACHABLE:
+                continue
+            via = to_u + old_weight
+            row = s * n
+            targets = [t for t, rest in from_v if dist[row + t] == via + rest]
+            if targets:
+                affected_rows.append((s, targets))
+
+        self.set_weight(u, v, w)
+        for s, targets in affected_rows:
+            self._repair_row(s, targets)
+
+    def _repair_row(self, s: int, targets: Sequence[int]) -> None:
+        n, dist, next_hop = self.n, self.dist, self.next_hop
+        row = s * n
+        affected: Set[int] = set(targets)
+        for t in affected:
+            dist[row + t] = UNREACHABLE
+            next_hop[row + t] = UNREACHABLE
+
+        # Best entry into each affected node from the unaffected region.
+        heap: List[Tuple[int, int, int]] = []
+        for t in affected:
+            for x, w in self.reverse[t].items():
+                if x in affected or dist[row + x] == UNREACHABLE:
+                    continue
+                hop = t if x == s else next_hop[row + x]
+                heap.append((dist[row + x] + w, t, hop))
+        heapq.heapify(heap)
+
+        while heap:
+            d, t, hop = heapq.heappop(heap)
+            if t not in affected:
+                continue  # already settled
+            affected.discard(t)
+            dist[row + t] = d
+            next_hop[row + t] = hop
+            for y, w in self.forward[t].items():
+                if y in affected:
+                    heapq.heappush(heap, (d + w, y, hop))
+        # Whatever is left in `affected` is now unreachable from s.
+
+
+def update_routing_table(
+    table: RoutingTable,
+    old_adjacency: Adjacency,
+    new_adjacency: Adjacency,
+    version: int,
+    max_changes: int,
+) -> RoutingTable | None:
+    """
+    Derive the routing table for new_adjacency from one built for old_adjacency.
+
+    Edge changes are applied one at a time: cheaper or inserted edges relax
+    every pair that can route through them; dearer or deleted edges re-settle
+    only the (source, target) pairs whose shortest paths used them. The
+    input table is not modified, so readers holding it stay consistent.
+
+    Args:
+        table: Table built from old_adjacency.
+        old_adjacency: Graph the table was built from.
+        new_adjacency: Graph to update the table to.
+        version: Graph version of new_adjacency.
+        max_changes: Above this many changed edges, give up (a full rebuild
+            is cheaper than many incremental passes).
+
+    Returns:
+        Updated RoutingTable, or None if the caller should rebuild from
+        scratch (too many changes, or an edge touches a node the table
+        does not index).
+    """
+    started = time.perf_counter()
+    changes = diff_adjacency(old_adjacency, new_adjacency)
+    if len(changes) > max_changes:
+        return None
+    if any(c.from_code not in table.index or c.to_code not in table.index for c in changes):
+        return None
+
+    work = _Workspace(table, _edge_weights(old_adjacency))
+    for change in changes:
+        u, v = table.index[change.from_code], table.index[change.to_code]
+        if change.old_weight is not None and (
+            change.new_weight is None or change.new_weight > change.old_weight
+        ):
+            work.increase(u, v, change.old_weight, change.new_weight)
+        else:
+            work.decrease(u, v, change.new_weight)
+
+    return replace(
+        table,
+        version=version,
+        dist=work.dist,
+        next_hop=work.next_hop,
+        build_seconds=time.perf_counter() - started,
+    )
+
@@ -0,0 +1,79 @@
+"""Immutable, versioned snapshot of the gate network used for routing."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Mapping, Tuple
+
+from app.algorithms.csr import CSRGraph, csr_from_edges
+from app.algorithms.dijkstra import build_adjacency, build_reverse_adjacency
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """
+    Gate index plus directed adjacency for one version of the network.
+
+    Snapshots are never mutated after construction; a route change produces
+    a new snapshot that replaces the old one in a single reference swap, so
+    requests already holding a snapshot keep a consistent view.
+    """
+    version: int
+    # gate code -> display name
+    gates: Mapping[str, str]
+    # gate code -> outgoing (to_code, hu_distance) pairs, weights validated
+    adjacency: Mapping[str, Tuple[Tuple[str, int], ...]]
+    # gate code -> incoming (from_code, hu_distance) pairs, for backward
+    # searches (gates are directed, so this is not the same as adjacency)
+    reverse_adjacency: Mapping[str, Tuple[Tuple[str, int], ...]]
+    # integer-indexed copy of adjacency for the point-to-point hot path
+    csr: CSRGraph
+    edge_count: int
+    # content hash of gates and edges; equal networks hash equally
+    fingerprint: str
+
+    def has_gate(self, code: str) -> bool:
+        """Return True if the gate code exists in this snapshot."""
+        return code in self.gates
+
+
+def build_snapshot(
+    gates: Iterable[Tuple[str, str]],
+    edges: Iterable[Tuple[str, str, int]],
+    version: int,
+) -> GraphSnapshot:
+    """
+    Build a read-only graph snapshot from (code, name) gates and directed edges.
+
+    Raises:
+        ValueError: If any edge has a non-positive weight.
+    """
+    gates = dict(gates)
+    edges = list(edges)
+    graph = build_adjacency(edges)
+    adjacency = {node: tuple(out) for node, out in graph.items()}
+    reverse = {
+        node: tuple(inc) for node, inc in build_reverse_adjacency(graph).items()
+    }
+
+    return GraphSnapshot(
+        version=version,
+        gates=MappingProxyType(gates),
+        adjacency=MappingProxyType(adjacency),
+        reverse_adjacency=MappingProxyType(reverse),
+        csr=csr_from_edges(edges, nodes=gates),
+        edge_count=sum(len(out) for out in adjacency.values()),
+        fingerprint=_fingerprint(gates, edges),
+    )
+
+
+def _fingerprint(gates: Mapping[str, str], edges: Iterable[Tuple[str, str, int]]) -> str:
+    # Sorted so the hash depends only on content, not on DB row order.
+    digest = hashlib.blake2b(digest_size=12)
+    for code, name in sorted(gates.items()):
+        digest.update(f"g\0{code}\0{name}\n".encode())
+    for u, v, w in sorted(edges):
+        digest.update(f"e\0{u}\0{v}\0{w}\n".encode())
+    return digest.hexdigest()
@@ -0,0 +1,20 @@
+"""Hyperspace fare rule for journeys along directed gate paths."""
+
+from __future__ import annotations
+
+from decimal import Decimal, ROUND_HALF_UP
+
+
+def hyperspace_cost_gbp(passengers: int, total_hu: int) -> float:
+    """
+    One-way hyperspace cost along a directed path.
+
+    total_cost = 0.10 * passengers * total_HU_of_path, rounded half-up to
+    2dp. A round trip is priced as outbound + inbound, each computed here.
+    """
+    cost = (
+        Decimal("0.10")
+        * Decimal(passengers)
+        * Decimal(total_hu)
+    ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return float(cost)
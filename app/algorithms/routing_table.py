@@ -0,0 +1,174 @@
+"""All-pairs shortest-path table with next-hop path reconstruction."""
+
+from __future__ import annotations
+
+import heapq
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from app.algorithms.dijkstra import Adjacency, PathResult
+
+# Sentinel for "no path" in both the distance and next-hop matrices.
+UNREACHABLE = -1
+
+# Integer adjacency: node index -> outgoing (neighbor index, weight) pairs.
+IndexedAdjacency = List[List[Tuple[int, int]]]
+
+# Per-process adjacency for pool workers, installed once by the initializer
+# so each task only ships a list of source indices.
+_worker_adjacency: IndexedAdjacency | None = None
+
+
+@dataclass(frozen=True)
+class RoutingTable:
+    """
+    Dense n x n distance and next-hop matrices for one graph version.
+
+    Row i holds the shortest distance from node i to every node and the
+    first hop to take on that path, so a path is reconstructed by following
+    next hops instead of searching.
+    """
+    version: int
+    codes: Tuple[str, ...]
+    index: Mapping[str, int]
+    dist: array
+    next_hop: array
+    build_seconds: float
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the distance and next-hop matrices, in bytes."""
+        return (
+            len(self.dist) * self.dist.itemsize
+            + len(self.next_hop) * self.next_hop.itemsize
+        )
+
+    def path(self, start: str, target: str) -> PathResult | None:
+        """Return the shortest path via next-hop lookups, or None if unreachable."""
+        s = self.index.get(start)
+        t = self.index.get(target)
+        if s is None or t is None:
+            return None
+
+        n = len(self.codes)
+        total = self.dist[s * n + t]
+        if total == UNREACHABLE:
+            return None
+
+        path = [start]
+        node = s
+        while node != t:
+            node = self.next_hop[node * n + t]
+            path.append(self.codes[node])
+
+        return PathResult(path=path, total_weight=total)
+
+
+def _single_source_rows(
+    graph: IndexedAdjacency, source: int
+) -> Tuple[List[int], List[int]]:
+    """Run a full Dijkstra from source, tracking the first hop to each node."""
+    n = len(graph)
+    dist = [UNREACHABLE] * n
+    first = [UNREACHABLE] * n
+    dist[source] = 0
+    first[source] = source
+
+    heap: List[Tuple[int, int]] = [(0, source)]
+    settled = [False] * n
+
+    while heap:
+        cur_dist, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = True
+
+        for neighbor, weight in graph[node]:
+            new_dist = cur_dist + weight
+            if dist[neighbor] == UNREACHABLE or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                first[neighbor] = neighbor if node == source else first[node]
+                heapq.heappush(heap, (new_dist, neighbor))
+
+    return dist, first
+
+
+def _init_worker(graph: IndexedAdjacency) -> None:
+    global _worker_adjacency
+    _worker_adjacency = graph
+
+
+def _worker_rows(sources: Sequence[int]) -> List[Tuple[int, List[int], List[int]]]:
+    assert _worker_adjacency is not None
+    return [(s, *_single_source_rows(_worker_adjacency, s)) for s in sources]
+
+
+def _chunks(items: Sequence[int], size: int) -> Iterable[Sequence[int]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def build_routing_table(
+    adjacency: Adjacency,
+    nodes: Iterable[str],
+    version: int,
+    workers: int = 0,
+) -> RoutingTable:
+    """
+    Precompute all-pairs shortest paths by running Dijkstra from every node.
+
+    Args:
+        adjacency: Validated directed adjacency (e.g. GraphSnapshot.adjacency).
+        nodes: Node ids to index; edge endpoints are added automatically.
+        version: Graph version the table is built from.
+        workers: Process-pool size; 0 or 1 builds in the calling process.
+
+    Returns:
+        RoutingTable with flat row-major distance and next-hop matrices.
+    """
+    started = time.perf_counter()
+
+    all_nodes = set(nodes)
+    for u, out in adjacency.items():
+        all_nodes.add(u)
+        all_nodes.update(v for v, _ in out)
+    codes = tuple(sorted(all_nodes))
+    index: Dict[str, int] = {code: i for i, code in enumerate(codes)}
+
+    n = len(codes)
+    graph: IndexedAdjacency = [[] for _ in range(n)]
+    for u, out in adjacency.items():
+        graph[index[u]] = [(index[v], w) for v, w in out]
+
+    dist = array("q", [UNREACHABLE]) * (n * n)
+    next_hop = array("i", [UNREACHABLE]) * (n * n)
+
+    def store(source: int, row_dist: List[int], row_first: List[int]) -> None:
+        offset = source * n
+        dist[offset:offset + n] = array("q", row_dist)
+        next_hop[offset:offset + n] = array("i", row_first)
+
+    sources = list(range(n))
+    if workers > 1 and n > 1:
+        chunk = max(1, n // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(graph,)
+        ) as pool:
+            for rows in pool.map(_worker_rows, _chunks(sources, chunk)):
+                for source, row_dist, row_first in rows:
+                    store(source, row_dist, row_first)
+    else:
+        for source in sources:
+            store(source, *_single_source_rows(graph, source))
+
+    return RoutingTable(
+        version=version,
+        codes=codes,
+        index=index,
+        dist=dist,
+        next_hop=next_hop,
+        build_seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,128 @@
+"""Vectorised transport pricing for many (distance, passengers, parking) rows."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Rows whose value * 100 lies this close to a .5 boundary are re-rounded with
+# Python's round(); np.round scales by 100 first, which can flip those cases.
+_HALF_TOLERANCE = 1e-6
+
+
+@dataclass(frozen=True)
+class TransportPlanBatch:
+    """
+    Column-oriented counterpart of TransportPlan.
+
+    Every attribute is a 1-D array with one entry per input row, holding the
+    same value compute_transport_plan() would return for that row.
+    """
+    distance_au: np.ndarray
+    passengers: np.ndarray
+    parking_days: np.ndarray
+
+    hstc_trips: np.ndarray
+    personal_trips: np.ndarray
+
+    hstc_trip_cost_gbp: np.ndarray
+    personal_trip_cost_gbp: np.ndarray
+
+    total_capacity: np.ndarray
+    total_cost_gbp: np.ndarray
+
+    hstc_total_gbp: np.ndarray
+    personal_total_gbp: np.ndarray
+
+    hstc_only_total_gbp: np.ndarray
+    personal_only_total_gbp: np.ndarray
+
+    # True where HSTC was chosen, False where personal transport was.
+    hstc_chosen: np.ndarray
+
+
+def _round_money(values: np.ndarray) -> np.ndarray:
+    """Round to 2dp exactly like round(float(value), 2), element-wise."""
+    rounded = np.round(values, 2)
+
+    scaled = values * 100.0
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < _HALF_TOLERANCE
+    if near_half.any():
+        idx = np.flatnonzero(near_half)
+        rounded[idx] = [round(float(v), 2) for v in values[idx]]
+    return rounded
+
+
+def compute_transport_plans(
+    distance_au: np.ndarray,
+    passengers: np.ndarray,
+    parking_days: np.ndarray,
+) -> TransportPlanBatch:
+    """
+    Price many transport requests at once.
+
+    Applies the same capacities, per-AU and parking prices, end-of-calculation
+    rounding and tie-breakers as compute_transport_plan(), but on whole
+    columns instead of one row at a time.
+
+    Args:
+        distance_au: Distances in AU (float-compatible, 1-D).
+        passengers: Passenger counts (int-compatible, 1-D).
+        parking_days: Parking days (int-compatible, 1-D).
+
+    Returns:
+        TransportPlanBatch with one entry per row.
+
+    Raises:
+        ValueError: If the columns differ in length, or any row has a
+            non-positive distance/passengers or negative parking_days.
+    """
+    distance = np.asarray(distance_au, dtype=np.float64)
+    pax = np.asarray(passengers, dtype=np.int64)
+    parking = np.asarray(parking_days, dtype=np.int64)
+
+    if not (distance.shape == pax.shape == parking.shape) or distance.ndim != 1:
+        raise ValueError("input columns must be 1-D and the same length")
+    if (distance <= 0).any():
+        raise ValueError("distance_au must be > 0")
+    if (pax <= 0).any():
+        raise ValueError("passengers must be > 0")
+    if (parking < 0).any():
+        raise ValueError("parking_days must be >= 0")
+
+    # Integer ceil division keeps vehicle/trip counts exact.
+    personal_vehicles = (pax + 3) // 4
+    hstc_trips = (pax + 4) // 5
+
+    # Same operation order as the scalar planner so float results match.
+    personal_per_vehicle = (0.30 * distance) + (5.0 * parking)
+    personal_total = personal_vehicles * personal_per_vehicle
+    hstc_per_trip = 0.45 * distance
+    hstc_total = hstc_trips * hstc_per_trip
+
+    personal_total_r = _round_money(personal_total)
+    hstc_total_r = _round_money(hstc_total)
+
+    # Cheaper total wins; on a tie prefer fewer movements, then HSTC.
+    hstc_chosen = (hstc_total_r < personal_total_r) | (
+        (hstc_total_r == personal_total_r) & (hstc_trips <= personal_vehicles)
+    )
+
+    zeros = np.zeros_like(distance)
+    return TransportPlanBatch(
+        distance_au=distance,
+        passengers=pax,
+        parking_days=parking,
+        hstc_trips=np.where(hstc_chosen, hstc_trips, 0),
+        personal_trips=np.where(hstc_chosen, 0, personal_vehicles),
+        hstc_trip_cost_gbp=_round_money(hstc_per_trip),
+        personal_trip_cost_gbp=_round_money(personal_per_vehicle),
+        total_capacity=np.where(hstc_chosen, hstc_trips * 5, personal_vehicles * 4),
+        total_cost_gbp=np.where(hstc_chosen, hstc_total_r, personal_total_r),
+        hstc_total_gbp=np.where(hstc_chosen, hstc_total_r, zeros),
+        personal_total_gbp=np.where(hstc_chosen, zeros, personal_total_r),
+        hstc_only_total_gbp=hstc_total_r,
+        personal_only_total_gbp=personal_total_r,
+        hstc_chosen=hstc_chosen,
+    )
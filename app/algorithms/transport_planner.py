@@ -37,6 +37,10 @@ class TransportPlan:
     hstc_total_gbp: float
     personal_total_gbp: float
 
+    # Totals each mode would cost on its own, regardless of which was chosen.
+    hstc_only_total_gbp: float
+    personal_only_total_gbp: float
+
 
 def _round_money(value: float) -> float:
     """Round to two decimal places using standard currency rounding."""
@@ -127,6 +131,8 @@ def compute_transport_plan(distance_au: float, passengers: int, parking_days: in
             total_cost_gbp=personal_total_r,
             hstc_total_gbp=_round_money(0.0),
             personal_total_gbp=personal_total_r,
+            hstc_only_total_gbp=hstc_total_r,
+            personal_only_total_gbp=personal_total_r,
         )
 
     if hstc_total_r < personal_total_r:
@@ -142,6 +148,8 @@ def compute_transport_plan(distance_au: float, passengers: int, parking_days: in
             total_cost_gbp=hstc_total_r,
             hstc_total_gbp=hstc_total_r,
             personal_total_gbp=_round_money(0.0),
+            hstc_only_total_gbp=hstc_total_r,
+            personal_only_total_gbp=personal_total_r,
         )
 
     # Tie: apply tie-breakers
@@ -158,6 +166,8 @@ def compute_transport_plan(distance_au: float, passengers: int, parking_days: in
             total_cost_gbp=hstc_total_r,
             hstc_total_gbp=hstc_total_r,
             personal_total_gbp=_round_money(0.0),
+            hstc_only_total_gbp=hstc_total_r,
+            personal_only_total_gbp=personal_total_r,
         )
 
     return TransportPlan(
@@ -172,4 +182,6 @@ def compute_transport_plan(distance_au: float, passengers: int, parking_days: in
         total_cost_gbp=personal_total_r,
         hstc_total_gbp=_round_money(0.0),
         personal_total_gbp=personal_total_r,
+        hstc_only_total_gbp=hstc_total_r,
+        personal_only_total_gbp=personal_total_r,
     )
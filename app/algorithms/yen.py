@@ -0,0 +1,151 @@
+"""K cheapest loop-free paths (Yen's algorithm) over a directed graph."""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Set, Tuple
+
+from app.algorithms.dijkstra import Adjacency, PathResult, shortest_path_tree
+
+
+def _spur_search(
+    graph: Adjacency,
+    to_target: Dict[str, int],
+    spur: str,
+    target: str,
+    blocked_nodes: Set[str],
+    blocked_edges: Set[Tuple[str, str]],
+    max_cost: int | None,
+) -> Tuple[List[str], int] | None:
+    """
+    A* from spur to target avoiding blocked nodes/edges.
+
+    to_target holds exact distances to the target in the full graph; removing
+    nodes or edges can only lengthen paths, so it is an admissible and
+    consistent heuristic. Nodes absent from it cannot reach the target at all.
+    The search gives up once no path can cost at most max_cost.
+    """
+    if spur not in to_target:
+        return None
+
+    heap: List[Tuple[int, int, str]] = [(to_target[spur], 0, spur)]
+    dist: Dict[str, int] = {spur: 0}
+    prev: Dict[str, str] = {}
+    visited = set()
+
+    while heap:
+        estimate, cur_dist, node = heapq.heappop(heap)
+        if max_cost is not None and estimate > max_cost:
+            return None
+        if node in visited:
+            continue
+        visited.add(node)
+
+        if node == target:
+            path = [target]
+            while path[-1] != spur:
+                path.append(prev[path[-1]])
+            path.reverse()
+            return path, cur_dist
+
+        for neighbor, weight in graph.get(node, ()):
+            if neighbor in blocked_nodes or (node, neighbor) in blocked_edges:
+                continue
+            h = to_target.get(neighbor)
+            if h is None:
+                continue
+            new_dist = cur_dist + weight
+            if neighbor not in dist or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                prev[neighbor] = node
+                heapq.heappush(heap, (new_dist + h, new_dist, neighbor))
+
+    return None
+
+
+def k_shortest_paths(
+    graph: Adjacency,
+    reverse: Adjacency,
+    start: str,
+    target: str,
+    k: int,
+) -> List[PathResult]:
+    """
+    Return up to k cheapest loop-free paths from start to target, cheapest first.
+
+    Work is shared across spur searches in three ways:
+    - one backward search from the target gives exact distances-to-target,
+      used as the A* heuristic for every spur search;
+    - Lawler's rule: a path only spawns spur searches from the node where it
+      deviated from its parent onwards, since earlier spur nodes were
+      already explored for the parent;
+    - once enough candidates are queued to fill k, spur searches are
+      bounded by the worst candidate that could still be returned.
+
+    Args:
+        graph: Directed adjacency (u -> [(v, w)]).
+        reverse: Transpose adjacency (v -> [(u, w)]).
+        start: Starting node id.
+        target: Target node id.
+        k: Maximum number of paths to return.
+    """
+    if k <= 0 or start == target:
+        return []
+
+    to_target = dict(shortest_path_tree(reverse, target).dist)
+    weights: Dict[Tuple[str, str], int] = {}
+    for u, out in graph.items():
+        for v, w in out:
+            key = (u, v)
+            if key not in weights or w < weights[key]:
+                weights[key] = w
+
+    first = _spur_search(graph, to_target, start, target, set(), set(), None)
+    if first is None:
+        return []
+
+    # Accepted paths: (path, cost, deviation index).
+    accepted: List[Tuple[List[str], int, int]] = [(first[0], first[1], 0)]
+    candidates: List[Tuple[int, Tuple[str, ...], int]] = []
+    seen = {tuple(first[0])}
+
+    while len(accepted) < k:
+        last_path, _, deviation = accepted[-1]
+        still_needed = k - len(accepted)
+
+        root_cost = sum(
+            weights[(u, v)] for u, v in zip(last_path[:deviation], last_path[1:deviation + 1])
+        )
+        for i in range(deviation, len(last_path) - 1):
+            spur = last_path[i]
+            root = last_path[:i + 1]
+
+            blocked_edges = {
+                (path[i], path[i + 1])
+                for path, _, _ in accepted
+                if len(path) > i + 1 and path[:i + 1] == root
+            }
+            blocked_nodes = set(root[:-1])
+
+            max_cost = None
+            if len(candidates) >= still_needed:
+                bound = heapq.nsmallest(still_needed, candidates)[-1][0]
+                max_cost = bound - root_cost
+
+            found = _spur_search(
+                graph, to_target, spur, target, blocked_nodes, blocked_edges, max_cost)
+            if found is not None:
+                spur_path, spur_cost = found
+                total_path = tuple(root[:-1] + spur_path)
+                if total_path not in seen:
+                    seen.add(total_path)
+                    heapq.heappush(candidates, (root_cost + spur_cost, total_path, i))
+
+            root_cost += weights[(spur, last_path[i + 1])]
+
+        if not candidates:
+            break
+        cost, path, dev = heapq.heappop(candidates)
+        accepted.append((list(path), cost, dev))
+
+    return [PathResult(path=path, total_weight=cost) for path, cost, _ in accepted]
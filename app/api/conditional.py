@@ -0,0 +1,128 @@
+"""ETag / conditional-GET support for responses derived from the gate network."""
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.algorithms.graph import GraphSnapshot
+from app.services.graph_store import get_graph_snapshot
+from app.services.routing_engines import RoutingEngine, get_routing_engine
+
+# Clients may store responses but must revalidate them on every use; a
+# matching If-None-Match is answered with 304 from the in-memory snapshot.
+CACHE_CONTROL = "no-cache"
+
+
+def graph_etag(snapshot: GraphSnapshot, variant: str | None = None) -> str:
+    """
+    Strong ETag for a representation built from this snapshot.
+
+    Strong ETags must differ between representations of one resource, so
+    anything other than the default JSON body (e.g. NDJSON) names a variant.
+    """
+    suffix = f"-{variant}" if variant else ""
+    return f'"{snapshot.fingerprint}{suffix}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against the current ETag.
+
+    If-None-Match uses weak comparison, so a W/ prefix is ignored.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# Path parameters naming gates; a representation only exists if they do.
+_GATE_PARAMS = ("gate_code", "target_gate_code")
+
+
+def _gates_exist(request: Request, graph: GraphSnapshot) -> bool:
+    return all(
+        graph.has_gate(request.path_params[name])
+        for name in _GATE_PARAMS
+        if name in request.path_params
+    )
+
+
+async def get_conditional_graph_snapshot(
+    request: Request,
+    response: Response,
+    graph: GraphSnapshot = Depends(get_graph_snapshot),
+) -> GraphSnapshot:
+    """
+    FastAPI dependency: graph snapshot plus ETag/Cache-Control handling.
+
+    Sets ETag and Cache-Control on the response, and short-circuits with
+    304 Not Modified when the client already holds this version. Requests
+    naming an unknown gate never get a 304 (e.g. for `If-None-Match: *`):
+    they fall through so the endpoint answers 400/404.
+
+    Raises:
+        HTTPException: 304 when If-None-Match matches the current ETag.
+    """
+    check_not_modified(request, response, graph, graph_etag(graph))
+    return graph
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    graph: GraphSnapshot,
+    etag: str,
+    vary: str | None = None,
+) -> dict[str, str]:
+    """
+    Set ETag/Cache-Control (and Vary) on response, or raise 304 if they match.
+
+    For endpoints that pick their representation (and so their ETag)
+    themselves; see get_conditional_graph_snapshot.
+
+    Returns:
+        The headers set, for endpoints that build their own Response.
+
+    Raises:
+        HTTPException: 304 when If-None-Match matches etag.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if vary:
+        headers["Vary"] = vary
+    if etag_matches(request.headers.get("if-none-match"), etag) and _gates_exist(
+        request, graph
+    ):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+
+async def get_conditional_routing_engine(
+    request: Request,
+    response: Response,
+    engine: RoutingEngine = Depends(get_routing_engine),
+) -> RoutingEngine:
+    """
+    FastAPI dependency: routing engine plus ETag/Cache-Control handling.
+
+    Like get_conditional_graph_snapshot, but the ETag comes from the
+    engine's version tag, so the SQL engine answers conditional requests
+    without loading the graph snapshot. With the memory engine the ETag is
+    the same as for every other gate GET.
+
+    Raises:
+        HTTPException: 304 when If-None-Match matches the current ETag.
+    """
+    etag = f'"{await engine.version_tag()}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        codes = [request.path_params[name] for name in _GATE_PARAMS
+                 if name in request.path_params]
+        if all([await engine.has_gate(code) for code in codes]):
+            raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return engine
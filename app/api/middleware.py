@@ -0,0 +1,150 @@
+"""ASGI middleware for request instrumentation."""
+
+from __future__ import annotations
+
+import cProfile
+import hmac
+import random
+import time
+from datetime import datetime, timezone
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from app.core.profiling import ProfileStore, RequestProfile, profile_store, top_entries
+
+# Request header carrying settings.profiling_token to force a profile.
+PROFILE_HEADER = b"x-debug-profile"
+# Response header telling the caller which stored profile is theirs.
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Label for requests that match no route, so random URLs (scanners, typos)
+# cannot create unbounded label sets.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """Return the path template (e.g. /gates/{gate_code}) serving this request."""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    partial = None
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # e.g. wrong method: 405 from this route
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Record per-route latency histograms and in-flight gauges.
+
+    The route is resolved before dispatch so the in-flight gauge can use the
+    same template label as the latency histogram.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method, route=route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=method, route=route, status=str(status),
+            )
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method, route=route)
+
+
+class ProfilingMiddleware:
+    """
+    Run selected requests under cProfile and keep their top entries.
+
+    A request is profiled when it carries the debug header with the
+    configured token, or when it is randomly sampled. With no token and a
+    zero sample rate the check is two attribute reads, so disabled
+    profiling costs effectively nothing.
+
+    cProfile observes the whole event-loop thread, so a profile can include
+    other requests' work interleaved at await points; work pushed to
+    threads (e.g. run_in_executor) is not captured.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store) -> None:
+        self.app = app
+        self.store = store
+
+    def _reason(self, scope: Scope) -> str | None:
+        token = settings.profiling_token
+        if token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER and hmac.compare_digest(value, token.encode()):
+                    return "header"
+        rate = settings.profiling_sample_rate
+        if rate and random.random() < rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._reason(scope)
+        if reason is None or not self.store.try_acquire():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.next_id()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER, str(profile_id).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - started
+            self.store.release()
+            self.store.add(RequestProfile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                status=status,
+                duration_seconds=duration,
+                started_at=started_at,
+                reason=reason,
+                entries=top_entries(profiler, settings.profiling_top_n),
+            ))
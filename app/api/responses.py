@@ -0,0 +1,94 @@
+"""orjson-rendered responses and a per-snapshot cache of serialised bodies."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.algorithms.graph import GraphSnapshot
+from app.core.timing import timed
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson; pydantic models are dumped directly."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def prevalidated_response(content: Any, response: Response | None = None) -> Response:
+    """
+    Render a response whose content is already known to match its schema.
+
+    Returning a Response makes FastAPI skip response_model validation and
+    its jsonable_encoder pass; use it only for content built from trusted
+    data (snapshot, planner output), e.g. via Model.model_construct().
+    Headers already set on the injected `response` (ETag, Cache-Control)
+    are carried over, since FastAPI only merges them for non-Response
+    returns.
+    """
+    with timed("serialize"):
+        out = ORJSONResponse(content)
+    if response is not None:
+        out.headers.update(response.headers)
+    return out
+
+
+def bytes_response(body: bytes, response: Response | None = None) -> Response:
+    """Wrap an already-serialised JSON body, carrying over injected headers."""
+    out = Response(body, media_type="application/json")
+    if response is not None:
+        out.headers.update(response.headers)
+    return out
+
+
+class SnapshotBodyCache:
+    """
+    Serialised JSON bodies for responses that only depend on the snapshot.
+
+    Entries are keyed by (route-specific) key and dropped as soon as a
+    snapshot with a different fingerprint is seen, so the cache never
+    holds more than one network version's responses.
+    """
+
+    def __init__(self) -> None:
+        self._fingerprint: str | None = None
+        self._bodies: Dict[Hashable, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, snapshot: GraphSnapshot, key: Hashable, build: Callable[[], Any]) -> bytes:
+        """Return the cached body for key, rendering build() on a miss."""
+        with self._lock:
+            if snapshot.fingerprint != self._fingerprint:
+                self._fingerprint = snapshot.fingerprint
+                self._bodies = {}
+            body = self._bodies.get(key)
+        if body is not None:
+            return body
+
+        with timed("serialize"):
+            body = orjson.dumps(build(), default=_default)
+        with self._lock:
+            if snapshot.fingerprint == self._fingerprint:
+                self._bodies[key] = body
+        return body
+
+    def clear(self) -> None:
+        """Drop every cached body."""
+        with self._lock:
+            self._fingerprint = None
+            self._bodies = {}
+
+
+snapshot_body_cache = SnapshotBodyCache()
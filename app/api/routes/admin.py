@@ -0,0 +1,165 @@
+"""Operational endpoints for routing caches, bulk imports and profiles."""
+
+import hmac
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.algorithms.graph import GraphSnapshot
+from app.algorithms.routing_table import RoutingTable
+from app.api.schemas import (
+    BulkImportOut,
+    PoolStatsOut,
+    ProfileEntryOut,
+    RequestProfileOut,
+    RoutingTableStatsOut,
+)
+from app.core.config import settings
+from app.core.profiling import profile_store
+from app.db.bulk_import import ImportFormat, decode_lines, import_gates, import_routes
+from app.db.graph_version import bump_graph_version
+from app.db.session import get_db_session, pool_stats
+from app.services.graph_store import get_graph_snapshot, graph_store
+
+
+async def require_admin_token(
+    x_admin_token: str | None = Header(default=None),
+) -> None:
+    """
+    FastAPI dependency guarding every /admin endpoint.
+
+    Raises:
+        HTTPException: 404 when no admin token is configured (the endpoints
+            do not exist), 401 when the X-Admin-Token header does not match.
+    """
+    token = settings.admin_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode(), token.encode()
+    ):
+        raise HTTPException(status_code=401, detail="invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+@router.get("/routing-table", response_model=RoutingTableStatsOut)
+async def get_routing_table_stats(
+    graph: GraphSnapshot = Depends(get_graph_snapshot),
+):
+    """Report the routing index's build time and (for tables) memory footprint."""
+    table = graph_store.routing_index_for(graph)
+    if table is None:
+        return RoutingTableStatsOut(
+            routing_mode=settings.routing_mode,
+            graph_version=graph.version,
+        )
+
+    return RoutingTableStatsOut(
+        routing_mode=settings.routing_mode,
+        graph_version=graph.version,
+        table_version=table.version,
+        node_count=len(table.codes),
+        build_seconds=table.build_seconds,
+        memory_bytes=table.nbytes if isinstance(table, RoutingTable) else None,
+    )
+
+
+@router.post("/import/{kind}", response_model=BulkImportOut)
+async def bulk_import(
+    kind: Literal["gates", "routes"],
+    request: Request,
+    fmt: ImportFormat = Query(default="csv", alias="format"),
+    replace: bool = Query(default=False),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Stream a CSV/NDJSON body of gates or routes into the database.
+
+    The body is validated and loaded as it arrives, in a single
+    transaction; the graph version is bumped once, with the commit (so
+    other workers reload too), and the snapshot is reloaded from the primary.
+    `replace` (routes only) deletes existing routes first.
+
+    Error responses:
+    - 400 if any row fails validation (nothing is imported)
+    """
+    lines = decode_lines(request.stream())
+    conn = await session.connection()
+    try:
+        if kind == "gates":
+            result = await import_gates(conn, lines, fmt)
+        else:
+            result = await import_routes(conn, lines, fmt, replace=replace)
+    except ValueError as e:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    # Core-level writes bypass the ORM write tracking; bump directly so
+    # other workers reload once this commits.
+    await bump_graph_version(conn)
+    await session.commit()
+    # Reload from the primary: a replica may not have the import yet.
+    await graph_store.refresh(session)
+
+    return BulkImportOut(
+        kind=result.kind,
+        rows=result.rows,
+        gates_created=result.gates_created,
+        graph_version=graph_store.version,
+        seconds=result.seconds,
+    )
+
+
+@router.get("/profiles", response_model=list[RequestProfileOut])
+async def list_profiles(limit: int = Query(default=20, gt=0, le=500)):
+    """
+    Return the most recent captured request profiles, newest first.
+
+    Profiles are captured by ProfilingMiddleware (see the profiling_*
+    settings) and kept in a bounded in-memory ring buffer per process.
+    """
+    return [
+        RequestProfileOut(
+            id=p.id,
+            method=p.method,
+            path=p.path,
+            status=p.status,
+            duration_seconds=p.duration_seconds,
+            started_at=p.started_at,
+            reason=p.reason,
+            entries=[
+                ProfileEntryOut(
+                    function=e.function,
+                    calls=e.calls,
+                    total_seconds=e.total_seconds,
+                    cumulative_seconds=e.cumulative_seconds,
+                )
+                for e in p.entries
+            ],
+        )
+        for p in profile_store.recent()[:limit]
+    ]
+
+
+@router.get("/db-pools", response_model=list[PoolStatsOut])
+async def get_db_pool_stats():
+    """Report connection-pool usage and health for the primary and each replica."""
+    return [
+        PoolStatsOut(
+            name=p.name,
+            url=p.url,
+            healthy=p.healthy,
+            size=p.size,
+            checked_in=p.checked_in,
+            checked_out=p.checked_out,
+            overflow=p.overflow,
+        )
+        for p in pool_stats()
+    ]
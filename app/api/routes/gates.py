@@ -1,60 +1,237 @@
 """Gate and routing endpoints, including cheapest-path calculations."""
 
-from decimal import Decimal, ROUND_HALF_UP
+import time
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.algorithms.dijkstra import dijkstra_shortest_path
-from app.api.schemas import CheapestPathOut, GateDetailOut, GateOut, RouteOut
-from app.db.session import get_db_session
+from app.algorithms.dijkstra import PathResult, shortest_path_tree
+from app.algorithms.graph import GraphSnapshot
+from app.algorithms.hyperspace_pricing import hyperspace_cost_gbp
+from app.algorithms.yen import k_shortest_paths
+from app.api.conditional import (
+    check_not_modified,
+    get_conditional_graph_snapshot,
+    get_conditional_routing_engine,
+    graph_etag,
+)
+from app.api.responses import (
+    ORJSONResponse,
+    bytes_response,
+    prevalidated_response,
+    snapshot_body_cache,
+)
+from app.api.schemas import (
+    AlternativePathsOut,
+    BatchPathRequestIn,
+    BatchPathResponseOut,
+    BatchPathResultOut,
+    CheapestPathOut,
+    GateDetailOut,
+    GateOut,
+    GateRoutesOut,
+)
+from app.api.server_timing import ServerTimingRoute
+from app.core.config import settings
+from app.core.metrics import PATH_SEARCH_COALESCED, observe_search
+from app.core.timing import timed
+from app.db.session import get_read_db_session
 from app.repositories.gates import GateRepository
-from app.repositories.routes import RouteRepository
+from app.services.graph_store import get_graph_snapshot
+from app.services.routing_engines import RoutingEngine
+from app.services.single_flight import SingleFlight
 
-router = APIRouter(prefix="/gates", tags=["gates"])
+router = APIRouter(
+    prefix="/gates",
+    tags=["gates"],
+    route_class=ServerTimingRoute,
+    default_response_class=ORJSONResponse,
+)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 
-@router.get("", response_model=list[GateOut])
-async def list_gates(session: AsyncSession = Depends(get_db_session)):
-    """Return all gates ordered by code."""
-    repo = GateRepository(session)
-    gates = await repo.list_gates()
-    return [GateOut(code=g.code, name=g.name) for g in gates]
+# In-flight cheapest-path searches, keyed by (engine, version tag, from, to).
+path_searches: SingleFlight[PathResult | None] = SingleFlight()
+
+
+def _hyperspace_cost(passengers: int | None, total_hu: int) -> float | None:
+    """One-way hyperspace cost along a directed path, or None without passengers."""
+    if passengers is None:
+        return None
+    return hyperspace_cost_gbp(passengers, total_hu)
+
+
+async def _ndjson_lines(rows: AsyncIterator[tuple[str, str]]) -> AsyncIterator[bytes]:
+    async for code, name in rows:
+        yield orjson.dumps({"code": code, "name": name}) + b"\n"
+
+
+@router.get(
+    "",
+    response_model=list[GateOut],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def list_gates(
+    request: Request,
+    response: Response,
+    after: str | None = Query(default=None, description="Return gates with code > after"),
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    graph: GraphSnapshot = Depends(get_graph_snapshot),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    """
+    Return gates ordered by code.
+
+    Without `after`/`limit` the whole catalogue comes from the in-memory
+    snapshot. With either, one keyset page (default 100 gates) is read
+    from the DB and a `Link: <...>; rel="next"` header points at the next
+    page while more may remain.
+
+    Clients sending `Accept: application/x-ndjson` get one JSON object per
+    line, streamed from a server-side cursor (honouring `after`/`limit`),
+    so the first gate arrives before the last one is read. The two
+    formats carry different ETags and `Vary: Accept`, so a cached copy of
+    one is never revalidated as the other.
+    """
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    headers = check_not_modified(
+        request, response, graph, graph_etag(graph, "ndjson" if ndjson else None),
+        vary="Accept")
+    if ndjson:
+        rows = GateRepository(session).stream_gate_names(after=after, limit=limit)
+        return StreamingResponse(
+            _ndjson_lines(rows), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    if after is None and limit is None:
+        # The full list only changes with the snapshot: serialise it once.
+        body = snapshot_body_cache.get(graph, "gates", lambda: [
+            {"code": code, "name": name} for code, name in sorted(graph.gates.items())
+        ])
+        return bytes_response(body, response)
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    rows = await GateRepository(session).list_gate_names_page(after, page_size)
+    if len(rows) == page_size:
+        next_url = request.url.include_query_params(after=rows[-1][0], limit=page_size)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return [GateOut(code=code, name=name) for code, name in rows]
+
+
+@router.post("/routes:batch", response_model=BatchPathResponseOut)
+async def get_cheapest_paths_batch(
+    body: BatchPathRequestIn,
+    graph: GraphSnapshot = Depends(get_graph_snapshot),
+):
+    """
+    Return cheapest paths for many (from, to, passengers) items at once.
+
+    Items are grouped by origin so each distinct source gate is searched
+    once; every destination for that source is read off the same
+    shortest-path tree. Invalid or unroutable items get a per-item error
+    (with the status the single-pair endpoint would use) instead of failing
+    the whole batch.
+    """
+    results: list[BatchPathResultOut | None] = [None] * len(body.items)
+    by_origin: dict[str, list[int]] = {}
+
+    def fail(i: int, status_code: int, error: str) -> None:
+        item = body.items[i]
+        results[i] = BatchPathResultOut(
+            from_code=item.from_code,
+            to_code=item.to_code,
+            status_code=status_code,
+            error=error,
+        )
+
+    for i, item in enumerate(body.items):
+        if len(item.from_code) != 3 or len(item.to_code) != 3:
+            fail(i, 400, "gate codes must be 3-letter codes")
+        elif item.passengers is not None and item.passengers <= 0:
+            fail(i, 400, "passengers must be > 0")
+        elif not graph.has_gate(item.from_code):
+            fail(i, 404, f"Gate '{item.from_code}' not found")
+        elif not graph.has_gate(item.to_code):
+            fail(i, 404, f"Gate '{item.to_code}' not found")
+        else:
+            by_origin.setdefault(item.from_code, []).append(i)
+
+    for origin, indices in by_origin.items():
+        started = time.perf_counter()
+        with timed("search"):
+            tree = shortest_path_tree(graph.adjacency, origin)
+        observe_search("tree", time.perf_counter() - started, len(tree.dist))
+        for i in indices:
+            item = body.items[i]
+            path = tree.path_to(item.to_code)
+            if path is None or len(path.path) < 2:
+                fail(i, 404, f"No route from '{origin}' to '{item.to_code}'")
+                continue
+            results[i] = BatchPathResultOut(
+                from_code=item.from_code,
+                to_code=item.to_code,
+                status_code=200,
+                result=CheapestPathOut(
+                    path=path.path,
+                    total_hu=path.total_weight,
+                    passengers=item.passengers,
+                    hyperspace_cost_gbp=_hyperspace_cost(
+                        item.passengers, path.total_weight),
+                ),
+            )
+
+    return BatchPathResponseOut(results=results)
 
 
 @router.get("/{gate_code}", response_model=GateDetailOut)
-async def get_gate(gate_code: str, session: AsyncSession = Depends(get_db_session)):
+async def get_gate(
+    gate_code: str,
+    response: Response,
+    graph: GraphSnapshot = Depends(get_conditional_graph_snapshot),
+):
     """Return a single gate with its outgoing directed routes."""
     if len(gate_code) != 3:
         raise HTTPException(
             status_code=400, detail="gateCode must be a 3-letter code")
 
-    repo = GateRepository(session)
-    gate = await repo.get_gate(gate_code)
-    if gate is None:
+    if not graph.has_gate(gate_code):
         raise HTTPException(
             status_code=404, detail=f"Gate '{gate_code}' not found")
 
-    routes = await repo.list_outgoing_routes(gate_code)
+    def build() -> dict:
+        routes = sorted(graph.adjacency.get(gate_code, ()))
+        return {
+            "code": gate_code,
+            "name": graph.gates[gate_code],
+            "outgoing": [{"to_code": to_code, "hu_distance": hu_distance}
+                         for to_code, hu_distance in routes],
+        }
 
-    return GateDetailOut(
-        code=gate.code,
-        name=gate.name,
-        outgoing=[RouteOut(to_code=r.to_code, hu_distance=r.hu_distance)
-                  for r in routes],
-    )
+    return bytes_response(snapshot_body_cache.get(graph, ("gate", gate_code), build), response)
 
 
 @router.get("/{gate_code}/to/{target_gate_code}", response_model=CheapestPathOut)
 async def get_cheapest_path(
     gate_code: str,
     target_gate_code: str,
+    response: Response,
     passengers: int | None = Query(default=None, gt=0),
-    session: AsyncSession = Depends(get_db_session),
+    engine: RoutingEngine = Depends(get_conditional_routing_engine),
 ):
     """
     Return the cheapest directed path and optional hyperspace cost.
 
+    Gates are validated and the path found by the configured routing engine
+    (by default the in-memory graph snapshot: no DB round trips and no
+    per-request graph construction).
+    Concurrent identical requests share one in-memory search. Like every
+    gate GET, responses carry an ETag and answer a matching If-None-Match
+    with 304.
+
     Validation rules:
     - gate codes must be exactly 3 characters
     - passengers (if provided) must be > 0
@@ -68,45 +245,151 @@ async def get_cheapest_path(
         raise HTTPException(
             status_code=400, detail="gate codes must be 3-letter codes")
 
-    gate_repo = GateRepository(session)
-
-    start_gate = await gate_repo.get_gate(gate_code)
-    if start_gate is None:
+    if not await engine.has_gate(gate_code):
         raise HTTPException(
             status_code=404, detail=f"Gate '{gate_code}' not found")
 
-    end_gate = await gate_repo.get_gate(target_gate_code)
-    if end_gate is None:
+    if not await engine.has_gate(target_gate_code):
         raise HTTPException(
             status_code=404, detail=f"Gate '{target_gate_code}' not found")
 
-    route_repo = RouteRepository(session)
-    routes = await route_repo.list_all_routes()
-
     # Directed edges: each (from -> to) has its own HU weight.
-    edges = [(r.from_code, r.to_code, r.hu_distance) for r in routes]
-    result = dijkstra_shortest_path(edges, gate_code, target_gate_code)
+    async def search() -> PathResult | None:
+        started = time.perf_counter()
+        found = await engine.shortest_path(gate_code, target_gate_code)
+        observe_search(
+            engine.name, time.perf_counter() - started, found.settled if found else 0)
+        return found
 
-    if result is None:
+    with timed("search"):
+        if settings.coalesce_path_searches and engine.shareable:
+            # Identical concurrent requests on this graph version share one
+            # search; a new version gets a new key, so nothing stale is served.
+            result, shared = await path_searches.do(
+                (engine.name, await engine.version_tag(), gate_code, target_gate_code),
+                search)
+            if shared:
+                PATH_SEARCH_COALESCED.inc(engine=engine.name)
+        else:
+            result = await search()
+
+    if result is None or len(result.path) < 2:
         raise HTTPException(
             status_code=404,
             detail=f"No route from '{gate_code}' to '{target_gate_code}'",
         )
 
-    # Hyperspace cost: one-way journey along the directed path.
-    # total_cost = 0.10 * passengers * total_HU_of_path
-    hyperspace_cost = None
-    if passengers is not None:
-        cost = (
-            Decimal("0.10")
-            * Decimal(passengers)
-            * Decimal(result.total_weight)
-        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        hyperspace_cost = float(cost)
-
-    return CheapestPathOut(
+    # Hyperspace cost: one-way journey along the directed path. Built from
+    # a validated snapshot path, so it is rendered without re-validation.
+    return prevalidated_response(CheapestPathOut.model_construct(
         path=result.path,
         total_hu=result.total_weight,
         passengers=passengers,
-        hyperspace_cost_gbp=hyperspace_cost,
+        hyperspace_cost_gbp=_hyperspace_cost(passengers, result.total_weight),
+    ), response)
+
+
+@router.get(
+    "/{gate_code}/to/{target_gate_code}/alternatives",
+    response_model=AlternativePathsOut,
+)
+async def get_alternative_paths(
+    gate_code: str,
+    target_gate_code: str,
+    k: int = Query(default=3, gt=0, le=20),
+    passengers: int | None = Query(default=None, gt=0),
+    graph: GraphSnapshot = Depends(get_conditional_graph_snapshot),
+):
+    """
+    Return the K cheapest loop-free paths, cheapest first.
+
+    Fewer than k paths are returned when the network has no more
+    alternatives; the first path is always the cheapest path.
+
+    Error responses:
+    - 400 for invalid gate codes
+    - 404 if either gate is missing or no route exists
+    """
+    if len(gate_code) != 3 or len(target_gate_code) != 3:
+        raise HTTPException(
+            status_code=400, detail="gate codes must be 3-letter codes")
+
+    if not graph.has_gate(gate_code):
+        raise HTTPException(
+            status_code=404, detail=f"Gate '{gate_code}' not found")
+
+    if not graph.has_gate(target_gate_code):
+        raise HTTPException(
+            status_code=404, detail=f"Gate '{target_gate_code}' not found")
+
+    started = time.perf_counter()
+    with timed("search"):
+        results = k_shortest_paths(
+            graph.adjacency, graph.reverse_adjacency, gate_code, target_gate_code, k)
+    observe_search("yen", time.perf_counter() - started, None)
+
+    if not results:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No route from '{gate_code}' to '{target_gate_code}'",
+        )
+
+    return AlternativePathsOut(
+        from_code=gate_code,
+        to_code=target_gate_code,
+        paths=[
+            CheapestPathOut(
+                path=r.path,
+                total_hu=r.total_weight,
+                passengers=passengers,
+                hyperspace_cost_gbp=_hyperspace_cost(passengers, r.total_weight),
+            )
+            for r in results
+        ],
     )
+
+
+@router.get("/{gate_code}/routes", response_model=GateRoutesOut)
+async def get_routes_from_gate(
+    gate_code: str,
+    passengers: int | None = Query(default=None, gt=0),
+    graph: GraphSnapshot = Depends(get_conditional_graph_snapshot),
+):
+    """
+    Return the cheapest path from one gate to every reachable gate.
+
+    Runs a single full Dijkstra search instead of one search per target.
+    Unreachable gates are omitted; routes are ordered by target gate code.
+
+    Error responses:
+    - 400 for invalid gate codes
+    - 404 if the gate is missing
+    """
+    if len(gate_code) != 3:
+        raise HTTPException(
+            status_code=400, detail="gateCode must be a 3-letter code")
+
+    if not graph.has_gate(gate_code):
+        raise HTTPException(
+            status_code=404, detail=f"Gate '{gate_code}' not found")
+
+    started = time.perf_counter()
+    with timed("search"):
+        tree = shortest_path_tree(graph.adjacency, gate_code)
+    # A full tree search settles every reachable gate.
+    observe_search("tree", time.perf_counter() - started, len(tree.dist))
+
+    routes = []
+    for target in sorted(tree.dist):
+        if target == gate_code:
+            continue
+        result = tree.path_to(target)
+        routes.append(CheapestPathOut(
+            path=result.path,
+            total_hu=result.total_weight,
+            passengers=passengers,
+            hyperspace_cost_gbp=_hyperspace_cost(
+                passengers, result.total_weight),
+        ))
+
+    return GateRoutesOut(from_code=gate_code, passengers=passengers, routes=routes)
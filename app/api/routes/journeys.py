@@ -0,0 +1,123 @@
+"""Full-journey quote endpoint combining transport and round-trip hyperspace."""
+
+import time
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.algorithms.dijkstra import shortest_path_on_adjacency
+from app.algorithms.graph import GraphSnapshot
+from app.algorithms.hyperspace_pricing import hyperspace_cost_gbp
+from app.algorithms.transport_planner import compute_transport_plan
+from app.api.routes.transport import build_transport_response
+from app.api.schemas import CheapestPathOut, JourneyQuoteOut
+from app.api.responses import ORJSONResponse
+from app.api.server_timing import ServerTimingRoute
+from app.core.metrics import TRANSPORT_PLANS, observe_search
+from app.core.timing import timed
+from app.services.graph_store import get_graph_snapshot
+
+router = APIRouter(
+    prefix="/journeys",
+    tags=["journeys"],
+    route_class=ServerTimingRoute,
+    default_response_class=ORJSONResponse,
+)
+
+
+@router.get("/quote", response_model=JourneyQuoteOut)
+async def get_journey_quote(
+    from_code: str = Query(..., alias="from"),
+    to_code: str = Query(..., alias="to"),
+    distance: float = Query(...),
+    passengers: int = Query(..., gt=0),
+    parking: int = Query(0, ge=0),
+    graph: GraphSnapshot = Depends(get_graph_snapshot),
+):
+    """
+    Quote a whole journey in one call.
+
+    A journey is transport to the origin gate (distance in AU) plus an
+    outbound (from -> to) and inbound (to -> from) hyperspace leg. Both legs
+    come from the same graph snapshot: a forward search from the origin
+    and a backward search towards it over the reverse adjacency.
+
+    Error responses:
+    - 400 for invalid gate codes, distance, or planner validation errors
+    - 404 if either gate is missing, both are the same gate, or either
+      leg has no route
+    - 422 for FastAPI query validation failures
+    """
+    if len(from_code) != 3 or len(to_code) != 3:
+        raise HTTPException(
+            status_code=400, detail="gate codes must be 3-letter codes")
+    if distance <= 0:
+        raise HTTPException(status_code=400, detail="distance must be > 0")
+
+    for code in (from_code, to_code):
+        if not graph.has_gate(code):
+            raise HTTPException(
+                status_code=404, detail=f"Gate '{code}' not found")
+    # A journey to the origin itself has no hyperspace leg (same 404 as
+    # /gates/{a}/to/{a}).
+    if from_code == to_code:
+        raise HTTPException(
+            status_code=404, detail=f"No route from '{from_code}' to '{to_code}'")
+
+    started = time.perf_counter()
+    with timed("search"):
+        outbound = shortest_path_on_adjacency(graph.adjacency, from_code, to_code)
+    observe_search("dijkstra", time.perf_counter() - started,
+                   outbound.settled if outbound else 0)
+    if outbound is None:
+        raise HTTPException(
+            status_code=404, detail=f"No route from '{from_code}' to '{to_code}'")
+
+    # Searching the reverse graph from the origin yields the to -> from path
+    # back to front.
+    started = time.perf_counter()
+    with timed("search"):
+        inbound = shortest_path_on_adjacency(
+            graph.reverse_adjacency, from_code, to_code)
+    observe_search("dijkstra", time.perf_counter() - started,
+                   inbound.settled if inbound else 0)
+    if inbound is None:
+        raise HTTPException(
+            status_code=404, detail=f"No route from '{to_code}' to '{from_code}'")
+    inbound_path = list(reversed(inbound.path))
+
+    try:
+        with timed("pricing"):
+            plan = compute_transport_plan(
+                distance_au=distance, passengers=passengers, parking_days=parking
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    transport = build_transport_response(plan)
+    TRANSPORT_PLANS.inc(kind="journey", mode=transport.chosen_mode)
+
+    outbound_cost = hyperspace_cost_gbp(passengers, outbound.total_weight)
+    inbound_cost = hyperspace_cost_gbp(passengers, inbound.total_weight)
+    hyperspace_cost = Decimal(str(outbound_cost)) + Decimal(str(inbound_cost))
+    total_cost = hyperspace_cost + Decimal(str(transport.total_cost_gbp))
+
+    return JourneyQuoteOut(
+        from_code=from_code,
+        to_code=to_code,
+        passengers=passengers,
+        transport=transport,
+        outbound=CheapestPathOut(
+            path=outbound.path,
+            total_hu=outbound.total_weight,
+            passengers=passengers,
+            hyperspace_cost_gbp=outbound_cost,
+        ),
+        inbound=CheapestPathOut(
+            path=inbound_path,
+            total_hu=inbound.total_weight,
+            passengers=passengers,
+            hyperspace_cost_gbp=inbound_cost,
+        ),
+        hyperspace_cost_gbp=float(hyperspace_cost),
+        total_cost_gbp=float(total_cost),
+    )
@@ -1,17 +1,66 @@
 """Transport pricing endpoint with business-rule validation."""
 
-import math
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
 
-from app.algorithms.transport_planner import compute_transport_plan
-from app.api.schemas import TransportBreakdownOut, TransportResponseOut
+from app.algorithms.transport_batch import compute_transport_plans
+from app.algorithms.transport_planner import TransportPlan, compute_transport_plan
+from app.api.schemas import (
+    TransportBatchIn,
+    TransportBatchOut,
+    TransportBreakdownOut,
+    TransportResponseOut,
+)
+from app.api.responses import ORJSONResponse, prevalidated_response
+from app.api.server_timing import ServerTimingRoute
+from app.core.metrics import TRANSPORT_PLANS
+from app.core.timing import timed
 
-router = APIRouter(prefix="/transport", tags=["transport"])
+router = APIRouter(
+    prefix="/transport",
+    tags=["transport"],
+    route_class=ServerTimingRoute,
+    default_response_class=ORJSONResponse,
+)
 
 
-def _round_money(value: float) -> float:
-    """Round to two decimal places to match the planner output."""
-    return round(float(value), 2)
+def build_transport_response(plan: TransportPlan) -> TransportResponseOut:
+    """
+    Map a single-mode TransportPlan onto the public response schema.
+
+    The planner has already validated every value, so the models are
+    built with model_construct() (no second validation pass).
+    """
+    # Label the chosen plan for the response schema (single-mode only).
+    if plan.hstc_trips > 0 and plan.personal_trips > 0:
+        raise HTTPException(
+            status_code=500,
+            detail="transport planner returned a mixed plan; single-mode required",
+        )
+    if plan.hstc_trips > 0:
+        chosen_mode = "HSTC"
+    else:
+        chosen_mode = "PERSONAL"
+
+    return TransportResponseOut.model_construct(
+        distance_au=plan.distance_au,
+        passengers=plan.passengers,
+        parking_days=plan.parking_days,
+        total_cost_gbp=plan.total_cost_gbp,
+        plan=TransportBreakdownOut.model_construct(
+            hstc_trips=plan.hstc_trips,
+            personal_trips=plan.personal_trips,
+            hstc_trip_cost_gbp=plan.hstc_trip_cost_gbp,
+            personal_trip_cost_gbp=plan.personal_trip_cost_gbp,
+            hstc_total_gbp=plan.hstc_total_gbp,
+            personal_total_gbp=plan.personal_total_gbp,
+            total_capacity=plan.total_capacity,
+        ),
+        # "Pure" option totals for transparency, computed once by the planner.
+        hstc_only_total_gbp=plan.hstc_only_total_gbp,
+        personal_only_total_gbp=plan.personal_only_total_gbp,
+        chosen_mode=chosen_mode,
+    )
 
 
 @router.get("/{distance}", response_model=TransportResponseOut)
@@ -36,51 +85,59 @@ async def get_transport_cost(
         raise HTTPException(status_code=400, detail="distance must be > 0")
 
     try:
-        plan = compute_transport_plan(
-            distance_au=distance, passengers=passengers, parking_days=parking
-        )
+        with timed("pricing"):
+            plan = compute_transport_plan(
+                distance_au=distance, passengers=passengers, parking_days=parking
+            )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
-    # Compute "pure" option totals for transparency.
-    # HSTC-only: each trip carries up to 5.
-    hstc_only_trips = math.ceil(passengers / 5)
-    hstc_only_total = _round_money(hstc_only_trips * (0.45 * distance))
+    body = build_transport_response(plan)
+    TRANSPORT_PLANS.inc(kind="single", mode=body.chosen_mode)
+    return prevalidated_response(body)
 
-    # Personal-only: each vehicle carries up to 4 and pays parking.
-    personal_only_vehicles = math.ceil(passengers / 4)
-    personal_trip_with_parking = (
-        0.30 * distance) + (5.0 * parking)  # per vehicle
-    personal_only_total = _round_money(
-        personal_only_vehicles * personal_trip_with_parking)
 
-    # Label the chosen plan for the response schema (single-mode only).
-    if plan.hstc_trips > 0 and plan.personal_trips > 0:
-        raise HTTPException(
-            status_code=500,
-            detail="transport planner returned a mixed plan; single-mode required",
-        )
-    if plan.hstc_trips > 0:
-        chosen_mode = "HSTC"
-    else:
-        chosen_mode = "PERSONAL"
+@router.post(":batch", response_model=TransportBatchOut)
+async def get_transport_costs_batch(body: TransportBatchIn):
+    """
+    Price many (distance, passengers, parking) rows in one call.
 
-    return TransportResponseOut(
-        distance_au=plan.distance_au,
-        passengers=plan.passengers,
-        parking_days=plan.parking_days,
-        total_cost_gbp=plan.total_cost_gbp,
-        plan=TransportBreakdownOut(
-            hstc_trips=plan.hstc_trips,
-            personal_trips=plan.personal_trips,
-            hstc_trip_cost_gbp=plan.hstc_trip_cost_gbp,
-            personal_trip_cost_gbp=plan.personal_trip_cost_gbp,
-            hstc_total_gbp=plan.hstc_total_gbp,
-            personal_total_gbp=plan.personal_total_gbp,
-            total_capacity=plan.total_capacity,
-        ),
-        # Additional response fields for transparency.
-        hstc_only_total_gbp=hstc_only_total,
-        personal_only_total_gbp=personal_only_total,
-        chosen_mode=chosen_mode,
+    Uses the vectorised planner, which applies the same pricing, rounding
+    and tie-break rules as GET /transport/{distance} to whole columns, and
+    the same status codes for invalid values.
+
+    Error responses:
+    - 400 if any distance is not > 0 (as for the single endpoint's path)
+    - 422 for malformed or mismatched columns, passengers not > 0 or
+      parking_days < 0 (as for the single endpoint's query parameters)
+    """
+    try:
+        with timed("pricing"):
+            plans = compute_transport_plans(
+                distance_au=body.distance_au,
+                passengers=body.passengers,
+                parking_days=body.parking_days,
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    hstc_count = int(plans.hstc_chosen.sum())
+    TRANSPORT_PLANS.inc(hstc_count, kind="batch", mode="HSTC")
+    TRANSPORT_PLANS.inc(len(plans.hstc_chosen) - hstc_count, kind="batch", mode="PERSONAL")
+
+    return TransportBatchOut(
+        distance_au=plans.distance_au.tolist(),
+        passengers=plans.passengers.tolist(),
+        parking_days=plans.parking_days.tolist(),
+        total_cost_gbp=plans.total_cost_gbp.tolist(),
+        chosen_mode=np.where(plans.hstc_chosen, "HSTC", "PERSONAL").tolist(),
+        hstc_trips=plans.hstc_trips.tolist(),
+        personal_trips=plans.personal_trips.tolist(),
+        hstc_trip_cost_gbp=plans.hstc_trip_cost_gbp.tolist(),
+        personal_trip_cost_gbp=plans.personal_trip_cost_gbp.tolist(),
+        hstc_total_gbp=plans.hstc_total_gbp.tolist(),
+        personal_total_gbp=plans.personal_total_gbp.tolist(),
+        total_capacity=plans.total_capacity.tolist(),
+        hstc_only_total_gbp=plans.hstc_only_total_gbp.tolist(),
+        personal_only_total_gbp=plans.personal_only_total_gbp.tolist(),
     )
@@ -1,6 +1,9 @@
-"""Pydantic response schemas for API endpoints."""
+"""Pydantic request and response schemas for API endpoints."""
 
-from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Annotated
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class RouteOut(BaseModel):
@@ -28,6 +31,49 @@ class CheapestPathOut(BaseModel):
     hyperspace_cost_gbp: float | None = Field(default=None, ge=0)
 
 
+class AlternativePathsOut(BaseModel):
+    """Up to K cheapest loop-free paths between two gates, cheapest first."""
+    from_code: str = Field(..., min_length=3, max_length=3)
+    to_code: str = Field(..., min_length=3, max_length=3)
+    paths: list[CheapestPathOut]
+
+
+class GateRoutesOut(BaseModel):
+    """Cheapest paths from one gate to every gate reachable from it."""
+    from_code: str = Field(..., min_length=3, max_length=3)
+    passengers: int | None = Field(default=None, gt=0)
+    routes: list[CheapestPathOut]
+
+
+class PathQueryIn(BaseModel):
+    """One origin/destination pair in a batch cheapest-path request."""
+    # Codes and passengers are validated per item so one bad entry does not
+    # reject the whole batch.
+    from_code: str
+    to_code: str
+    passengers: int | None = None
+
+
+class BatchPathRequestIn(BaseModel):
+    """Batch of cheapest-path queries, answered in request order."""
+    items: list[PathQueryIn] = Field(..., min_length=1, max_length=10_000)
+
+
+class BatchPathResultOut(BaseModel):
+    """Result for one batch item: either a path or the error it would raise."""
+    from_code: str
+    to_code: str
+    # HTTP status the single-pair endpoint would have returned.
+    status_code: int
+    result: CheapestPathOut | None = None
+    error: str | None = None
+
+
+class BatchPathResponseOut(BaseModel):
+    """Batch cheapest-path results, one per request item in the same order."""
+    results: list[BatchPathResultOut]
+
+
 class TransportBreakdownOut(BaseModel):
     """Breakdown of trips, per-trip costs, and totals for a single-mode plan."""
     hstc_trips: int = Field(..., ge=0)
@@ -58,3 +104,119 @@ class TransportResponseOut(BaseModel):
 
     # Chosen mode is always "HSTC" or "PERSONAL" for single-mode plans.
     chosen_mode: str = Field(..., min_length=1)
+
+
+class RoutingTableStatsOut(BaseModel):
+    """Build statistics for the precomputed routing index (table or hierarchy)."""
+    routing_mode: str
+    graph_version: int
+    # Table fields are null until a table has been built for the current graph.
+    table_version: int | None = None
+    node_count: int | None = Field(default=None, ge=0)
+    build_seconds: float | None = Field(default=None, ge=0)
+    memory_bytes: int | None = Field(default=None, ge=0)
+
+
+class BulkImportOut(BaseModel):
+    """Outcome of a bulk gate or route import."""
+    kind: str
+    rows: int = Field(..., ge=0)
+    # Placeholder gates created for codes only referenced by routes.
+    gates_created: int = Field(..., ge=0)
+    # Graph version after the import (bumped once per import).
+    graph_version: int
+    seconds: float = Field(..., ge=0)
+
+
+class PoolStatsOut(BaseModel):
+    """Connection-pool usage for one DB engine (counts null for non-queue pools)."""
+    name: str
+    # Connection URL with the password masked.
+    url: str
+    healthy: bool
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    # Connections beyond pool_size (negative while the pool is still filling).
+    overflow: int | None = None
+
+
+class ProfileEntryOut(BaseModel):
+    """One function's timings within a captured request profile."""
+    function: str
+    calls: int = Field(..., ge=0)
+    total_seconds: float = Field(..., ge=0)
+    cumulative_seconds: float = Field(..., ge=0)
+
+
+class RequestProfileOut(BaseModel):
+    """A profiled request with its top functions by cumulative time."""
+    id: int
+    method: str
+    path: str
+    status: int
+    duration_seconds: float = Field(..., ge=0)
+    started_at: datetime
+    reason: str
+    entries: list[ProfileEntryOut]
+
+
+class TransportBatchIn(BaseModel):
+    """
+    Column-oriented batch of transport pricing requests (row i across columns).
+
+    passengers and parking_days carry the same constraints as the single
+    endpoint's query parameters, so a bad value is a 422 in both.
+    """
+    distance_au: list[float] = Field(..., min_length=1, max_length=100_000)
+    passengers: list[Annotated[int, Field(gt=0)]] = Field(
+        ..., min_length=1, max_length=100_000)
+    parking_days: list[Annotated[int, Field(ge=0)]] = Field(
+        ..., min_length=1, max_length=100_000)
+
+    @model_validator(mode="after")
+    def _columns_same_length(self):
+        """Every column must describe the same rows."""
+        if not (len(self.distance_au) == len(self.passengers) == len(self.parking_days)):
+            raise ValueError(
+                "distance_au, passengers and parking_days must be the same length")
+        return self
+
+
+class TransportBatchOut(BaseModel):
+    """Column-oriented batch pricing results, same row order as the request."""
+    distance_au: list[float]
+    passengers: list[int]
+    parking_days: list[int]
+
+    total_cost_gbp: list[float]
+    chosen_mode: list[str]
+
+    hstc_trips: list[int]
+    personal_trips: list[int]
+    hstc_trip_cost_gbp: list[float]
+    personal_trip_cost_gbp: list[float]
+    hstc_total_gbp: list[float]
+    personal_total_gbp: list[float]
+    total_capacity: list[int]
+
+    hstc_only_total_gbp: list[float]
+    personal_only_total_gbp: list[float]
+
+
+class JourneyQuoteOut(BaseModel):
+    """Full journey quote: transport to the origin gate plus round-trip hyperspace."""
+    from_code: str = Field(..., min_length=3, max_length=3)
+    to_code: str = Field(..., min_length=3, max_length=3)
+    passengers: int = Field(..., gt=0)
+
+    # Real-space leg to the origin gate (same shape as GET /transport).
+    transport: TransportResponseOut
+
+    # Directed hyperspace legs; inbound may take a different path and cost.
+    outbound: CheapestPathOut
+    inbound: CheapestPathOut
+
+    # outbound + inbound hyperspace cost, then transport + hyperspace.
+    hyperspace_cost_gbp: float = Field(..., ge=0)
+    total_cost_gbp: float = Field(..., ge=0)
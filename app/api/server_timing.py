@@ -0,0 +1,72 @@
+"""APIRoute subclass that attaches a Server-Timing header to responses."""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from typing import Any, Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.timing import ServerTiming, current_timing, start_timing, stop_timing
+
+
+def _mark_endpoint_done(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # Records when the endpoint body returns; whatever the route does after
+    # that (response-model validation, JSON encoding) is serialisation.
+    if not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timing = current_timing()
+            if timing is not None:
+                timing.endpoint_done = time.perf_counter()
+
+    return wrapper
+
+
+class ServerTimingRoute(APIRoute):
+    """
+    Route that reports per-phase timings in a Server-Timing header.
+
+    Code inside the request marks phases with app.core.timing.timed()
+    (db, graph_build, search, pricing); the route adds `serialize` (time
+    after the endpoint returned) and `total`. Error responses raised as
+    HTTPException carry the header too.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _mark_endpoint_done(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            token = start_timing()
+            timing = current_timing()
+            try:
+                response = await handler(request)
+            except HTTPException as exc:
+                _finish(timing)
+                exc.headers = {**(exc.headers or {}), "Server-Timing": timing.header_value()}
+                raise
+            finally:
+                stop_timing(token)
+            _finish(timing)
+            response.headers["Server-Timing"] = timing.header_value()
+            return response
+
+        return timed_handler
+
+
+def _finish(timing: ServerTiming) -> None:
+    now = time.perf_counter()
+    if timing.endpoint_done is not None:
+        timing.add("serialize", now - timing.endpoint_done)
+    timing.add("total", now - timing.started)
@@ -1,5 +1,7 @@
 """Application configuration loaded from environment variables."""
 
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +23,82 @@ class Settings(BaseSettings):
     db_user: str = "hstc"
     db_password: str = "hstc"
 
+    # Connection pool (Postgres). pool_recycle < 0 disables recycling;
+    # statement cache size 0 disables prepared-statement caching (needed
+    # behind PgBouncer in transaction mode).
+    db_pool_size: int = Field(default=5, ge=1)
+    db_max_overflow: int = Field(default=10, ge=0)
+    db_pool_timeout: float = Field(default=30.0, gt=0)
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = Field(default=100, ge=0)
+
+    # Optional comma-separated read replicas. Read-only sessions rotate
+    # across healthy replicas; writes always go to the primary. A replica
+    # that fails is skipped for db_replica_retry_seconds.
+    database_replica_urls_raw: str | None = Field(
+        default=None, alias="DATABASE_REPLICA_URLS")
+    db_replica_retry_seconds: float = Field(default=30.0, gt=0)
+
+    # Routing
+    # Backend answering cheapest-path queries: "memory" searches the graph
+    # snapshot (see routing_mode); "sql" searches routes in the database one
+    # query per hop, handing searches whose cheapest path may need more than
+    # routing_sql_max_hops routes to the memory engine.
+    routing_engine: Literal["memory", "sql"] = "memory"
+    routing_sql_max_hops: int = Field(default=8, ge=1)
+    # "dijkstra" searches per request; "all_pairs" (next-hop table) and
+    # "contraction" (contraction hierarchy) precompute a routing index in the
+    # background whenever the graph snapshot changes.
+    routing_mode: Literal["dijkstra", "all_pairs", "contraction"] = "dijkstra"
+    # Process-pool size for all-pairs builds (0 = build in a single thread).
+    routing_table_workers: int = 0
+    # A snapshot differing from the last one by at most this many route
+    # changes (same gates) patches the all-pairs table in place of a full
+    # rebuild; 0 always rebuilds.
+    routing_table_max_incremental_changes: int = Field(default=32, ge=0)
+
+    # Directory (ideally tmpfs, e.g. /dev/shm/hstc) where the compiled CSR
+    # graph and all-pairs table are published as files that every worker on
+    # the host maps read-only, instead of each holding and building its own
+    # copy. Unset keeps everything per process.
+    shared_graph_dir: str | None = None
+
+    # Cross-worker invalidation. Every network write bumps a version row;
+    # on Postgres workers LISTEN for its NOTIFY (pinging the listening
+    # connection after graph_version_keepalive_seconds of silence), and
+    # elsewhere, or while reconnecting, poll it every
+    # graph_version_poll_seconds.
+    graph_version_poll_seconds: float = Field(default=2.0, gt=0)
+    graph_version_keepalive_seconds: float = Field(default=60.0, gt=0)
+
+    # Where point-to-point searches run. "inline" keeps them on the event
+    # loop; "thread"/"process" offload searches on graphs with at least
+    # search_offload_min_edges edges to a pool of search_workers, so one big
+    # search cannot stall other requests. Process workers hold their own
+    # copy of the graph; only (start, target) is sent per search.
+    search_executor: Literal["inline", "thread", "process"] = "inline"
+    search_offload_min_edges: int = Field(default=50_000, ge=0)
+    search_workers: int = Field(default=4, ge=1)
+
+    # Concurrent requests for the same (from, to) on the same graph version
+    # share one in-flight search instead of each running their own.
+    coalesce_path_searches: bool = True
+
+    # Shared secret for the /admin endpoints, sent as `X-Admin-Token`.
+    # Unset disables them (404): they can replace the network and expose
+    # profiles and database hosts.
+    admin_token: str | None = None
+
+    # Profiling (off by default). A request is run under cProfile when it
+    # sends `X-Debug-Profile: <profiling_token>` or is randomly sampled at
+    # profiling_sample_rate (0..1); results are kept in a ring buffer and
+    # served at GET /admin/profiles.
+    profiling_token: str | None = None
+    profiling_sample_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    profiling_buffer_size: int = Field(default=50, gt=0)
+    profiling_top_n: int = Field(default=30, gt=0)
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     @property
@@ -37,22 +115,43 @@ class Settings(BaseSettings):
         - postgresql:// -> postgresql+asyncpg://
         """
         if self.database_url_raw:
-            url = self.database_url_raw.strip()
-
-            # Normalize legacy prefix
-            if url.startswith("postgres://"):
-                url = url.replace("postgres://", "postgresql://", 1)
-
-            # Ensure async driver
-            if url.startswith("postgresql://"):
-                url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
-
-            return url
+            return _normalize_async_url(self.database_url_raw)
 
         return (
             f"postgresql+asyncpg://{self.db_user}:{self.db_password}"
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def database_replica_urls(self) -> list[str]:
+        """Read-replica URLs from DATABASE_REPLICA_URLS, normalized like database_url."""
+        if not self.database_replica_urls_raw:
+            return []
+        return [
+            _normalize_async_url(url)
+            for url in self.database_replica_urls_raw.split(",")
+            if url.strip()
+        ]
+
+
+def _normalize_async_url(url: str) -> str:
+    """
+    Normalize a (possibly sync-style) URL for SQLAlchemy's async engine.
+
+    - postgres:// -> postgresql://
+    - postgresql:// -> postgresql+asyncpg://
+    """
+    url = url.strip()
+
+    # Normalize legacy prefix
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+
+    # Ensure async driver
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    return url
+
 
 settings = Settings()
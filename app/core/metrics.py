@@ -0,0 +1,281 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+A deliberately small registry (counters, gauges, histograms with labels)
+so the API can expose /metrics without an external collector or client
+library. Metric updates are guarded by a lock because routing-index builds
+and pool checkouts can run off the event loop thread.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Prometheus client defaults, in seconds.
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0,
+)
+# Node counts grow geometrically with search radius, so use powers of 4.
+SETTLED_NODE_BUCKETS = tuple(float(4 ** i) for i in range(11))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Shared bookkeeping: name, help text, label names and a lock."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        """Return exposition lines for this metric, including HELP/TYPE."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add a non-negative amount."""
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value for one label set (0 if never incremented)."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. requests in flight)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge to an absolute value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        """Current value for one label set (0 if never set)."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus sum and count."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum.
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[slot] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        """Number of observations for one label set."""
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in sorted(self._counts.items())]
+        names = self.labelnames + ("le",)
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                labels = _format_labels(names, key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric; names must be unique."""
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+))
+HTTP_REQUESTS_IN_PROGRESS = REGISTRY.register(Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served, by route template.",
+    ("method", "route"),
+))
+DB_POOL_CHECKOUT = REGISTRY.register(Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the DB pool.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+))
+DB_POOL_CONNECTIONS = REGISTRY.register(Gauge(
+    "db_pool_connections",
+    "Pooled DB connections by engine and state (checked_in/checked_out/overflow).",
+    ("pool", "state"),
+))
+DB_POOL_HEALTHY = REGISTRY.register(Gauge(
+    "db_pool_healthy",
+    "1 if the engine is in rotation (replicas are dropped after failures).",
+    ("pool",),
+))
+PATH_SEARCH_DURATION = REGISTRY.register(Histogram(
+    "path_search_duration_seconds",
+    "Path search time by engine (tree: full Dijkstra trees, yen: k-shortest paths).",
+    ("engine",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+))
+PATH_SEARCH_SETTLED = REGISTRY.register(Histogram(
+    "path_search_settled_nodes",
+    "Nodes settled per cheapest-path search, by engine.",
+    ("engine",),
+    buckets=SETTLED_NODE_BUCKETS,
+))
+PATH_SEARCH_COALESCED = REGISTRY.register(Counter(
+    "path_search_coalesced_total",
+    "Cheapest-path requests that joined an identical search already in flight.",
+    ("engine",),
+))
+PATH_SEARCH_FALLBACKS = REGISTRY.register(Counter(
+    "path_search_fallbacks_total",
+    "Searches an engine could not answer (e.g. past the SQL hop bound), by engine.",
+    ("engine",),
+))
+SEARCH_EXECUTOR_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "search_executor_queue_depth",
+    "Path searches submitted to the worker pool and not yet finished.",
+    ("executor",),
+))
+SEARCH_EXECUTOR_SEARCHES = REGISTRY.register(Counter(
+    "search_executor_searches_total",
+    "Point-to-point searches by where they ran (inline, thread, process).",
+    ("executor",),
+))
+TRANSPORT_PLANS = REGISTRY.register(Counter(
+    "transport_plans_total",
+    "Transport plans computed, by request kind and chosen mode.",
+    ("kind", "mode"),
+))
+
+
+def observe_search(engine: str, seconds: float, settled: int | None) -> None:
+    """
+    Record one path search's duration and settled-node count.
+
+    settled is None for searches that do not count settled nodes (e.g.
+    Yen's k-shortest paths); only their duration is recorded.
+    """
+    PATH_SEARCH_DURATION.observe(seconds, engine=engine)
+    if settled is not None:
+        PATH_SEARCH_SETTLED.observe(settled, engine=engine)
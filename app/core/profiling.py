@@ -0,0 +1,95 @@
+"""Opt-in cProfile capture of individual requests, kept in a ring buffer."""
+
+from __future__ import annotations
+
+import cProfile
+import itertools
+import pstats
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, List, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class ProfileEntry:
+    """One function's row from a captured profile."""
+    function: str
+    calls: int
+    total_seconds: float
+    cumulative_seconds: float
+
+
+@dataclass(frozen=True)
+class RequestProfile:
+    """Top entries (by cumulative time) captured for one request."""
+    id: int
+    method: str
+    path: str
+    status: int
+    duration_seconds: float
+    started_at: datetime
+    # "header" (explicit debug header) or "sample" (random sampling).
+    reason: str
+    entries: Tuple[ProfileEntry, ...]
+
+
+def top_entries(profile: cProfile.Profile, limit: int) -> Tuple[ProfileEntry, ...]:
+    """Return the `limit` functions with the highest cumulative time."""
+    stats = pstats.Stats(profile).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    entries = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in rows[:limit]:
+        location = name if filename == "~" else f"{filename}:{line}({name})"
+        entries.append(ProfileEntry(
+            function=location,
+            calls=calls,
+            total_seconds=total,
+            cumulative_seconds=cumulative,
+        ))
+    return tuple(entries)
+
+
+class ProfileStore:
+    """
+    Bounded, newest-last buffer of request profiles.
+
+    Only one request is profiled at a time: cProfile hooks the whole
+    thread, and on the event loop thread concurrent profiles would both
+    see (and disturb) each other's work. try_acquire() hands out that slot.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._profiles: Deque[RequestProfile] = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._busy = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Claim the single profiling slot; False if another request has it."""
+        return self._busy.acquire(blocking=False)
+
+    def release(self) -> None:
+        """Give the profiling slot back."""
+        self._busy.release()
+
+    def next_id(self) -> int:
+        """Allocate an id for a profile about to be captured."""
+        return next(self._ids)
+
+    def add(self, profile: RequestProfile) -> None:
+        """Store a profile, evicting the oldest when full."""
+        self._profiles.append(profile)
+
+    def recent(self) -> List[RequestProfile]:
+        """Stored profiles, newest first."""
+        return list(reversed(self._profiles))
+
+    def clear(self) -> None:
+        """Drop every stored profile."""
+        self._profiles.clear()
+
+
+profile_store = ProfileStore(settings.profiling_buffer_size)
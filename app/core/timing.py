@@ -0,0 +1,60 @@
+"""Per-request phase timings reported through the Server-Timing header."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator
+
+
+class ServerTiming:
+    """Accumulated wall-clock seconds per named phase for one request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        # Insertion-ordered, so phases appear in the order they first ran.
+        self.phases: Dict[str, float] = {}
+        self.endpoint_done: float | None = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time to a phase (repeated phases, e.g. two queries, sum up)."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def header_value(self) -> str:
+        """Render phases as a Server-Timing header value (durations in ms)."""
+        return ", ".join(
+            f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in self.phases.items()
+        )
+
+
+_current: ContextVar[ServerTiming | None] = ContextVar("server_timing", default=None)
+
+
+def start_timing() -> Token:
+    """Begin collecting phases for the current request context."""
+    return _current.set(ServerTiming())
+
+
+def current_timing() -> ServerTiming | None:
+    """Collector for the current request, or None outside a timed request."""
+    return _current.get()
+
+
+def stop_timing(token: Token) -> None:
+    """Stop collecting; restores the previous (normally empty) context."""
+    _current.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Time the enclosed block as `phase`; a no-op outside a timed request."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, time.perf_counter() - started)
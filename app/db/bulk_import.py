@@ -0,0 +1,340 @@
+"""
+Bulk gate/route import from CSV or NDJSON streams.
+
+Rows are validated in a single streaming pass and loaded without building
+ORM objects: Postgres (asyncpg) gets them via COPY, other drivers (SQLite in
+tests) via batched executemany. Routes are staged in a temp table and then
+merged into `routes` with one INSERT ... SELECT, creating placeholder gates
+for any unknown codes so foreign keys hold.
+
+CLI usage:
+    python -m app.db.bulk_import routes.csv [--gates gates.csv] [--replace]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, List, Literal, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+ImportFormat = Literal["csv", "ndjson"]
+EdgeRecord = Tuple[str, str, int]
+GateRecord = Tuple[str, str]
+
+# Rows per executemany call on drivers without COPY support.
+DEFAULT_BATCH_SIZE = 5_000
+
+_EDGE_FIELDS = ("from_code", "to_code", "hu_distance")
+_GATE_FIELDS = ("code", "name")
+_GATE_NAME_MAX = 50
+# ASCII only: str.isalpha() would also accept e.g. "sol" or "ÅÉÎ".
+_CODE_RE = re.compile(r"[A-Z]{3}")
+
+_STAGING_TABLE = "route_import"
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    """Outcome of one bulk import."""
+    kind: Literal["gates", "routes"]
+    rows: int
+    # Placeholder gates created for codes only seen in route rows.
+    gates_created: int
+    seconds: float
+
+
+def _check_code(value: object, line_no: int, field: str) -> str:
+    if not isinstance(value, str) or not _CODE_RE.fullmatch(value):
+        raise ValueError(f"line {line_no}: {field} must be a 3-letter uppercase code")
+    return value
+
+
+def _split_line(line: str, fmt: ImportFormat, fields: Tuple[str, ...], line_no: int) -> list:
+    """Return the line's values in `fields` order."""
+    if fmt == "csv":
+        values = next(csv.reader([line]))
+        if len(values) != len(fields):
+            raise ValueError(f"line {line_no}: expected {len(fields)} columns")
+        return [v.strip() for v in values]
+
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"line {line_no}: invalid JSON") from e
+    if not isinstance(record, dict):
+        raise ValueError(f"line {line_no}: expected a JSON object")
+    missing = [f for f in fields if f not in record]
+    if missing:
+        raise ValueError(f"line {line_no}: missing {', '.join(missing)}")
+    return [record[f] for f in fields]
+
+
+async def _numbered_rows(
+    lines: AsyncIterable[str], fmt: ImportFormat, fields: Tuple[str, ...]
+) -> AsyncIterator[Tuple[int, list]]:
+    """Yield (line number, values), skipping blank lines and a CSV header."""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        line = line.strip()
+        if not line:
+            continue
+        values = _split_line(line, fmt, fields, line_no)
+        if line_no == 1 and fmt == "csv" and tuple(values) == fields:
+            continue
+        yield line_no, values
+
+
+async def iter_edges(lines: AsyncIterable[str], fmt: ImportFormat) -> AsyncIterator[EdgeRecord]:
+    """
+    Parse and validate (from_code, to_code, hu_distance) rows as they stream in.
+
+    Raises:
+        ValueError: On the first malformed row (bad code, non-positive or
+            non-integer HU, self-loop, or a duplicate directed edge), naming
+            its line number.
+    """
+    seen = set()
+    async for line_no, (from_code, to_code, hu) in _numbered_rows(lines, fmt, _EDGE_FIELDS):
+        from_code = _check_code(from_code, line_no, "from_code")
+        to_code = _check_code(to_code, line_no, "to_code")
+        if from_code == to_code:
+            raise ValueError(f"line {line_no}: route must join two different gates")
+
+        try:
+            hu_distance = int(hu)
+        except (TypeError, ValueError):
+            hu_distance = None
+        if hu_distance is None or isinstance(hu, (bool, float)) or hu_distance <= 0:
+            raise ValueError(f"line {line_no}: hu_distance must be a positive integer")
+
+        key = from_code + to_code
+        if key in seen:
+            raise ValueError(f"line {line_no}: duplicate route {from_code}->{to_code}")
+        seen.add(key)
+        yield from_code, to_code, hu_distance
+
+
+async def iter_gates(lines: AsyncIterable[str], fmt: ImportFormat) -> AsyncIterator[GateRecord]:
+    """
+    Parse and validate (code, name) rows as they stream in.
+
+    Raises:
+        ValueError: On the first malformed or duplicate row, naming its line.
+    """
+    seen = set()
+    async for line_no, (code, name) in _numbered_rows(lines, fmt, _GATE_FIELDS):
+        code = _check_code(code, line_no, "code")
+        if not isinstance(name, str) or not name.strip() or len(name) > _GATE_NAME_MAX:
+            raise ValueError(
+                f"line {line_no}: name must be 1-{_GATE_NAME_MAX} characters")
+        if code in seen:
+            raise ValueError(f"line {line_no}: duplicate gate {code}")
+        seen.add(code)
+        yield code, name.strip()
+
+
+async def _batches(rows: AsyncIterable[tuple], size: int) -> AsyncIterator[List[tuple]]:
+    batch: List[tuple] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _uses_asyncpg(conn: AsyncConnection) -> bool:
+    return conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg"
+
+
+async def import_gates(
+    conn: AsyncConnection,
+    lines: AsyncIterable[str],
+    fmt: ImportFormat,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportResult:
+    """
+    Upsert gates (code, name) from a CSV/NDJSON line stream.
+
+    Gate tables are small, so rows go straight into `gates` in batches;
+    existing codes get their name updated. The caller owns the transaction.
+    """
+    started = time.perf_counter()
+    upsert = text(
+        "INSERT INTO gates (code, name) VALUES (:code, :name) "
+        "ON CONFLICT (code) DO UPDATE SET name = excluded.name"
+    )
+    rows = 0
+    async for batch in _batches(iter_gates(lines, fmt), batch_size):
+        await conn.execute(upsert, [{"code": c, "name": n} for c, n in batch])
+        rows += len(batch)
+
+    return ImportResult(
+        kind="gates", rows=rows, gates_created=0,
+        seconds=time.perf_counter() - started,
+    )
+
+
+async def import_routes(
+    conn: AsyncConnection,
+    lines: AsyncIterable[str],
+    fmt: ImportFormat,
+    replace: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportResult:
+    """
+    Load directed routes from a CSV/NDJSON line stream.
+
+    Rows are staged in a temp table (COPY on asyncpg, executemany
+    elsewhere), then merged into `routes` in one statement: existing
+    (from, to) pairs get the new HU distance. The caller owns the
+    transaction, so a validation error part-way rolls back everything.
+
+    Args:
+        conn: Connection inside an open transaction.
+        lines: Text lines of the edge file.
+        fmt: "csv" (from_code,to_code,hu_distance; header optional) or
+            "ndjson" (one object per line with those keys).
+        replace: Delete all existing routes first, so the file becomes the
+            complete network.
+        batch_size: Rows per executemany call on the fallback path.
+
+    Returns:
+        ImportResult with the number of routes loaded.
+
+    Raises:
+        ValueError: If any row fails validation.
+    """
+    started = time.perf_counter()
+    edges = iter_edges(lines, fmt)
+    asyncpg_conn = _uses_asyncpg(conn)
+
+    if asyncpg_conn:
+        # ON COMMIT DROP: the staging table never outlives this transaction.
+        await conn.execute(text(
+            f"CREATE TEMP TABLE {_STAGING_TABLE} (from_code VARCHAR(3) NOT NULL, "
+            "to_code VARCHAR(3) NOT NULL, hu_distance INTEGER NOT NULL) ON COMMIT DROP"
+        ))
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            _STAGING_TABLE, records=edges, columns=list(_EDGE_FIELDS))
+    else:
+        await conn.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} (from_code VARCHAR(3) "
+            "NOT NULL, to_code VARCHAR(3) NOT NULL, hu_distance INTEGER NOT NULL)"
+        ))
+        await conn.execute(text(f"DELETE FROM {_STAGING_TABLE}"))
+        stage = text(
+            f"INSERT INTO {_STAGING_TABLE} (from_code, to_code, hu_distance) "
+            "VALUES (:from_code, :to_code, :hu_distance)"
+        )
+        async for batch in _batches(edges, batch_size):
+            await conn.execute(stage, [
+                {"from_code": u, "to_code": v, "hu_distance": w} for u, v, w in batch
+            ])
+
+    rows = await conn.scalar(text(f"SELECT count(*) FROM {_STAGING_TABLE}"))
+
+    # "WHERE true" lets SQLite parse ON CONFLICT after INSERT ... SELECT.
+    created = await conn.execute(text(
+        "INSERT INTO gates (code, name) SELECT code, code FROM ("
+        f"SELECT from_code AS code FROM {_STAGING_TABLE} "
+        f"UNION SELECT to_code FROM {_STAGING_TABLE}) AS codes WHERE true "
+        "ON CONFLICT (code) DO NOTHING"
+    ))
+    if replace:
+        await conn.execute(text("DELETE FROM routes"))
+    await conn.execute(text(
+        "INSERT INTO routes (from_code, to_code, hu_distance) "
+        f"SELECT from_code, to_code, hu_distance FROM {_STAGING_TABLE} WHERE true "
+        "ON CONFLICT (from_code, to_code) DO UPDATE SET hu_distance = excluded.hu_distance"
+    ))
+
+    if not asyncpg_conn:
+        await conn.execute(text(f"DROP TABLE {_STAGING_TABLE}"))
+
+    return ImportResult(
+        kind="routes",
+        rows=rows,
+        gates_created=max(created.rowcount, 0),
+        seconds=time.perf_counter() - started,
+    )
+
+
+async def decode_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Turn a UTF-8 byte stream (e.g. a request body) into text lines."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _file_lines(path: Path) -> AsyncIterator[str]:
+    with path.open(encoding="utf-8", newline="") as f:
+        for line in f:
+            yield line
+
+
+def _format_for(path: Path) -> ImportFormat:
+    return "ndjson" if path.suffix.lower() in (".ndjson", ".jsonl") else "csv"
+
+
+async def _run_cli(routes: Path, gates: Path | None, replace: bool) -> None:
+    # Imported lazily so the parsing helpers stay usable without a DB config.
+    from app.db.base import Base
+    from app.db.graph_version import bump_graph_version
+    from app.db.session import engine
+    from app.models.gate import Gate  # noqa: F401  (populates Base.metadata)
+    from app.models.graph_version import GraphVersion  # noqa: F401
+    from app.models.route import Route  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if gates is not None:
+            result = await import_gates(conn, _file_lines(gates), _format_for(gates))
+            print(f"gates: {result.rows} rows in {result.seconds:.2f}s")
+        result = await import_routes(
+            conn, _file_lines(routes), _format_for(routes), replace=replace)
+        print(
+            f"routes: {result.rows} rows in {result.seconds:.2f}s "
+            f"({result.gates_created} placeholder gates created)"
+        )
+        # Running servers reload once this transaction commits.
+        await bump_graph_version(conn)
+    await engine.dispose()
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Command-line entry point; the whole import runs in one transaction."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("routes", type=Path, help="CSV or NDJSON (.ndjson/.jsonl) edge file")
+    parser.add_argument("--gates", type=Path, help="optional CSV or NDJSON gate file (code,name)")
+    parser.add_argument("--replace", action="store_true",
+                        help="delete existing routes before importing")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run_cli(args.routes, args.gates, args.replace))
+    except ValueError as e:
+        parser.exit(1, f"import failed: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Database-wide graph version used to invalidate caches in every worker.
+
+Each transaction that writes gates or routes increments the single
+graph_version row before it commits. On Postgres it also issues
+pg_notify(GRAPH_CHANNEL, <new version>), which is delivered to listeners
+only if (and when) the transaction commits.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Connection, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.timing import timed
+from app.models.graph_version import GraphVersion
+
+GRAPH_CHANNEL = "graph_changed"
+_ROW_ID = 1
+
+
+def bump_graph_version_sync(conn: Connection) -> int:
+    """Increment the version inside conn's transaction and queue a NOTIFY."""
+    version = conn.execute(
+        update(GraphVersion)
+        .where(GraphVersion.id == _ROW_ID)
+        .values(version=GraphVersion.version + 1)
+        .returning(GraphVersion.version)
+    ).scalar()
+    if version is None:
+        # First write to a fresh database.
+        version = 1
+        conn.execute(insert(GraphVersion).values(id=_ROW_ID, version=version))
+    if conn.dialect.name == "postgresql":
+        conn.execute(select(func.pg_notify(GRAPH_CHANNEL, str(version))))
+    return version
+
+
+async def bump_graph_version(conn: AsyncConnection) -> int:
+    """Async wrapper of bump_graph_version_sync for Core-level writers."""
+    return await conn.run_sync(bump_graph_version_sync)
+
+
+async def read_graph_version(session: AsyncSession) -> int:
+    """Return the current graph version (0 if nothing was ever written)."""
+    with timed("db"):
+        version = await session.scalar(
+            select(GraphVersion.version).where(GraphVersion.id == _ROW_ID))
+    return version or 0
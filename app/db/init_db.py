@@ -9,6 +9,7 @@ from app.db.session import AsyncSessionLocal, engine
 
 # Import models here so Base.metadata is populated before create_all()
 from app.models.gate import Gate
+from app.models.graph_version import GraphVersion  # noqa: F401
 from app.models.route import Route
 
 
@@ -1,15 +1,69 @@
-"""Async SQLAlchemy engine and session factory."""
+"""Async SQLAlchemy engines (primary + optional read replicas) and sessions."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from __future__ import annotations
 
-from app.core.config import settings
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List
 
-# Create a single async engine for the whole app.
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,  # Set True temporarily if you want verbose SQL logs.
-    pool_pre_ping=True,
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT, DB_POOL_CONNECTIONS, DB_POOL_HEALTHY
+
+logger = logging.getLogger(__name__)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Default async queue pool that records how long each checkout waits."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started)
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """Pool settings for an engine; non-Postgres URLs keep dialect defaults."""
+    if not url.startswith("postgresql"):
+        return {"pool_pre_ping": settings.db_pool_pre_ping}
+    return {
+        # Queue pool instrumented for /metrics.
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,  # Set True temporarily if you want verbose SQL logs.
+        **_engine_options(url),
+    )
+
+
+# Primary engine: all writes, and reads when no replica is available.
+engine = _create_engine(settings.database_url)
 
 # Factory for async sessions (request-scoped usage).
 AsyncSessionLocal = async_sessionmaker(
@@ -19,7 +73,162 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def get_db_session() -> AsyncSession:
-    """FastAPI dependency that yields a request-scoped AsyncSession."""
+@dataclass
+class Replica:
+    """One read replica plus its health state."""
+    name: str
+    engine: AsyncEngine
+    sessions: async_sessionmaker
+    # perf_counter() time before which the replica is skipped (0 = healthy).
+    down_until: float = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        """True unless the replica failed within the retry window."""
+        return time.perf_counter() >= self.down_until
+
+
+class ReplicaRouter:
+    """
+    Round-robin over read replicas, skipping ones that recently failed.
+
+    A failure (from a health check or a request) takes a replica out of
+    rotation for db_replica_retry_seconds; when every replica is out, reads
+    fall back to the primary.
+    """
+
+    def __init__(self, replicas: List[Replica]) -> None:
+        self.replicas = replicas
+        self._cursor = itertools.cycle(range(len(replicas))) if replicas else None
+
+    def pick(self) -> Replica | None:
+        """Next healthy replica, or None to use the primary."""
+        if self._cursor is None:
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._cursor)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def mark_down(self, replica: Replica) -> None:
+        """Take a replica out of rotation for the retry window."""
+        replica.down_until = time.perf_counter() + settings.db_replica_retry_seconds
+        logger.warning("Read replica %s marked unhealthy", replica.name)
+
+    async def check(self) -> None:
+        """Ping every replica, updating health (e.g. from a periodic task)."""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            except (DBAPIError, OSError):
+                self.mark_down(replica)
+            else:
+                replica.down_until = 0.0
+
+
+def _build_replicas() -> List[Replica]:
+    replicas = []
+    for i, url in enumerate(settings.database_replica_urls, start=1):
+        replica_engine = _create_engine(url)
+        replicas.append(Replica(
+            name=f"replica-{i}",
+            engine=replica_engine,
+            sessions=async_sessionmaker(
+                bind=replica_engine, class_=AsyncSession, expire_on_commit=False),
+        ))
+    return replicas
+
+
+replica_router = ReplicaRouter(_build_replicas())
+
+
+async def run_replica_health_checks() -> None:
+    """Ping replicas every db_replica_retry_seconds until cancelled."""
+    while True:
+        await replica_router.check()
+        await asyncio.sleep(settings.db_replica_retry_seconds)
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency that yields a request-scoped primary AsyncSession."""
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency yielding a session for read-only repository work.
+
+    Served by the next healthy read replica, or the primary if none are
+    configured or healthy. A connection failure during the request marks
+    that replica down so the following requests avoid it.
+    """
+    replica = replica_router.pick()
+    if replica is None:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    async with replica.sessions() as session:
+        try:
+            yield session
+        except (DBAPIError, OSError) as e:
+            # Connection-level failures only; a bad query is not the replica's fault.
+            if _is_connection_error(e):
+                replica_router.mark_down(replica)
+            raise
+
+
+def _is_connection_error(e: Exception) -> bool:
+    if isinstance(e, OSError):
+        return True
+    return isinstance(e, (InterfaceError, OperationalError)) or e.connection_invalidated
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Connection-pool snapshot for one engine; counts are None for non-queue pools."""
+    name: str
+    url: str
+    healthy: bool
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+
+
+def pool_stats() -> List[PoolStats]:
+    """Pool statistics for the primary and every replica, for monitoring."""
+    engines = [("primary", engine, True)] + [
+        (r.name, r.engine, r.healthy) for r in replica_router.replicas
+    ]
+    stats = []
+    for name, eng, healthy in engines:
+        pool = eng.sync_engine.pool
+        counts = {}
+        if isinstance(pool, QueuePool):
+            counts = dict(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        stats.append(PoolStats(
+            name=name,
+            url=eng.url.render_as_string(hide_password=True),
+            healthy=healthy,
+            **counts,
+        ))
+    return stats
+
+
+def update_pool_metrics() -> None:
+    """Copy current pool statistics into the /metrics gauges."""
+    for stats in pool_stats():
+        DB_POOL_HEALTHY.set(1 if stats.healthy else 0, pool=stats.name)
+        for state in ("checked_in", "checked_out", "overflow"):
+            value = getattr(stats, state)
+            if value is not None:
+                DB_POOL_CONNECTIONS.set(value, pool=stats.name, state=state)
@@ -1,15 +1,30 @@
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.api.routes.admin import router as admin_router
 from app.api.routes.gates import router as gates_router
+from app.api.routes.journeys import router as journeys_router
 from app.api.routes.transport import router as transport_router
+from app.core.metrics import REGISTRY
 from app.db.init_db import init_db
+from app.db.session import replica_router, run_replica_health_checks, update_pool_metrics
+from app.services.graph_store import graph_store, warm_graph_store
+from app.services.graph_sync import watch_graph_version
+from app.services.search_executor import search_executor
 
 app = FastAPI(title=settings.app_name)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Routers
 app.include_router(gates_router)
 app.include_router(transport_router)
+app.include_router(journeys_router)
+app.include_router(admin_router)
 
 
 @app.get("/health")
@@ -23,6 +38,14 @@ async def healthz():
     return {"status": "ok"}
 
 
+# Prometheus scrape target (text exposition format 0.0.4).
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    update_pool_metrics()
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.on_event("startup")
 async def on_startup():
     """
@@ -31,5 +54,30 @@ async def on_startup():
     This prevents 500s like:
     - relation "gates" does not exist
     when the Render Postgres instance is empty/new.
+
+    Then build the in-memory graph snapshot so routing requests never wait
+    on the DB. Tests skip this and let the snapshot load lazily through the
+    overridden session dependency.
     """
     await init_db()
+
+    if settings.environment.lower() != "test":
+        await warm_graph_store()
+        # Reload when another worker or the import CLI changes the network.
+        app.state.graph_watch_task = asyncio.create_task(watch_graph_version())
+
+    # Keep probing read replicas so failed ones rejoin the rotation.
+    if replica_router.replicas:
+        app.state.replica_health_task = asyncio.create_task(
+            run_replica_health_checks())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Stop background tasks, the routing-index build and the path-search pool."""
+    for name in ("replica_health_task", "graph_watch_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    await graph_store.close()
+    search_executor.shutdown()
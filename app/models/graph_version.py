@@ -0,0 +1,14 @@
+"""Single-row counter of committed gate-network changes."""
+
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class GraphVersion(Base):
+    """Network version shared by every worker; bumped by each gate/route write."""
+    __tablename__ = "graph_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
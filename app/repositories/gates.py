@@ -1,8 +1,11 @@
 """Repository for gate lookups and related routes."""
 
-from sqlalchemy import select
+from typing import AsyncIterator
+
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.timing import timed
 from app.models.gate import Gate
 from app.models.route import Route
 
@@ -14,18 +17,64 @@ class GateRepository:
 
     async def list_gates(self) -> list[Gate]:
         """Return all gates ordered by code for stable API output."""
-        result = await self.session.execute(select(Gate).order_by(Gate.code))
+        with timed("db"):
+            result = await self.session.execute(select(Gate).order_by(Gate.code))
         return list(result.scalars().all())
 
     async def get_gate(self, code: str) -> Gate | None:
         """Return a gate by 3-letter code, or None if not found."""
-        result = await self.session.execute(select(Gate).where(Gate.code == code))
+        with timed("db"):
+            result = await self.session.execute(select(Gate).where(Gate.code == code))
         return result.scalars().first()
 
     async def list_outgoing_routes(self, from_code: str) -> list[Route]:
         """Return all directed routes that depart from the given gate."""
-        result = await self.session.execute(
-            select(Route).where(Route.from_code ==
-                                from_code).order_by(Route.to_code)
-        )
+        with timed("db"):
+            result = await self.session.execute(
+                select(Route).where(Route.from_code ==
+                                    from_code).order_by(Route.to_code)
+            )
         return list(result.scalars().all())
+
+    async def list_gate_names(self) -> list[tuple[str, str]]:
+        """Return all gates as plain (code, name) tuples ordered by code."""
+        with timed("db"):
+            result = await self.session.execute(
+                select(Gate.code, Gate.name).order_by(Gate.code)
+            )
+        return [tuple(row) for row in result.all()]
+
+    async def list_gate_names_page(
+        self, after: str | None, limit: int
+    ) -> list[tuple[str, str]]:
+        """Return up to `limit` (code, name) tuples with code > after, by code."""
+        with timed("db"):
+            result = await self.session.execute(_gate_names_after(after, limit))
+        return [tuple(row) for row in result.all()]
+
+    async def stream_gate_names(
+        self, after: str | None = None, limit: int | None = None, batch_size: int = 1000
+    ) -> AsyncIterator[tuple[str, str]]:
+        """
+        Yield (code, name) tuples by code from a server-side cursor.
+
+        Rows are fetched `batch_size` at a time, so memory stays flat however
+        many gates there are.
+        """
+        stmt = _gate_names_after(after, limit).execution_options(yield_per=batch_size)
+        with timed("db"):
+            result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            for row in partition:
+                yield tuple(row)
+
+
+def _gate_names_after(after: str | None, limit: int | None) -> Select:
+    # Keyset pagination: seek past the last code seen instead of OFFSET, so
+    # every page is an index range scan on the primary key.
+    stmt = select(Gate.code, Gate.name).order_by(Gate.code)
+    if after is not None:
+        stmt = stmt.where(Gate.code > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
@@ -1,11 +1,52 @@
 """Repository for route lookups used by routing algorithms."""
 
-from sqlalchemy import select
+from dataclasses import dataclass
+
+from sqlalchemy import Integer, String, column, func, select, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.timing import timed
 from app.models.route import Route
 
 
+# Frontier nodes sent per round-trip, keeping well under driver bind limits.
+_FRONTIER_BATCH = 1000
+
+
+@dataclass(frozen=True)
+class HopBoundedPath:
+    """Result of a hop-bounded cheapest-path search run in the database."""
+    # Gate codes and total HU of the cheapest path found, None if none.
+    path: list[str] | None
+    cost: int | None
+    # False when a path longer than the hop bound could still be cheaper
+    # (or could exist at all): the answer is then unknown, not "no route".
+    complete: bool
+
+
+def _relaxations(frontier: list[tuple[str, int]], bound: int | None):
+    """Cheapest single-route extension of the frontier into each gate."""
+    rows = values(
+        column("node", String), column("cost", Integer), name="frontier"
+    ).data(frontier).cte()
+    cost = rows.c.cost + Route.hu_distance
+    ranked = (
+        select(
+            Route.to_code.label("node"),
+            Route.from_code.label("via"),
+            cost.label("cost"),
+            func.row_number().over(
+                partition_by=Route.to_code, order_by=(cost, Route.from_code)
+            ).label("rank"),
+        )
+        .join(rows, Route.from_code == rows.c.node)
+    )
+    if bound is not None:
+        ranked = ranked.where(cost < bound)
+    ranked = ranked.subquery()
+    return select(ranked.c.node, ranked.c.via, ranked.c.cost).where(ranked.c.rank == 1)
+
+
 class RouteRepository:
     """Database access for route records."""
     def __init__(self, session: AsyncSession):
@@ -15,5 +56,73 @@ class RouteRepository:
         """Return all routes as directed edges for graph algorithms."""
         # For our small graph, loading all edges is simplest and fastest.
         # If the graph grows, we can optimize to adjacency queries per node.
-        result = await self.session.execute(select(Route))
+        with timed("db"):
+            result = await self.session.execute(select(Route))
         return list(result.scalars().all())
+
+    async def list_edges(self) -> list[tuple[str, str, int]]:
+        """Return all routes as plain (from_code, to_code, hu_distance) tuples."""
+        # Column select skips ORM identity-map overhead when building graphs.
+        with timed("db"):
+            result = await self.session.execute(
+                select(Route.from_code, Route.to_code, Route.hu_distance)
+            )
+        return [tuple(row) for row in result.all()]
+
+    async def cheapest_path(self, start: str, target: str, max_hops: int) -> HopBoundedPath:
+        """
+        Find the cheapest path using at most max_hops routes, inside the database.
+
+        Runs a hop-by-hop Bellman-Ford: round k extends only the gates whose
+        best cost improved in round k-1, the database picks the cheapest
+        extension into each gate, and extensions that do not beat a gate's
+        best cost (or the best cost to target so far) are pruned. Only the
+        frontier and its improvements cross the wire, one query per round.
+
+        After max_hops rounds one more round is probed; if it would still
+        improve some gate, a longer path may be cheaper and the result is
+        marked incomplete.
+
+        This is deliberately not one WITH RECURSIVE query: neither Postgres
+        nor SQLite allows aggregates or subqueries over the recursive table,
+        so a recursive CTE cannot keep only the cheapest cost per gate and
+        ends up enumerating every path up to the hop bound.
+        """
+        best: dict[str, int] = {start: 0}
+        via: dict[str, str] = {}
+        frontier = [(start, 0)]
+        for round_ in range(max_hops + 1):
+            if not frontier:
+                break
+            bound = best.get(target)
+            improved: dict[str, int] = {}
+            for i in range(0, len(frontier), _FRONTIER_BATCH):
+                with timed("db"):
+                    result = await self.session.execute(
+                        _relaxations(frontier[i:i + _FRONTIER_BATCH], bound))
+                for node, prev, cost in result.all():
+                    if cost < best.get(node, cost + 1) and cost < improved.get(node, cost + 1):
+                        improved[node] = cost
+                        if round_ < max_hops:
+                            via[node] = prev
+            if round_ == max_hops:
+                # Probe round: any improvement means the bound cut a path short.
+                if improved:
+                    return self._bounded_result(best, via, start, target, complete=False)
+                break
+            best.update(improved)
+            # The target is never extended: no cheaper path runs through it.
+            frontier = [(n, c) for n, c in improved.items() if n != target]
+        return self._bounded_result(best, via, start, target, complete=True)
+
+    @staticmethod
+    def _bounded_result(
+        best: dict[str, int], via: dict[str, str], start: str, target: str, complete: bool
+    ) -> HopBoundedPath:
+        if target not in best or target == start:
+            return HopBoundedPath(path=None, cost=None, complete=complete)
+        path = [target]
+        while path[-1] != start:
+            path.append(via[path[-1]])
+        path.reverse()
+        return HopBoundedPath(path=path, cost=best[target], complete=complete)
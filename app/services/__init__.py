@@ -0,0 +1 @@
+"""Process-wide services shared across requests (graph caches, executors)."""
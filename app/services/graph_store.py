@@ -0,0 +1,363 @@
+"""Process-wide holder for the current gate-network snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+from itertools import chain
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.algorithms.contraction import (
+    ContractionHierarchy,
+    build_contraction_hierarchy,
+)
+from app.algorithms.dynamic import update_routing_table
+from app.algorithms.graph import GraphSnapshot, build_snapshot
+from app.algorithms.routing_table import RoutingTable, build_routing_table
+from app.core.config import settings
+from app.core.timing import timed
+from app.db.graph_version import bump_graph_version_sync, read_graph_version
+from app.db.session import AsyncSessionLocal, get_read_db_session
+from app.models.gate import Gate
+from app.models.route import Route
+from app.repositories.gates import GateRepository
+from app.repositories.routes import RouteRepository
+from app.services.search_executor import search_executor
+from app.services.shared_graph import SharedGraphStore
+
+logger = logging.getLogger(__name__)
+
+# Precomputed structures answering path(start, target) without a search.
+RoutingIndex = RoutingTable | ContractionHierarchy
+
+
+class GraphStore:
+    """
+    Keeps one immutable GraphSnapshot and swaps it atomically on reload.
+
+    Readers never lock: they take whatever snapshot is current. Reloads are
+    serialised so concurrent cache misses trigger a single DB load.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: GraphSnapshot | None = None
+        self._version = 0
+        self._stale = True
+        self._lock = asyncio.Lock()
+        self._routing_index: RoutingIndex | None = None
+        self._index_task: asyncio.Task | None = None
+        # One build at a time: a superseded build still queued never starts.
+        self._index_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="routing-index")
+        # Highest database graph version this process has loaded or written.
+        self._db_version = 0
+
+    @property
+    def snapshot(self) -> GraphSnapshot | None:
+        """Current snapshot, or None if nothing has been loaded yet."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Monotonic graph version; bumped whenever the network changes."""
+        return self._version
+
+    def routing_index_for(self, snapshot: GraphSnapshot) -> RoutingIndex | None:
+        """Return the routing index built from this snapshot, if ready."""
+        index = self._routing_index
+        if index is None or index.version != snapshot.version:
+            return None
+        return index
+
+    async def wait_for_routing_index(self) -> RoutingIndex | None:
+        """Wait for the latest background index build to finish (or fail)."""
+        while (task := self._index_task) is not None and not task.done():
+            await asyncio.wait([task])
+        return self._routing_index
+
+    async def close(self) -> None:
+        """Cancel any background index build and drop the index (app shutdown)."""
+        task, self._index_task = self._index_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.wait([task])
+        self._routing_index = None
+
+    def invalidate(self) -> None:
+        """Mark the current snapshot stale so the next reader reloads it."""
+        self._version += 1
+        self._stale = True
+
+    def note_db_version(self, db_version: int) -> bool:
+        """
+        Record a database graph version seen by this process.
+
+        Returns:
+            True if it is newer than anything loaded or written here, i.e.
+            another worker changed the network and the snapshot is stale.
+        """
+        if db_version <= self._db_version:
+            return False
+        self._db_version = db_version
+        return True
+
+    async def refresh(self, session: AsyncSession) -> GraphSnapshot:
+        """Load gates and routes from the DB and swap in a new snapshot."""
+        self.invalidate()
+        async with self._lock:
+            return await self._load(session)
+
+    async def get(self, session: AsyncSession) -> GraphSnapshot:
+        """Return the current snapshot, loading it first if missing or stale."""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale:
+            return snapshot
+
+        async with self._lock:
+            # Another request may have reloaded while we waited for the lock.
+            if self._snapshot is not None and not self._stale:
+                return self._snapshot
+            return await self._load(session)
+
+    async def _load(self, session: AsyncSession) -> GraphSnapshot:
+        version = self._version
+        # Read before the data: a write racing this load then shows up as a
+        # newer version later (one extra reload) rather than being missed.
+        db_version = await read_graph_version(session)
+        if db_version < self._db_version:
+            # A replica behind a write this process made or was told about
+            # would be cached as current and never reloaded: use the primary.
+            logger.info(
+                "Read session is at graph version %s, behind %s; loading from the primary",
+                db_version, self._db_version)
+            async with AsyncSessionLocal() as primary:
+                return await self._load_from(primary, version)
+        return await self._load_from(session, version, db_version)
+
+    async def _load_from(
+        self, session: AsyncSession, version: int, db_version: int | None = None
+    ) -> GraphSnapshot:
+        if db_version is None:
+            db_version = await read_graph_version(session)
+        gates = await GateRepository(session).list_gate_names()
+        edges = await RouteRepository(session).list_edges()
+
+        with timed("graph_build"):
+            snapshot = build_snapshot(gates, edges, version=version)
+            shared = _shared_graph()
+            if shared is not None:
+                # Swap in the host-wide mapped copy; ours is dropped. Publishing
+                # takes a file lock and fsyncs, so it runs off the event loop.
+                csr = await asyncio.get_running_loop().run_in_executor(
+                    None, shared.csr_for, snapshot)
+                snapshot = replace(snapshot, csr=csr)
+        previous = self._snapshot
+        self._snapshot = snapshot
+        self.note_db_version(db_version)
+        # Only clear the flag if nothing invalidated us mid-load.
+        if self._version == version:
+            self._stale = False
+
+        if settings.search_executor == "process":
+            # Spawn this snapshot's search workers now, off the event loop,
+            # rather than inside the first large search.
+            prepared = asyncio.get_running_loop().run_in_executor(
+                None, search_executor.prepare, snapshot)
+            prepared.add_done_callback(_log_pool_failure)
+
+        if settings.routing_mode != "dijkstra":
+            if self._index_task is not None:
+                # Superseded: its result would be discarded anyway.
+                self._index_task.cancel()
+            self._index_task = asyncio.create_task(
+                self._build_index(snapshot, previous))
+            self._index_task.add_done_callback(_log_index_failure)
+        return snapshot
+
+    async def _build_index(
+        self, snapshot: GraphSnapshot, previous: GraphSnapshot | None
+    ) -> None:
+        # Built off the event loop; requests fall back to Dijkstra meanwhile.
+        if settings.routing_mode == "all_pairs":
+            current = self._routing_index
+            if not (
+                isinstance(current, RoutingTable)
+                and previous is not None
+                and current.version == previous.version
+                and previous.gates.keys() == snapshot.gates.keys()
+            ):
+                current = previous = None
+            build = partial(_build_routing_table, snapshot, previous, current)
+        else:
+            build = partial(
+                build_contraction_hierarchy,
+                snapshot.adjacency,
+                list(snapshot.gates),
+                snapshot.version,
+            )
+        index = await asyncio.get_running_loop().run_in_executor(
+            self._index_executor, build)
+
+        # Drop results for snapshots that were replaced mid-build.
+        if self._snapshot is not snapshot:
+            return
+        self._routing_index = index
+        logger.info(
+            "Routing index (%s) v%s built: %d nodes in %.3fs",
+            settings.routing_mode,
+            index.version,
+            len(index.codes),
+            index.build_seconds,
+        )
+
+
+def _log_index_failure(task: asyncio.Task) -> None:
+    """Report a failed background index build; requests keep using Dijkstra."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error(
+            "Routing index (%s) build failed; serving Dijkstra",
+            settings.routing_mode,
+            exc_info=exc,
+        )
+
+
+def _log_pool_failure(future: asyncio.Future) -> None:
+    """Report a search pool that failed to start; searches use threads meanwhile."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Search worker pool failed to start", exc_info=future.exception())
+
+
+def _build_routing_table(
+    snapshot: GraphSnapshot,
+    previous: GraphSnapshot | None,
+    table: RoutingTable | None,
+) -> RoutingTable:
+    """
+    Patch the previous snapshot's table for a few route changes, else rebuild.
+
+    With SHARED_GRAPH_DIR set, a table another worker already published for
+    this network is attached instead, and one built here is published.
+    """
+    shared = _shared_graph()
+    if shared is None:
+        return _compute_routing_table(snapshot, previous, table)
+    return shared.routing_table_for(
+        snapshot, partial(_compute_routing_table, snapshot, previous, table))
+
+
+def _compute_routing_table(
+    snapshot: GraphSnapshot,
+    previous: GraphSnapshot | None,
+    table: RoutingTable | None,
+) -> RoutingTable:
+    if table is not None and previous is not None:
+        updated = update_routing_table(
+            table,
+            previous.adjacency,
+            snapshot.adjacency,
+            snapshot.version,
+            settings.routing_table_max_incremental_changes,
+        )
+        if updated is not None:
+            logger.info("Routing table v%s updated incrementally", snapshot.version)
+            return updated
+    return build_routing_table(
+        snapshot.adjacency,
+        list(snapshot.gates),
+        snapshot.version,
+        settings.routing_table_workers,
+    )
+
+
+def _shared_graph() -> SharedGraphStore | None:
+    if not settings.shared_graph_dir:
+        return None
+    return SharedGraphStore(settings.shared_graph_dir)
+
+
+graph_store = GraphStore()
+
+# Session.info key marking a transaction that wrote gates or routes.
+_NETWORK_WRITE = "graph_store.network_write"
+# Session.info key holding the graph version this transaction wrote.
+_DB_VERSION = "graph_store.db_version"
+_NETWORK_MODELS = (Gate, Route)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session: Session, flush_context) -> None:
+    """Flag the transaction if the flush touched gates or routes."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _NETWORK_MODELS):
+            session.info[_NETWORK_WRITE] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state: ORMExecuteState) -> None:
+    """Flag ORM-enabled insert/update/delete statements on gates or routes."""
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in _NETWORK_MODELS:
+        orm_execute_state.session.info[_NETWORK_WRITE] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_db_version(session: Session) -> None:
+    """Bump the shared graph version (and NOTIFY) inside a network-writing transaction."""
+    if session.new or session.dirty or session.deleted:
+        # Pending objects are otherwise flushed after this hook runs.
+        session.flush()
+    if session.info.get(_NETWORK_WRITE):
+        session.info[_DB_VERSION] = bump_graph_version_sync(session.connection())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    """Bump the graph version once a gate/route write is committed."""
+    if session.info.pop(_NETWORK_WRITE, False):
+        graph_store.invalidate()
+        # Our own NOTIFY for this version must not trigger another reload.
+        graph_store.note_db_version(session.info.pop(_DB_VERSION, 0))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_writes(session: Session) -> None:
+    """Rolled-back writes never reached the DB, so nothing changed."""
+    session.info.pop(_NETWORK_WRITE, None)
+    session.info.pop(_DB_VERSION, None)
+
+
+async def get_graph_snapshot(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> GraphSnapshot:
+    """FastAPI dependency returning the current graph snapshot (read replica if configured)."""
+    return await graph_store.get(session)
+
+
+async def warm_graph_store() -> None:
+    """
+    Build the initial snapshot at startup (from the primary) so the first request is fast.
+
+    Skipped with the SQL routing engine, which exists for networks too large
+    to hold in every worker; the snapshot then loads on first use, if ever.
+    """
+    if settings.routing_engine == "sql":
+        return
+    async with AsyncSessionLocal() as session:
+        await graph_store.refresh(session)
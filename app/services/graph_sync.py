@@ -0,0 +1,98 @@
+"""Keeps this worker's graph snapshot in step with writes made elsewhere."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.core.config import settings
+from app.db.graph_version import GRAPH_CHANNEL, read_graph_version
+from app.db.session import AsyncSessionLocal, engine
+from app.services.graph_store import graph_store
+
+logger = logging.getLogger(__name__)
+
+
+async def apply_graph_version(
+    db_version: int, sessions: async_sessionmaker = AsyncSessionLocal
+) -> bool:
+    """
+    Reload the snapshot if db_version is newer than this process has seen.
+
+    Reloads from the primary (sessions) so a lagging replica cannot hand
+    back the network from before the change. A store that has not loaded a
+    snapshot yet is left to load lazily.
+
+    Returns:
+        True if a reload happened.
+    """
+    if not graph_store.note_db_version(db_version):
+        return False
+    if graph_store.snapshot is None:
+        # Nothing loaded yet (e.g. SQL routing engine): the first reader loads it.
+        return False
+    logger.info("Graph version %s published by another writer; reloading", db_version)
+    async with sessions() as session:
+        await graph_store.refresh(session)
+    return True
+
+
+async def poll_graph_version(sessions: async_sessionmaker = AsyncSessionLocal) -> bool:
+    """Read the version row once and reload if it moved; True if reloaded."""
+    async with sessions() as session:
+        db_version = await read_graph_version(session)
+    return await apply_graph_version(db_version, sessions)
+
+
+async def _listen(db: AsyncEngine) -> None:
+    """LISTEN on the graph channel until the connection fails."""
+    versions: asyncio.Queue[int] = asyncio.Queue()
+
+    def on_notify(_connection, _pid, _channel, payload: str) -> None:
+        versions.put_nowait(int(payload))
+
+    async with db.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.add_listener(GRAPH_CHANNEL, on_notify)
+        logger.info("Listening for graph changes on %r", GRAPH_CHANNEL)
+        # Anything committed before LISTEN took effect.
+        await poll_graph_version()
+        while True:
+            try:
+                db_version = await asyncio.wait_for(
+                    versions.get(), timeout=settings.graph_version_keepalive_seconds)
+            except asyncio.TimeoutError:
+                # Quiet channel: make sure the connection is still alive.
+                await conn.execute(text("SELECT 1"))
+                continue
+            await apply_graph_version(db_version)
+
+
+async def watch_graph_version(db: AsyncEngine = engine) -> None:
+    """
+    Background task: reload the snapshot when any worker changes the network.
+
+    On Postgres, waits for NOTIFYs sent by committing writers (see
+    app.db.graph_version). Other databases (SQLite), and Postgres while the
+    listener is reconnecting, poll the graph_version row every
+    graph_version_poll_seconds instead.
+    """
+    listen = db.dialect.name == "postgresql"
+    while True:
+        if listen:
+            try:
+                await _listen(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Graph change listener failed; polling until it reconnects")
+        try:
+            await poll_graph_version()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Graph version poll failed")
+        await asyncio.sleep(settings.graph_version_poll_seconds)
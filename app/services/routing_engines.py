@@ -0,0 +1,140 @@
+"""Pluggable backends for point-to-point cheapest-path queries."""
+
+from __future__ import annotations
+
+import logging
+from typing import Awaitable, Callable, Protocol
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.algorithms.dijkstra import PathResult
+from app.algorithms.graph import GraphSnapshot
+from app.core.config import settings
+from app.core.metrics import PATH_SEARCH_FALLBACKS
+from app.db.graph_version import read_graph_version
+from app.db.session import get_read_db_session
+from app.repositories.gates import GateRepository
+from app.repositories.routes import RouteRepository
+from app.services.graph_store import graph_store
+from app.services.search_executor import search_executor
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingEngine(Protocol):
+    """Answers cheapest-path queries between two existing gates."""
+
+    # Label used for the path_search_* metrics.
+    name: str
+    # True if a search holds no per-request resources (e.g. a DB session),
+    # so concurrent identical requests may share one.
+    shareable: bool
+
+    async def version_tag(self) -> str:
+        """Identify the network version searched (ETag and coalescing key)."""
+        ...
+
+    async def has_gate(self, code: str) -> bool:
+        """Return True if the gate exists in the searched network."""
+        ...
+
+    async def shortest_path(self, start: str, target: str) -> PathResult | None:
+        """Return the cheapest directed path, or None if there is none."""
+        ...
+
+
+class MemoryRoutingEngine:
+    """
+    Searches the in-memory graph snapshot.
+
+    Uses the precomputed routing index when ROUTING_MODE selects one and it
+    is built for this snapshot; otherwise runs CSR Dijkstra (inline or on
+    the search worker pool).
+    """
+
+    def __init__(self, snapshot: GraphSnapshot) -> None:
+        self.snapshot = snapshot
+        self.index = None
+        if settings.routing_mode != "dijkstra":
+            self.index = graph_store.routing_index_for(snapshot)
+        self.name = settings.routing_mode if self.index is not None else "csr"
+        self.shareable = True
+
+    async def version_tag(self) -> str:
+        return self.snapshot.fingerprint
+
+    async def has_gate(self, code: str) -> bool:
+        return self.snapshot.has_gate(code)
+
+    async def shortest_path(self, start: str, target: str) -> PathResult | None:
+        if self.index is not None:
+            return self.index.path(start, target)
+        return await search_executor.shortest_path(self.snapshot, start, target)
+
+
+class SQLRoutingEngine:
+    """
+    Searches inside the database, one hop-bounded query round per route.
+
+    No edges are shipped to the app server. When the cheapest path may need
+    more than max_hops routes the database cannot answer; such searches
+    are handed to the fallback engine (and counted in
+    path_search_fallbacks_total) rather than reported as missing or
+    answered with a dearer short path. The fallback is only built (e.g.
+    the graph snapshot loaded) the first time that happens.
+    """
+
+    name = "sql"
+    # Searches run on the requesting client's session, which is closed if
+    # that client disconnects, so they are never shared.
+    shareable = False
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        max_hops: int,
+        fallback: Callable[[], Awaitable[RoutingEngine]],
+    ) -> None:
+        self.session = session
+        self.max_hops = max_hops
+        self._fallback = fallback
+        self.fallbacks = 0
+
+    async def version_tag(self) -> str:
+        return f"db-{await read_graph_version(self.session)}"
+
+    async def has_gate(self, code: str) -> bool:
+        return await GateRepository(self.session).get_gate(code) is not None
+
+    async def shortest_path(self, start: str, target: str) -> PathResult | None:
+        found = await RouteRepository(self.session).cheapest_path(
+            start, target, self.max_hops)
+        if not found.complete:
+            self.fallbacks += 1
+            PATH_SEARCH_FALLBACKS.inc(engine=self.name)
+            fallback = await self._fallback()
+            logger.info(
+                "%s -> %s may need more than %s routes; using the %s engine",
+                start, target, self.max_hops, fallback.name)
+            return await fallback.shortest_path(start, target)
+        if found.path is None:
+            return None
+        return PathResult(path=found.path, total_weight=found.cost)
+
+
+async def get_routing_engine(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> RoutingEngine:
+    """
+    FastAPI dependency returning the engine selected by settings.routing_engine.
+
+    The SQL engine never loads the graph snapshot unless a search falls back
+    to the memory engine.
+    """
+    async def memory_engine() -> RoutingEngine:
+        return MemoryRoutingEngine(await graph_store.get(session))
+
+    if settings.routing_engine == "sql":
+        return SQLRoutingEngine(session, settings.routing_sql_max_hops, memory_engine)
+    return await memory_engine()
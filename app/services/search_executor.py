@@ -0,0 +1,147 @@
+"""Runs point-to-point searches inline or on a worker pool holding the graph."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from app.algorithms.csr import CSRGraph, csr_shortest_path
+from app.algorithms.dijkstra import PathResult
+from app.algorithms.graph import GraphSnapshot
+from app.core.config import settings
+from app.core.metrics import SEARCH_EXECUTOR_QUEUE_DEPTH, SEARCH_EXECUTOR_SEARCHES
+from app.services.shared_graph import owned_csr
+
+# Graph preloaded into each process-pool worker by _init_worker().
+_worker_graph: CSRGraph | None = None
+
+
+def _init_worker(graph: CSRGraph) -> None:
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _worker_ready() -> None:
+    """No-op task used to make sure a pool worker has started."""
+
+
+def _worker_search(start: str, target: str) -> PathResult | None:
+    assert _worker_graph is not None
+    return csr_shortest_path(_worker_graph, start, target)
+
+
+class SearchExecutor:
+    """
+    Chooses where each cheapest-path search runs.
+
+    Searches on graphs smaller than settings.search_offload_min_edges (or
+    with search_executor="inline") run on the event loop: they are faster
+    than a pool round trip. Larger ones go to a thread or process pool.
+    Process pools are built per graph snapshot with the CSR graph passed
+    once to each worker's initializer, so a search only ships (start,
+    target) and the PathResult back; a new snapshot gets a new pool and the
+    old one drains in the background.
+
+    Process pools are started by prepare() when a snapshot loads, off the
+    event loop; searches arriving before the new pool is up run on a
+    thread instead of spawning workers from the request.
+    """
+
+    def __init__(self) -> None:
+        self._pool: Executor | None = None
+        self._pool_version: int | None = None
+        self._pool_kind: str | None = None
+        self._lock = threading.Lock()
+
+    def _thread_pool(self) -> Executor:
+        with self._lock:
+            # Threads share the snapshot, so one pool serves every version.
+            if self._pool is None or self._pool_kind != "thread":
+                self._replace(ThreadPoolExecutor(
+                    max_workers=settings.search_workers,
+                    thread_name_prefix="path-search",
+                ), "thread", None)
+            return self._pool
+
+    def _process_pool(self, snapshot: GraphSnapshot) -> Executor | None:
+        with self._lock:
+            if self._pool_kind == "process" and self._pool_version == snapshot.version:
+                return self._pool
+            return None
+
+    def _replace(self, pool: Executor, kind: str, version: int | None) -> None:
+        old = self._pool
+        self._pool, self._pool_kind, self._pool_version = pool, kind, version
+        if old is not None:
+            # In-flight searches finish on the graph they started with.
+            old.shutdown(wait=False)
+
+    def prepare(self, snapshot: GraphSnapshot) -> None:
+        """
+        Start (and warm) the process pool for a newly loaded snapshot.
+
+        Spawns the workers and ships them the graph, so it blocks: run it
+        off the event loop. A no-op unless searches on this snapshot will go
+        to a process pool.
+        """
+        if settings.search_executor != "process" or (
+            snapshot.edge_count < settings.search_offload_min_edges
+        ):
+            return
+        if self._process_pool(snapshot) is not None:
+            return
+        pool = ProcessPoolExecutor(
+            max_workers=settings.search_workers,
+            initializer=_init_worker,
+            # mmap-backed (shared) arrays cannot be pickled.
+            initargs=(owned_csr(snapshot.csr),),
+        )
+        # Workers start on demand; keep them all busy once so every one is
+        # spawned and initialised before the pool takes searches.
+        wait([pool.submit(_worker_ready) for _ in range(settings.search_workers)])
+        with self._lock:
+            newer = self._pool_kind == "process" and (self._pool_version or 0) > snapshot.version
+            if newer:
+                pool.shutdown(wait=False)
+                return
+            self._replace(pool, "process", snapshot.version)
+
+    async def shortest_path(
+        self, snapshot: GraphSnapshot, start: str, target: str
+    ) -> PathResult | None:
+        """
+        Cheapest path from start to target over the snapshot's CSR graph.
+
+        Returns:
+            PathResult, or None if either node is unknown or unreachable.
+        """
+        kind = settings.search_executor
+        if kind == "inline" or snapshot.edge_count < settings.search_offload_min_edges:
+            SEARCH_EXECUTOR_SEARCHES.inc(executor="inline")
+            return csr_shortest_path(snapshot.csr, start, target)
+
+        loop = asyncio.get_running_loop()
+        pool = self._process_pool(snapshot) if kind == "process" else self._thread_pool()
+        if pool is None:
+            # This snapshot's process pool is still starting (see prepare()).
+            kind = "thread"
+        SEARCH_EXECUTOR_SEARCHES.inc(executor=kind)
+        SEARCH_EXECUTOR_QUEUE_DEPTH.inc(executor=kind)
+        try:
+            if pool is not None and kind == "process":
+                return await loop.run_in_executor(pool, _worker_search, start, target)
+            return await loop.run_in_executor(
+                pool, csr_shortest_path, snapshot.csr, start, target)
+        finally:
+            SEARCH_EXECUTOR_QUEUE_DEPTH.dec(executor=kind)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (at application shutdown)."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._pool_kind = self._pool_version = None
+
+
+search_executor = SearchExecutor()
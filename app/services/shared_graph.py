@@ -0,0 +1,234 @@
+"""
+Compiled graph and routing tables published as mmap-able files.
+
+With several uvicorn workers per host, each process would otherwise hold
+(and build) its own CSR graph and all-pairs table. One worker publishes a
+structure into SHARED_GRAPH_DIR (ideally on tmpfs, e.g. /dev/shm/hstc);
+every worker, the publisher included, maps the file read-only and wraps
+memoryviews over it, so the arrays exist once in the page cache.
+
+Files are keyed by the snapshot's content fingerprint, so workers that
+loaded the same network find each other's files regardless of their local
+version counters, and a new network simply gets new files: processes swap
+to them on their next snapshot load while older mappings stay valid.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from app.algorithms.csr import CSRGraph
+from app.algorithms.graph import GraphSnapshot
+from app.algorithms.routing_table import RoutingTable
+
+try:  # POSIX only; without it concurrent workers may each build once.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"HSTCGRF1"
+_PREFIX = struct.Struct("<8sQ")  # magic, JSON header length
+_ALIGN = 8
+
+
+def _write(path: Path, meta: Dict[str, Any], arrays: Dict[str, array]) -> None:
+    """Atomically write meta plus raw arrays, each 8-byte aligned."""
+    layout = {}
+    offset = 0
+    for name, values in arrays.items():
+        layout[name] = [values.typecode, offset, len(values)]
+        size = len(values) * values.itemsize
+        offset += size + (-size % _ALIGN)
+    header = json.dumps({"meta": meta, "arrays": layout}).encode()
+    header += b" " * (-(_PREFIX.size + len(header)) % _ALIGN)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREFIX.pack(_MAGIC, len(header)))
+            f.write(header)
+            for values in arrays.values():
+                data = values.tobytes()
+                f.write(data + b"\0" * (-len(data) % _ALIGN))
+            f.flush()
+            os.fsync(f.fileno())
+        # Readers see either no file or the complete one.
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _read(path: Path) -> Tuple[Dict[str, Any], Dict[str, memoryview]] | None:
+    """Map a published file read-only; None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    magic, header_len = _PREFIX.unpack_from(mapped)
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a shared graph file")
+    header = json.loads(mapped[_PREFIX.size:_PREFIX.size + header_len])
+    base = _PREFIX.size + header_len
+
+    # The memoryviews keep the mapping alive for as long as they are used.
+    view = memoryview(mapped)
+    arrays = {}
+    for name, (typecode, offset, length) in header["arrays"].items():
+        itemsize = array(typecode).itemsize
+        start = base + offset
+        arrays[name] = view[start:start + length * itemsize].cast(typecode)
+    return header["meta"], arrays
+
+
+class SharedGraphStore:
+    """Publishes and attaches CSR graphs and routing tables in one directory."""
+
+    def __init__(self, directory: str | Path, keep: int = 2) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Published versions kept per kind; older files are unlinked (live
+        # mappings of them stay valid until their readers let go).
+        self.keep = keep
+
+    def _path(self, kind: str, fingerprint: str) -> Path:
+        return self.directory / f"{kind}-{fingerprint}.bin"
+
+    @contextmanager
+    def _exclusive(self, kind: str, fingerprint: str) -> Iterator[None]:
+        # Cross-process lock so one worker builds while the others wait and
+        # then attach to its result. One lock per file: a worker attaching
+        # a CSR graph never waits behind another's all-pairs table build.
+        if fcntl is None:
+            yield
+            return
+        with open(self.directory / f".{kind}-{fingerprint}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _prune(self, kind: str) -> None:
+        files = sorted(
+            self.directory.glob(f"{kind}-*.bin"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in files[self.keep:]:
+            stale.unlink(missing_ok=True)
+            (self.directory / f".{stale.stem}.lock").unlink(missing_ok=True)
+
+    def attach_csr(self, fingerprint: str) -> CSRGraph | None:
+        """Map a published CSR graph, or None if none exists for this network."""
+        loaded = _read(self._path("csr", fingerprint))
+        if loaded is None:
+            return None
+        meta, arrays = loaded
+        codes = tuple(meta["codes"])
+        return CSRGraph(
+            codes=codes,
+            index={code: i for i, code in enumerate(codes)},
+            offsets=arrays["offsets"],
+            targets=arrays["targets"],
+            weights=arrays["weights"],
+        )
+
+    def csr_for(self, snapshot: GraphSnapshot) -> CSRGraph:
+        """
+        Return the shared CSR graph for this snapshot, publishing it if needed.
+
+        Blocks on file locks and I/O, so call it off the event loop. Falls
+        back to the snapshot's own graph if the file was pruned by another
+        worker before it could be mapped.
+        """
+        shared = self.attach_csr(snapshot.fingerprint)
+        if shared is not None:
+            return shared
+        with self._exclusive("csr", snapshot.fingerprint):
+            path = self._path("csr", snapshot.fingerprint)
+            if not path.exists():
+                csr = snapshot.csr
+                _write(path, {"codes": list(csr.codes)}, {
+                    "offsets": csr.offsets,
+                    "targets": csr.targets,
+                    "weights": csr.weights,
+                })
+                self._prune("csr")
+                logger.info("Published CSR graph %s", path.name)
+            shared = self.attach_csr(snapshot.fingerprint)
+        return shared if shared is not None else snapshot.csr
+
+    def attach_routing_table(self, snapshot: GraphSnapshot) -> RoutingTable | None:
+        """Map a published all-pairs table for this snapshot's network, if any."""
+        loaded = _read(self._path("table", snapshot.fingerprint))
+        if loaded is None:
+            return None
+        meta, arrays = loaded
+        codes = tuple(meta["codes"])
+        return RoutingTable(
+            version=snapshot.version,
+            codes=codes,
+            index={code: i for i, code in enumerate(codes)},
+            dist=arrays["dist"],
+            next_hop=arrays["next_hop"],
+            build_seconds=meta["build_seconds"],
+        )
+
+    def routing_table_for(
+        self, snapshot: GraphSnapshot, build: Callable[[], RoutingTable]
+    ) -> RoutingTable:
+        """
+        Return the shared all-pairs table for this snapshot.
+
+        The first worker to ask runs build() and publishes the result; any
+        worker asking meanwhile blocks on the table's lock, then attaches.
+        A table built here is used directly if its file is pruned before it
+        can be mapped.
+        """
+        shared = self.attach_routing_table(snapshot)
+        if shared is not None:
+            return shared
+        with self._exclusive("table", snapshot.fingerprint):
+            table = None
+            path = self._path("table", snapshot.fingerprint)
+            if not path.exists():
+                table = build()
+                _write(
+                    path,
+                    {"codes": list(table.codes), "build_seconds": table.build_seconds},
+                    {"dist": table.dist, "next_hop": table.next_hop},
+                )
+                self._prune("table")
+                logger.info("Published routing table %s", path.name)
+            shared = self.attach_routing_table(snapshot)
+        if shared is not None:
+            return shared
+        # Pruned between publish and attach: use (or make) a private copy.
+        return table if table is not None else build()
+
+
+def owned_csr(graph: CSRGraph) -> CSRGraph:
+    """Copy a (possibly mmap-backed) CSR graph into process-owned arrays."""
+    if all(isinstance(a, array) for a in (graph.offsets, graph.targets, graph.weights)):
+        return graph
+    return replace(
+        graph,
+        index=dict(graph.index),
+        offsets=array(graph.offsets.format, graph.offsets.tobytes()),
+        targets=array(graph.targets.format, graph.targets.tobytes()),
+        weights=array(graph.weights.format, graph.weights.tobytes()),
+    )
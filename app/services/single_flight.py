@@ -0,0 +1,70 @@
+"""Coalesces identical concurrent calls into one in-flight task."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    def __init__(self, task: asyncio.Task[T]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    At most one running call per key; concurrent callers share its result.
+
+    Keys must capture everything the result depends on (for path searches:
+    engine, graph version, start, target), so sharing never serves a result
+    computed for different data. Nothing is cached: a key is forgotten as
+    soon as its call finishes, and the next caller starts a fresh one.
+
+    The call runs as its own task in an empty context, so one caller being
+    cancelled (e.g. a client disconnect) does not fail the others, and its
+    timings are not charged to whichever request happened to start it; it
+    is only cancelled once every caller waiting on it has gone. call()
+    must therefore not use resources owned by one caller, such as that
+    request's DB session.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight[T]] = {}
+
+    def in_flight(self) -> int:
+        """Number of keys with a call currently running."""
+        return len(self._flights)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run call() for key, or join the call already running for it.
+
+        Returns:
+            (result, shared), where shared is True if this caller joined
+            another caller's call instead of starting one. Exceptions raised
+            by call() propagate to every caller.
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.get_running_loop().create_task(
+                call(), context=contextvars.Context()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: Hashable, flight: _Flight[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1 @@
+"""Offline micro-benchmarks for routing and pricing hot paths (no DB needed)."""
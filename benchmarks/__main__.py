@@ -0,0 +1,101 @@
+"""
+Command-line entry point.
+
+    python -m benchmarks run [--sizes small,medium] [--repeats 5] [--output results.json]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1] [--fail]
+    python -m benchmarks engines [--sizes tiny,small] [--queries 50] [--database-url URL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from benchmarks.engines import ENGINE_SIZES, compare_engines
+from benchmarks.report import compare, load_results, write_results
+from benchmarks.suite import DEFAULT_SIZES, SIZES, run_size
+
+
+def _run(args: argparse.Namespace) -> int:
+    sizes = args.sizes.split(",") if args.sizes else list(DEFAULT_SIZES)
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        print(f"unknown sizes: {', '.join(unknown)} (choose from {', '.join(SIZES)})")
+        return 2
+
+    results = []
+    for size in sizes:
+        for result in run_size(size, repeats=args.repeats):
+            results.append(result)
+            print(
+                f"{result.name:<26}{size:<8}{result.per_op_us:>12.2f} us/op"
+                f"  ({result.params})"
+            )
+    write_results(results, args.output)
+    print(f"wrote {len(results)} results to {args.output}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    base_meta, baseline = load_results(args.baseline)
+    new_meta, current = load_results(args.current)
+    print(f"baseline: {base_meta.get('commit')}  current: {new_meta.get('commit')}")
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    return 1 if regressions and args.fail else 0
+
+
+def _engines(args: argparse.Namespace) -> int:
+    sizes = args.sizes.split(",") if args.sizes else list(ENGINE_SIZES)
+    unknown = [s for s in sizes if s not in ENGINE_SIZES]
+    if unknown:
+        print(f"unknown sizes: {', '.join(unknown)} (choose from {', '.join(ENGINE_SIZES)})")
+        return 2
+
+    mismatched = False
+    for size in sizes:
+        for result in asyncio.run(compare_engines(size, args.queries, args.database_url)):
+            mismatched |= result.mismatches > 0
+            print(
+                f"{result.engine:<26}{size:<8}{result.per_query_us:>12.2f} us/query"
+                f"  ({result.mismatches} mismatches, {result.fallbacks} fallbacks"
+                f" / {result.queries})"
+            )
+    return 1 if mismatched else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and dispatch to run/compare."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--sizes", help=f"comma-separated presets ({', '.join(SIZES)})")
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    run.set_defaults(handler=_run)
+
+    cmp = sub.add_parser("compare", help="compare two JSON result files")
+    cmp.add_argument("baseline", type=Path)
+    cmp.add_argument("current", type=Path)
+    cmp.add_argument("--threshold", type=float, default=0.10,
+                     help="relative slowdown reported as a regression")
+    cmp.add_argument("--fail", action="store_true",
+                     help="exit 1 if any case regressed")
+    cmp.set_defaults(handler=_compare)
+
+    eng = sub.add_parser("engines", help="cross-check routing engines on the same networks")
+    eng.add_argument("--sizes", help=f"comma-separated presets ({', '.join(ENGINE_SIZES)})")
+    eng.add_argument("--queries", type=int, default=50)
+    eng.add_argument("--database-url",
+                     help="scratch async DB URL (its gates/routes are replaced); default: temp SQLite")
+    eng.set_defaults(handler=_engines)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
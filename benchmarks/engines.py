@@ -0,0 +1,137 @@
+"""Runs every routing engine over the same synthetic networks and cross-checks them."""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.algorithms.dijkstra import PathResult
+from app.algorithms.graph import build_snapshot
+from app.core.config import settings
+from app.db.base import Base
+from app.models.gate import Gate
+from app.models.route import Route
+from app.services.routing_engines import MemoryRoutingEngine, RoutingEngine, SQLRoutingEngine
+from benchmarks.generator import NetworkSpec, generate_network, sample_queries
+
+# The SQL engine enumerates every simple path up to its hop bound, so these
+# networks stay far smaller than the in-memory benchmark presets.
+ENGINE_SIZES: Dict[str, NetworkSpec] = {
+    "tiny": NetworkSpec(gates=30, out_degree=2),
+    "small": NetworkSpec(gates=60, out_degree=3),
+}
+
+
+@dataclass(frozen=True)
+class EngineResult:
+    """One engine's timing over a query set, and how often it disagreed."""
+    engine: str
+    size: str
+    queries: int
+    total_s: float
+    # Queries whose reachability or total HU differs from the reference
+    # engine, or whose path is not a real path with that total.
+    mismatches: int
+    # Queries the engine handed back to the in-memory engine (SQL engine
+    # past its hop bound); their time is included in total_s.
+    fallbacks: int = 0
+
+    @property
+    def per_query_us(self) -> float:
+        """Mean time per query, in microseconds."""
+        return self.total_s / self.queries * 1e6
+
+
+def _check(
+    result: PathResult | None,
+    expected: PathResult | None,
+    weights: Dict[Tuple[str, str], int],
+) -> bool:
+    if result is None or expected is None:
+        return result is expected
+    if result.total_weight != expected.total_weight:
+        return False
+    hops = list(zip(result.path, result.path[1:]))
+    return all(hop in weights for hop in hops) and (
+        sum(weights[hop] for hop in hops) == result.total_weight
+    )
+
+
+async def _load_network(session: AsyncSession, gates, edges) -> None:
+    await session.execute(delete(Route))
+    await session.execute(delete(Gate))
+    await session.execute(insert(Gate), [{"code": c, "name": n} for c, n in gates])
+    await session.execute(
+        insert(Route), [{"from_code": u, "to_code": v, "hu_distance": w} for u, v, w in edges])
+    await session.commit()
+
+
+async def compare_engines(
+    size: str,
+    queries: int = 50,
+    database_url: str | None = None,
+    max_hops: int | None = None,
+) -> List[EngineResult]:
+    """
+    Load one network into a database and time each engine on the same queries.
+
+    The in-memory engine is the reference. The SQL engine runs with the
+    configured hop bound, so queries past it show up as fallbacks.
+
+    Args:
+        size: Key of ENGINE_SIZES.
+        queries: Number of seeded (start, target) pairs.
+        database_url: Async URL of a scratch database whose gates/routes
+            tables are replaced; defaults to a temporary SQLite file.
+        max_hops: SQL engine hop bound; defaults to settings.routing_sql_max_hops.
+    """
+    spec = ENGINE_SIZES[size]
+    gates, edges = generate_network(spec)
+    weights = {(u, v): w for u, v, w in edges}
+    pairs = sample_queries(gates, queries, seed=spec.seed)
+    snapshot = build_snapshot(gates, edges, version=1)
+
+    memory = MemoryRoutingEngine(snapshot)
+    reference = [await memory.shortest_path(s, t) for s, t in pairs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'engines.db'}"
+        db = create_async_engine(url)
+        try:
+            async with db.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(bind=db, class_=AsyncSession)
+            async with sessions() as session:
+                await _load_network(session, gates, edges)
+                async def fallback() -> RoutingEngine:
+                    return memory
+
+                sql = SQLRoutingEngine(
+                    session, max_hops or settings.routing_sql_max_hops, fallback)
+                engines: List[RoutingEngine] = [memory, sql]
+
+                results = []
+                for engine in engines:
+                    started = time.perf_counter()
+                    found = [await engine.shortest_path(s, t) for s, t in pairs]
+                    elapsed = time.perf_counter() - started
+                    results.append(EngineResult(
+                        engine=engine.name,
+                        size=size,
+                        queries=len(pairs),
+                        total_s=elapsed,
+                        mismatches=sum(
+                            not _check(got, want, weights)
+                            for got, want in zip(found, reference)
+                        ),
+                        fallbacks=getattr(engine, "fallbacks", 0),
+                    ))
+        finally:
+            await db.dispose()
+    return results
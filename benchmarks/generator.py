@@ -0,0 +1,119 @@
+"""Seeded synthetic gate-network generator for offline benchmarks."""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from string import ascii_uppercase
+from typing import List, Literal, Tuple
+
+# 3-letter codes, like real gates: AAA, AAB, ... ZZZ.
+MAX_GATES = len(ascii_uppercase) ** 3
+
+
+@dataclass(frozen=True)
+class NetworkSpec:
+    """
+    Shape of a synthetic directed gate network.
+
+    "sparse" gives every gate `out_degree` outgoing routes to random gates;
+    "dense" includes each ordered gate pair with probability `density`.
+    Both add a directed ring through all gates, so every gate can reach
+    every other gate and any random query has an answer.
+    """
+    gates: int
+    shape: Literal["sparse", "dense"] = "sparse"
+    out_degree: int = 4
+    density: float = 0.2
+    hu_distribution: Literal["uniform", "lognormal"] = "uniform"
+    hu_min: int = 1
+    hu_max: int = 500
+    seed: int = 0
+
+    @property
+    def label(self) -> str:
+        """Short human-readable name used in benchmark results."""
+        if self.shape == "sparse":
+            return f"sparse-{self.gates}x{self.out_degree}"
+        return f"dense-{self.gates}@{self.density:g}"
+
+
+def gate_code(i: int) -> str:
+    """Return the i-th 3-letter gate code (0 -> AAA)."""
+    if not 0 <= i < MAX_GATES:
+        raise ValueError(f"gate index must be in [0, {MAX_GATES})")
+    a, rest = divmod(i, 26 * 26)
+    b, c = divmod(rest, 26)
+    return ascii_uppercase[a] + ascii_uppercase[b] + ascii_uppercase[c]
+
+
+def _hu(rng: random.Random, spec: NetworkSpec) -> int:
+    if spec.hu_distribution == "uniform":
+        return rng.randint(spec.hu_min, spec.hu_max)
+    # Log-normal centred on the geometric mean of the range: mostly short
+    # hops with a long tail, clipped to [hu_min, hu_max].
+    mu = (math.log(spec.hu_min) + math.log(spec.hu_max)) / 2
+    value = round(rng.lognormvariate(mu, 0.75))
+    return min(max(value, spec.hu_min), spec.hu_max)
+
+
+def generate_network(
+    spec: NetworkSpec,
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str, int]]]:
+    """
+    Build a reproducible network for the given spec.
+
+    Returns:
+        (gates, edges): (code, name) pairs and directed (from, to, hu)
+        edges with at most one edge per ordered pair and no self-loops.
+
+    Raises:
+        ValueError: If the spec is out of range.
+    """
+    n = spec.gates
+    if n < 2 or n > MAX_GATES:
+        raise ValueError(f"gates must be in [2, {MAX_GATES}]")
+    if spec.hu_min <= 0 or spec.hu_max < spec.hu_min:
+        raise ValueError("HU range must be positive and non-empty")
+    if spec.shape == "sparse" and not 0 < spec.out_degree < n:
+        raise ValueError("out_degree must be in [1, gates)")
+    if spec.shape == "dense" and not 0 < spec.density <= 1:
+        raise ValueError("density must be in (0, 1]")
+
+    rng = random.Random(spec.seed)
+    codes = [gate_code(i) for i in range(n)]
+    gates = [(code, f"Gate {code}") for code in codes]
+
+    # Ring first so the network is strongly connected.
+    pairs = {(i, (i + 1) % n) for i in range(n)}
+    if spec.shape == "sparse":
+        for u in range(n):
+            targets = set()
+            while len(targets) < spec.out_degree:
+                v = rng.randrange(n)
+                if v != u:
+                    targets.add(v)
+            pairs.update((u, v) for v in targets)
+    else:
+        for u in range(n):
+            for v in range(n):
+                if u != v and rng.random() < spec.density:
+                    pairs.add((u, v))
+
+    edges = [(codes[u], codes[v], _hu(rng, spec)) for u, v in sorted(pairs)]
+    return gates, edges
+
+
+def sample_queries(
+    gates: List[Tuple[str, str]], count: int, seed: int = 0
+) -> List[Tuple[str, str]]:
+    """Return `count` reproducible (start, target) pairs of distinct gates."""
+    rng = random.Random(seed)
+    codes = [code for code, _ in gates]
+    queries = []
+    while len(queries) < count:
+        start, target = rng.choice(codes), rng.choice(codes)
+        if start != target:
+            queries.append((start, target))
+    return queries
@@ -0,0 +1,93 @@
+"""JSON persistence and run-to-run comparison of benchmark results."""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.suite import BenchmarkResult
+
+FORMAT_VERSION = 1
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def write_results(results: List[BenchmarkResult], path: Path) -> None:
+    """Write results plus environment metadata to a JSON file."""
+    payload = {
+        "format": FORMAT_VERSION,
+        "meta": {
+            "commit": _git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": [
+            {**asdict(r), "per_op_us": r.per_op_us} for r in results
+        ],
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> Tuple[dict, Dict[Tuple[str, str], BenchmarkResult]]:
+    """
+    Load a results file written by write_results().
+
+    Returns:
+        (meta, results keyed by (name, size)).
+
+    Raises:
+        ValueError: If the file is not a supported results file.
+    """
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark results format")
+    fields = BenchmarkResult.__dataclass_fields__
+    results = {}
+    for raw in payload["results"]:
+        result = BenchmarkResult(**{k: v for k, v in raw.items() if k in fields})
+        results[result.key] = result
+    return payload.get("meta", {}), results
+
+
+def compare(
+    baseline: Dict[Tuple[str, str], BenchmarkResult],
+    current: Dict[Tuple[str, str], BenchmarkResult],
+    threshold: float = 0.10,
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Compare median time per operation for cases present in both runs.
+
+    Returns:
+        (report lines, keys slower than baseline by more than threshold).
+    """
+    lines = [f"{'case':<26}{'size':<8}{'base us/op':>12}{'new us/op':>12}{'change':>9}"]
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key].per_op_us, current[key].per_op_us
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        lines.append(
+            f"{key[0]:<26}{key[1]:<8}{old:>12.2f}{new:>12.2f}{change:>+9.1%}{flag}")
+    for key in sorted(baseline.keys() ^ current.keys()):
+        side = "baseline" if key in baseline else "current"
+        lines.append(f"{key[0]:<26}{key[1]:<8}  only in {side}")
+    return lines, regressions
@@ -0,0 +1,172 @@
+"""Benchmark cases for graph build, path queries and transport pricing."""
+
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.algorithms.alt import alt_shortest_path, select_landmarks
+from app.algorithms.bidirectional import bidirectional_shortest_path
+from app.algorithms.csr import csr_shortest_path
+from app.algorithms.dijkstra import shortest_path_on_adjacency
+from app.algorithms.graph import build_snapshot
+from app.algorithms.transport_batch import compute_transport_plans
+from app.algorithms.transport_planner import compute_transport_plan
+from app.api.responses import ORJSONResponse, SnapshotBodyCache
+from app.api.schemas import CheapestPathOut, GateOut
+from benchmarks.generator import NetworkSpec, generate_network, sample_queries
+
+ALT_LANDMARKS = 8
+
+
+@dataclass(frozen=True)
+class SizePreset:
+    """One benchmark size: a network to route over and a transport batch size."""
+    network: NetworkSpec
+    queries: int
+    transport_rows: int
+
+
+SIZES: Dict[str, SizePreset] = {
+    "small": SizePreset(NetworkSpec(gates=100, out_degree=3), queries=200, transport_rows=1_000),
+    "medium": SizePreset(NetworkSpec(gates=2_000, out_degree=4), queries=100, transport_rows=10_000),
+    "large": SizePreset(NetworkSpec(gates=10_000, out_degree=6), queries=50, transport_rows=100_000),
+    "dense": SizePreset(
+        NetworkSpec(gates=300, shape="dense", density=0.2), queries=100, transport_rows=10_000
+    ),
+}
+DEFAULT_SIZES = ("small", "medium", "dense")
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Timings for one case at one size; each repeat runs `ops` operations."""
+    name: str
+    size: str
+    params: str
+    ops: int
+    repeats: int
+    min_s: float
+    median_s: float
+
+    @property
+    def per_op_us(self) -> float:
+        """Median time per operation, in microseconds."""
+        return self.median_s / self.ops * 1e6
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Identity used to match results across runs."""
+        return self.name, self.size
+
+
+def _measure(fn: Callable[[], object], repeats: int) -> Tuple[float, float]:
+    fn()  # warm-up: caches, lazy imports, allocator
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return min(samples), statistics.median(samples)
+
+
+def run_size(size: str, repeats: int = 5) -> List[BenchmarkResult]:
+    """Run every case for one size preset."""
+    preset = SIZES[size]
+    spec = preset.network
+    gates, edges = generate_network(spec)
+    snapshot = build_snapshot(gates, edges, version=1)
+    queries = sample_queries(gates, preset.queries, seed=spec.seed)
+    landmarks = select_landmarks(snapshot.adjacency, snapshot.reverse_adjacency, ALT_LANDMARKS)
+
+    rng = random.Random(spec.seed)
+    rows = preset.transport_rows
+    distance = [rng.uniform(0.5, 500.0) for _ in range(rows)]
+    passengers = [rng.randint(1, 40) for _ in range(rows)]
+    parking = [rng.randint(0, 14) for _ in range(rows)]
+    distance_np = np.array(distance)
+    passengers_np = np.array(passengers)
+    parking_np = np.array(parking)
+
+    def each_query(search: Callable[[str, str], object]) -> Callable[[], None]:
+        def run() -> None:
+            for start, target in queries:
+                search(start, target)
+        return run
+
+    def scalar_transport() -> None:
+        for d, p, k in zip(distance, passengers, parking):
+            compute_transport_plan(d, p, k)
+
+    # Response rendering: FastAPI's default path (build the model, validate
+    # it against response_model, dump to JSON-able data, json.dumps) versus
+    # an unvalidated model rendered with orjson, and the gate list served
+    # from the per-snapshot byte cache.
+    found = [r for r in (csr_shortest_path(snapshot.csr, s, t) for s, t in queries) if r]
+    path_adapter = TypeAdapter(CheapestPathOut)
+    gates_adapter = TypeAdapter(list[GateOut])
+    body_cache = SnapshotBodyCache()
+
+    def default_paths() -> None:
+        for r in found:
+            model = CheapestPathOut(path=r.path, total_hu=r.total_weight, passengers=2)
+            checked = path_adapter.validate_python(model)
+            JSONResponse(path_adapter.dump_python(checked, mode="json"))
+
+    def orjson_paths() -> None:
+        for r in found:
+            ORJSONResponse(CheapestPathOut.model_construct(
+                path=r.path, total_hu=r.total_weight, passengers=2,
+                hyperspace_cost_gbp=None))
+
+    def default_gates() -> None:
+        models = [GateOut(code=code, name=name) for code, name in sorted(snapshot.gates.items())]
+        JSONResponse(gates_adapter.dump_python(
+            gates_adapter.validate_python(models), mode="json"))
+
+    def cached_gates() -> None:
+        body_cache.get(snapshot, "gates", lambda: [
+            {"code": code, "name": name} for code, name in sorted(snapshot.gates.items())
+        ])
+
+    cases: Iterable[Tuple[str, int, Callable[[], object]]] = [
+        ("graph_build", 1, lambda: build_snapshot(gates, edges, version=1)),
+        ("path_dijkstra", len(queries), each_query(
+            lambda s, t: shortest_path_on_adjacency(snapshot.adjacency, s, t))),
+        ("path_csr", len(queries), each_query(
+            lambda s, t: csr_shortest_path(snapshot.csr, s, t))),
+        ("path_bidirectional", len(queries), each_query(
+            lambda s, t: bidirectional_shortest_path(
+                snapshot.adjacency, snapshot.reverse_adjacency, s, t))),
+        ("path_alt", len(queries), each_query(
+            lambda s, t: alt_shortest_path(snapshot.adjacency, landmarks, s, t))),
+        ("serialize_path_default", len(found), default_paths),
+        ("serialize_path_orjson", len(found), orjson_paths),
+        ("serialize_gates_default", 1, default_gates),
+        ("serialize_gates_cached", 1, cached_gates),
+        ("transport_scalar", rows, scalar_transport),
+        ("transport_batch", rows, lambda: compute_transport_plans(
+            distance_np, passengers_np, parking_np)),
+    ]
+
+    params = f"{spec.label} ({len(edges)} edges)"
+    results = []
+    for name, ops, fn in cases:
+        best, median = _measure(fn, repeats)
+        results.append(BenchmarkResult(
+            name=name,
+            size=size,
+            params=params if not name.startswith("transport") else f"{rows} rows",
+            ops=ops,
+            repeats=repeats,
+            min_s=best,
+            median_s=median,
+        ))
+    return results
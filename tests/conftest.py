@@ -5,7 +5,7 @@ os.environ.setdefault("ENVIRONMENT", "test")
 
 from app.models.route import Route
 from app.models.gate import Gate
-from app.db.session import get_db_session
+from app.db.session import get_db_session, get_read_db_session
 from app.db.base import Base
 from app.main import app
 import sys
@@ -176,6 +176,7 @@ async def client(base_url: str, TestSessionLocal) -> AsyncGenerator[AsyncClient,
 
     # Override BEFORE startup so anything during startup uses the test session.
     app.dependency_overrides[get_db_session] = override_get_db_session
+    app.dependency_overrides[get_read_db_session] = override_get_db_session
 
     await app.router.startup()
 
@@ -185,3 +186,12 @@ async def client(base_url: str, TestSessionLocal) -> AsyncGenerator[AsyncClient,
 
     await app.router.shutdown()
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def admin_headers(monkeypatch) -> dict:
+    """Configure an admin token and return the headers that authenticate /admin calls."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "admin_token", "test-admin-token")
+    return {"X-Admin-Token": "test-admin-token"}
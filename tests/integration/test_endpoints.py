@@ -1,6 +1,22 @@
 """Integration tests for HTTP endpoints and response schemas."""
 
+import asyncio
+import json
+
 import pytest
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.metrics import PATH_SEARCH_COALESCED, PATH_SEARCH_FALLBACKS
+from app.db.graph_version import bump_graph_version_sync, read_graph_version
+from app.models.gate import Gate
+from app.models.route import Route
+from app.repositories.routes import RouteRepository
+from app.services import graph_store as graph_store_module
+from app.services.graph_store import graph_store
+from app.services.graph_sync import poll_graph_version
+from app.services.routing_engines import MemoryRoutingEngine
+from app.services.search_executor import search_executor
 
 
 @pytest.mark.asyncio
@@ -22,6 +38,68 @@ async def test_list_gates(client):
     assert {"code": "SOL", "name": "Sol"} in data
 
 
+@pytest.mark.asyncio
+async def test_list_gates_keyset_pages(client):
+    """Following rel=next links walks the full catalogue in code order."""
+    everything = (await client.get("/gates")).json()
+
+    seen = []
+    url = "/gates?limit=5"
+    while url:
+        r = await client.get(url)
+        assert r.status_code == 200
+        page = r.json()
+        assert len(page) <= 5
+        seen.extend(page)
+        link = r.headers.get("link")
+        url = link[link.index("<") + 1:link.index(">")] if link else None
+    assert seen == everything
+
+    r = await client.get("/gates?after=SOL")
+    assert [g["code"] for g in r.json()] == [
+        g["code"] for g in everything if g["code"] > "SOL"]
+    assert (await client.get("/gates?limit=0")).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_gates_ndjson_stream(client):
+    """Accept: application/x-ndjson streams one gate per line."""
+    everything = (await client.get("/gates")).json()
+    headers = {"Accept": "application/x-ndjson"}
+
+    r = await client.get("/gates", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert "etag" in r.headers
+    lines = r.text.splitlines()
+    assert [json.loads(line) for line in lines] == everything
+
+    r = await client.get("/gates?after=ALS&limit=2", headers=headers)
+    assert [json.loads(line)["code"] for line in r.text.splitlines()] == [
+        g["code"] for g in everything if g["code"] > "ALS"][:2]
+
+
+@pytest.mark.asyncio
+async def test_list_gates_formats_have_their_own_etags(client):
+    """JSON and NDJSON never revalidate each other's cached copy."""
+    ndjson = {"Accept": "application/x-ndjson"}
+    json_r = await client.get("/gates")
+    ndjson_r = await client.get("/gates", headers=ndjson)
+    assert json_r.headers["etag"] != ndjson_r.headers["etag"]
+    assert json_r.headers["vary"] == ndjson_r.headers["vary"] == "Accept"
+
+    r = await client.get(
+        "/gates", headers={**ndjson, "If-None-Match": json_r.headers["etag"]})
+    assert r.status_code == 200
+    r = await client.get("/gates", headers={"If-None-Match": ndjson_r.headers["etag"]})
+    assert r.status_code == 200
+
+    r = await client.get(
+        "/gates", headers={**ndjson, "If-None-Match": ndjson_r.headers["etag"]})
+    assert r.status_code == 304
+    assert r.headers["vary"] == "Accept"
+
+
 @pytest.mark.asyncio
 async def test_get_gate_details(client):
     """Gate details include outgoing routes."""
@@ -74,6 +152,313 @@ async def test_cheapest_path_with_passengers_prx_to_cas(client):
     assert body["hyperspace_cost_gbp"] == 60.0
 
 
+@pytest.mark.asyncio
+async def test_cheapest_path_unknown_gate(client):
+    """Unknown gates are rejected from the snapshot's gate index."""
+    r = await client.get("/gates/SOL/to/XXX")
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Gate 'XXX' not found"
+
+
+@pytest.mark.asyncio
+async def test_alternative_paths(client):
+    """Alternatives start with the cheapest path and are ranked by cost."""
+    r = await client.get("/gates/SOL/to/ALS/alternatives?k=4&passengers=3")
+    assert r.status_code == 200
+    paths = r.json()["paths"]
+    assert len(paths) == 4
+
+    cheapest = (await client.get("/gates/SOL/to/ALS?passengers=3")).json()
+    assert paths[0] == cheapest
+    costs = [p["total_hu"] for p in paths]
+    assert costs == sorted(costs)
+    assert len({tuple(p["path"]) for p in paths}) == 4
+
+    r = await client.get("/gates/SOL/to/ALS/alternatives?k=0")
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_routes_from_gate(client):
+    """One call returns the same paths and costs as per-target calls."""
+    r = await client.get("/gates/SOL/routes?passengers=3")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["from_code"] == "SOL"
+    targets = [route["path"][-1] for route in body["routes"]]
+    assert "SOL" not in targets
+    assert targets == sorted(targets)
+
+    by_target = {route["path"][-1]: route for route in body["routes"]}
+    assert by_target["ALS"]["hyperspace_cost_gbp"] == 101.1
+
+    single = (await client.get("/gates/SOL/to/CAS?passengers=3")).json()
+    assert by_target["CAS"] == single
+
+
+@pytest.mark.asyncio
+async def test_routes_from_unknown_gate(client):
+    """Unknown origin returns 404."""
+    r = await client.get("/gates/XXX/routes")
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cheapest_paths_batch(client):
+    """Batch results match single calls and carry per-item errors."""
+    r = await client.post(
+        "/gates/routes:batch",
+        json={
+            "items": [
+                {"from_code": "SOL", "to_code": "ALS", "passengers": 3},
+                {"from_code": "PRX", "to_code": "CAS", "passengers": 2},
+                {"from_code": "SOL", "to_code": "CAS"},
+                {"from_code": "SOL", "to_code": "XXX"},
+                {"from_code": "SOLAR", "to_code": "ALS"},
+                {"from_code": "SOL", "to_code": "SOL"},
+            ]
+        },
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [x["status_code"] for x in results] == [200, 200, 200, 404, 400, 404]
+
+    assert results[0]["result"]["hyperspace_cost_gbp"] == 101.1
+    assert results[1]["result"]["hyperspace_cost_gbp"] == 60.0
+    single = (await client.get("/gates/SOL/to/CAS")).json()
+    assert results[2]["result"] == single
+    assert results[3]["error"] == "Gate 'XXX' not found"
+    assert results[3]["result"] is None
+
+
+@pytest.mark.asyncio
+async def test_cheapest_path_all_pairs_mode(
+    client, TestSessionLocal, monkeypatch, admin_headers
+):
+    """All-pairs mode answers from the background-built next-hop table."""
+    monkeypatch.setattr(settings, "routing_mode", "all_pairs")
+    async with TestSessionLocal() as session:
+        await graph_store.refresh(session)
+    await graph_store.wait_for_routing_index()
+
+    r = await client.get("/admin/routing-table", headers=admin_headers)
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["routing_mode"] == "all_pairs"
+    assert stats["table_version"] == stats["graph_version"]
+    assert stats["node_count"] == 13
+    assert stats["memory_bytes"] > 0
+
+    r = await client.get("/gates/SOL/to/ALS?passengers=3")
+    assert r.status_code == 200
+    assert r.json()["hyperspace_cost_gbp"] == 101.1
+
+
+@pytest.mark.asyncio
+async def test_all_pairs_table_patched_after_route_change(
+    client, TestSessionLocal, monkeypatch, caplog
+):
+    """A single new route updates the existing table instead of rebuilding it."""
+    monkeypatch.setattr(settings, "routing_mode", "all_pairs")
+    async with TestSessionLocal() as session:
+        await graph_store.refresh(session)
+    await graph_store.wait_for_routing_index()
+
+    caplog.set_level("INFO", logger="app.services.graph_store")
+    async with TestSessionLocal() as session:
+        session.add(Route(from_code="SOL", to_code="ALS", hu_distance=1))
+        await session.commit()
+    try:
+        async with TestSessionLocal() as session:
+            snapshot = await graph_store.refresh(session)
+        table = await graph_store.wait_for_routing_index()
+        assert table.version == snapshot.version
+        assert "updated incrementally" in caplog.text
+        r = await client.get("/gates/SOL/to/ALS")
+        assert r.json()["path"] == ["SOL", "ALS"]
+    finally:
+        async with TestSessionLocal() as session:
+            await session.execute(
+                delete(Route).where(Route.from_code == "SOL", Route.to_code == "ALS"))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_cheapest_path_sql_engine(client, monkeypatch):
+    """The in-database engine agrees with the in-memory one."""
+    urls = ["/gates/SOL/to/ALS?passengers=3", "/gates/PRX/to/CAS", "/gates/DEN/to/PRX"]
+    expected = [(await client.get(url)).json() for url in urls]
+
+    monkeypatch.setattr(settings, "routing_engine", "sql")
+    for url, want in zip(urls, expected):
+        r = await client.get(url)
+        assert r.status_code == 200
+        assert r.json() == want
+
+    # SOL -> ALS needs four routes; a bound of two must not return the
+    # dearer SOL -> ALD -> ALS but hand the search to the memory engine.
+    monkeypatch.setattr(settings, "routing_sql_max_hops", 2)
+    before = PATH_SEARCH_FALLBACKS.value(engine="sql")
+    r = await client.get("/gates/SOL/to/ALS?passengers=3")
+    assert r.json() == expected[0]
+    assert PATH_SEARCH_FALLBACKS.value(engine="sql") == before + 1
+    assert (await client.get("/gates/SOL/to/SOL")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sql_engine_loads_snapshot_only_on_fallback(client, monkeypatch):
+    """The SQL engine answers, validates and revalidates without the snapshot."""
+    monkeypatch.setattr(settings, "routing_engine", "sql")
+    monkeypatch.setattr(graph_store, "_snapshot", None)
+    r = await client.get("/gates/PRX/to/CAS")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    r = await client.get("/gates/PRX/to/CAS", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert (await client.get("/gates/SOL/to/XXX")).status_code == 404
+    assert graph_store.snapshot is None
+
+    # Past the hop bound the search falls back and the snapshot loads.
+    monkeypatch.setattr(settings, "routing_sql_max_hops", 2)
+    r = await client.get("/gates/SOL/to/ALS")
+    assert r.status_code == 200
+    assert graph_store.snapshot is not None
+
+
+@pytest.mark.asyncio
+async def test_sql_engine_reports_truncated_search(TestSessionLocal):
+    """A path cut short by the hop bound is marked incomplete, not returned as cheapest."""
+    async with TestSessionLocal() as session:
+        repo = RouteRepository(session)
+        short = await repo.cheapest_path("SOL", "ALS", 2)
+        assert not short.complete
+        full = await repo.cheapest_path("SOL", "ALS", 8)
+        assert full.complete
+        assert full.path[0] == "SOL" and full.path[-1] == "ALS"
+        assert full.cost == 337
+        # PRO's only route is to CAS, so one hop settles it completely.
+        direct = await repo.cheapest_path("PRO", "CAS", 1)
+        assert direct.complete and direct.path == ["PRO", "CAS"] and direct.cost == 80
+
+
+@pytest.mark.asyncio
+async def test_shared_graph_dir_serves_mapped_structures(
+    client, TestSessionLocal, monkeypatch, tmp_path
+):
+    """With SHARED_GRAPH_DIR, the CSR graph and table come from mapped files."""
+    expected = (await client.get("/gates/SOL/to/ALS?passengers=3")).json()
+    monkeypatch.setattr(settings, "shared_graph_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "routing_mode", "all_pairs")
+    try:
+        async with TestSessionLocal() as session:
+            snapshot = await graph_store.refresh(session)
+        table = await graph_store.wait_for_routing_index()
+        assert isinstance(snapshot.csr.targets, memoryview)
+        assert isinstance(table.dist, memoryview)
+        assert (tmp_path / f"table-{snapshot.fingerprint}.bin").exists()
+
+        r = await client.get("/gates/SOL/to/ALS?passengers=3")
+        assert r.json() == expected
+    finally:
+        monkeypatch.undo()
+        async with TestSessionLocal() as session:
+            await graph_store.refresh(session)
+
+
+@pytest.mark.asyncio
+async def test_cheapest_path_contraction_mode(
+    client, TestSessionLocal, monkeypatch, admin_headers
+):
+    """Contraction mode answers from a background-built hierarchy."""
+    monkeypatch.setattr(settings, "routing_mode", "contraction")
+    async with TestSessionLocal() as session:
+        await graph_store.refresh(session)
+    await graph_store.wait_for_routing_index()
+
+    stats = (await client.get("/admin/routing-table", headers=admin_headers)).json()
+    assert stats["table_version"] == stats["graph_version"]
+    assert stats["memory_bytes"] is None
+
+    r = await client.get("/gates/PRX/to/CAS?passengers=2")
+    assert r.status_code == 200
+    assert r.json()["hyperspace_cost_gbp"] == 60.0
+
+
+@pytest.mark.asyncio
+async def test_failed_index_build_is_logged_and_superseded_builds_cancelled(
+    client, TestSessionLocal, monkeypatch, caplog
+):
+    """A failing background build is reported and requests fall back to Dijkstra."""
+    monkeypatch.setattr(settings, "routing_mode", "contraction")
+
+    def fail(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(graph_store_module, "build_contraction_hierarchy", fail)
+    async with TestSessionLocal() as session:
+        await graph_store.refresh(session)
+        first = graph_store._index_task
+        await graph_store.refresh(session)
+    assert first is not graph_store._index_task and first.done()
+    assert await graph_store.wait_for_routing_index() is None
+    assert "build failed" in caplog.text
+
+    r = await client.get("/gates/PRX/to/CAS")
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_cheapest_path_offloaded_to_thread_pool(client, monkeypatch):
+    """With offloading on, the pooled search returns the same answer."""
+    inline = (await client.get("/gates/SOL/to/ALS?passengers=3")).json()
+    monkeypatch.setattr(settings, "search_executor", "thread")
+    monkeypatch.setattr(settings, "search_offload_min_edges", 0)
+    try:
+        r = await client.get("/gates/SOL/to/ALS?passengers=3")
+    finally:
+        search_executor.shutdown()
+    assert r.status_code == 200
+    assert r.json() == inline
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_paths_share_one_search(client, monkeypatch):
+    """Identical concurrent requests run one search; the others are counted as coalesced."""
+    searches = []
+    search = MemoryRoutingEngine.shortest_path
+
+    async def slow_search(self, start, target):
+        searches.append((start, target))
+        await asyncio.sleep(0.05)
+        return await search(self, start, target)
+
+    monkeypatch.setattr(MemoryRoutingEngine, "shortest_path", slow_search)
+    await client.get("/gates")  # load the snapshot up front
+    before = PATH_SEARCH_COALESCED.value(engine="csr")
+
+    responses = await asyncio.gather(
+        *(client.get("/gates/SOL/to/ALS?passengers=2") for _ in range(5)),
+        client.get("/gates/SOL/to/ALS"),
+        client.get("/gates/SOL/to/CAS"),
+    )
+    assert all(r.status_code == 200 for r in responses)
+    assert searches == [("SOL", "ALS"), ("SOL", "CAS")]
+    # Passengers only change the pricing, not the shared search.
+    assert len({tuple(r.json()["path"]) for r in responses[:6]}) == 1
+    assert responses[5].json()["hyperspace_cost_gbp"] is None
+    assert PATH_SEARCH_COALESCED.value(engine="csr") == before + 5
+
+
+@pytest.mark.asyncio
+async def test_sql_engine_searches_are_not_shared(client, monkeypatch):
+    """SQL searches use the requesting client's session, so each request runs its own."""
+    monkeypatch.setattr(settings, "routing_engine", "sql")
+    before = PATH_SEARCH_COALESCED.value(engine="sql")
+    responses = await asyncio.gather(*(client.get("/gates/SOL/to/ALS") for _ in range(3)))
+    assert all(r.status_code == 200 for r in responses)
+    assert PATH_SEARCH_COALESCED.value(engine="sql") == before
+
+
 @pytest.mark.asyncio
 async def test_transport_endpoint(client):
     """Transport endpoint returns a structured plan with totals."""
@@ -89,6 +474,354 @@ async def test_transport_endpoint(client):
     assert body["plan"]["personal_trips"] >= 0
 
 
+@pytest.mark.asyncio
+async def test_transport_batch_matches_single_endpoint(client):
+    """Each batch row equals the single-row endpoint's response."""
+    rows = [(1, 7, 2), (1.5, 5, 0), (12.25, 9, 1)]
+    r = await client.post(
+        "/transport:batch",
+        json={
+            "distance_au": [row[0] for row in rows],
+            "passengers": [row[1] for row in rows],
+            "parking_days": [row[2] for row in rows],
+        },
+    )
+    assert r.status_code == 200
+    batch = r.json()
+
+    for i, (distance, passengers, parking) in enumerate(rows):
+        single = (await client.get(
+            f"/transport/{distance}?passengers={passengers}&parking={parking}"
+        )).json()
+        assert batch["total_cost_gbp"][i] == single["total_cost_gbp"]
+        assert batch["chosen_mode"][i] == single["chosen_mode"]
+        assert batch["hstc_only_total_gbp"][i] == single["hstc_only_total_gbp"]
+        for key, value in single["plan"].items():
+            assert batch[key][i] == value
+
+    r = await client.post(
+        "/transport:batch",
+        json={"distance_au": [0], "passengers": [1], "parking_days": [0]},
+    )
+    assert r.status_code == 400
+    assert (await client.get("/transport/0?passengers=1")).status_code == 400
+
+    # Per-row passengers/parking errors use the single endpoint's 422.
+    for passengers, parking in ((0, 0), (1, -1)):
+        r = await client.post(
+            "/transport:batch",
+            json={"distance_au": [1], "passengers": [passengers], "parking_days": [parking]},
+        )
+        assert r.status_code == 422
+        single = await client.get(f"/transport/1?passengers={passengers}&parking={parking}")
+        assert single.status_code == 422
+
+    r = await client.post(
+        "/transport:batch",
+        json={"distance_au": [1, 2], "passengers": [1], "parking_days": [0]},
+    )
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_gate_endpoints_support_conditional_get(client):
+    """Gate GETs carry an ETag; a matching If-None-Match returns 304."""
+    for url in ("/gates", "/gates/SOL", "/gates/SOL/to/ALS?passengers=2"):
+        r = await client.get(url)
+        assert r.status_code == 200
+        etag = r.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        assert r.headers["cache-control"] == "no-cache"
+
+        r = await client.get(url, headers={"If-None-Match": etag})
+        assert r.status_code == 304
+        assert r.headers["etag"] == etag
+        assert r.content == b""
+
+        r = await client.get(url, headers={"If-None-Match": '"stale"'})
+        assert r.status_code == 200
+
+    # Unknown gates are reported even when the client's ETag is current.
+    for url, status in (("/gates/XXX", 404), ("/gates/SOL/to/XXX", 404), ("/gates/SOLX", 400)):
+        for if_none_match in ("*", etag):
+            r = await client.get(url, headers={"If-None-Match": if_none_match})
+            assert r.status_code == status
+
+
+@pytest.mark.asyncio
+async def test_route_write_changes_etag(client, TestSessionLocal):
+    """Committing a route change bumps the graph version and the ETag."""
+    etag = (await client.get("/gates/SOL")).headers["etag"]
+    version = graph_store.version
+
+    async with TestSessionLocal() as session:
+        session.add(Route(from_code="SOL", to_code="ALS", hu_distance=1))
+        await session.commit()
+    try:
+        assert graph_store.version > version
+        r = await client.get("/gates/SOL", headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["etag"] != etag
+        assert {"to_code": "ALS", "hu_distance": 1} in r.json()["outgoing"]
+    finally:
+        async with TestSessionLocal() as session:
+            await session.execute(
+                delete(Route).where(Route.from_code == "SOL", Route.to_code == "ALS"))
+            await session.commit()
+
+    r = await client.get("/gates/SOL", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_route_write_bumps_shared_graph_version(client, TestSessionLocal):
+    """A network commit bumps the DB version, which this worker does not reload for."""
+    async with TestSessionLocal() as session:
+        before = await read_graph_version(session)
+        session.add(Route(from_code="SOL", to_code="ALS", hu_distance=1))
+        await session.commit()
+    try:
+        async with TestSessionLocal() as session:
+            assert await read_graph_version(session) == before + 1
+        assert not await poll_graph_version(TestSessionLocal)
+    finally:
+        async with TestSessionLocal() as session:
+            await session.execute(
+                delete(Route).where(Route.from_code == "SOL", Route.to_code == "ALS"))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_poll_reloads_after_write_by_another_worker(client, TestSessionLocal):
+    """A version bumped elsewhere (e.g. the import CLI) triggers exactly one reload."""
+    await client.get("/gates/SOL")
+    async with TestSessionLocal() as session:
+        # Raw bump: no ORM write, so this process's hooks do not see it.
+        await session.run_sync(lambda s: bump_graph_version_sync(s.connection()))
+        await session.commit()
+    version = graph_store.version
+
+    assert await poll_graph_version(TestSessionLocal)
+    assert graph_store.version > version
+    assert not await poll_graph_version(TestSessionLocal)
+
+
+@pytest.mark.asyncio
+async def test_reload_after_local_write_skips_lagging_replica(
+    client, TestSessionLocal, monkeypatch
+):
+    """A read session behind our own write is not cached; the primary is used."""
+    await client.get("/gates/SOL")
+    primaries = []
+
+    def primary_sessions():
+        session = TestSessionLocal()
+        primaries.append(session)
+        return session
+
+    read_version = graph_store_module.read_graph_version
+
+    async def lagging_replica(session):
+        version = await read_version(session)
+        return version if session in primaries else version - 1
+
+    monkeypatch.setattr(graph_store_module, "AsyncSessionLocal", primary_sessions)
+    monkeypatch.setattr(graph_store_module, "read_graph_version", lagging_replica)
+    try:
+        async with TestSessionLocal() as session:
+            session.add(Route(from_code="SOL", to_code="ALS", hu_distance=1))
+            await session.commit()
+        r = await client.get("/gates/SOL/to/ALS")
+        assert r.json()["path"] == ["SOL", "ALS"]
+        assert len(primaries) == 1
+        assert not graph_store._stale
+    finally:
+        async with TestSessionLocal() as session:
+            await session.execute(
+                delete(Route).where(Route.from_code == "SOL", Route.to_code == "ALS"))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_routes_and_gates(client, TestSessionLocal, admin_headers):
+    """Bulk import merges routes, creates missing gates, and bumps the version once."""
+    version = graph_store.version
+    body = "from_code,to_code,hu_distance\nSOL,QQA,7\nQQA,QQB,3\n"
+    try:
+        r = await client.post(
+            "/admin/import/routes?format=csv", headers=admin_headers, content=body)
+        assert r.status_code == 200
+        result = r.json()
+        assert result["rows"] == 2
+        assert result["gates_created"] == 2
+        assert result["graph_version"] == version + 1
+
+        r = await client.post(
+            "/admin/import/gates?format=ndjson",
+            headers=admin_headers,
+            content='{"code": "QQB", "name": "Quasar"}\n',
+        )
+        assert r.status_code == 200
+
+        r = await client.get("/gates/SOL/to/QQB")
+        assert r.status_code == 200
+        assert r.json()["path"] == ["SOL", "QQA", "QQB"]
+        assert (await client.get("/gates/QQB")).json()["name"] == "Quasar"
+
+        # A bad row rejects the whole file.
+        r = await client.post(
+            "/admin/import/routes", headers=admin_headers, content="SOL,QQA,1\nSOL,QQB,-1\n")
+        assert r.status_code == 400
+        assert "line 2" in r.json()["detail"]
+        assert (await client.get("/gates/SOL/to/QQA")).json()["total_hu"] == 7
+    finally:
+        async with TestSessionLocal() as session:
+            await session.execute(delete(Route).where(
+                (Route.from_code.in_(["QQA", "QQB"])) | (Route.to_code.in_(["QQA", "QQB"]))))
+            await session.execute(delete(Gate).where(Gate.code.in_(["QQA", "QQB"])))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_routes_searches_and_plans(client):
+    """/metrics exposes per-template latency, search and planner metrics."""
+    await client.get("/gates/SOL/to/ALS")
+    await client.get("/gates/SOL/to/ALS/alternatives")
+    await client.get("/gates/SOL/routes")
+    await client.get("/transport/10?passengers=3")
+    await client.get("/no/such/path")
+
+    r = await client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    text = r.text
+    assert ('http_request_duration_seconds_count{method="GET",'
+            'route="/gates/{gate_code}/to/{target_gate_code}",status="200"}') in text
+    assert 'route="<unmatched>",status="404"' in text
+    assert 'http_requests_in_progress{method="GET",route="/metrics"} 1' in text
+    assert 'path_search_settled_nodes_count{engine="csr"}' in text
+    assert 'path_search_settled_nodes_count{engine="tree"}' in text
+    assert 'path_search_duration_seconds_count{engine="yen"}' in text
+    assert 'path_search_settled_nodes_count{engine="yen"}' not in text
+    assert 'transport_plans_total{kind="single",mode="HSTC"}' in text
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_require_token(client, monkeypatch):
+    """/admin is hidden without a configured token and rejects wrong ones."""
+    r = await client.post("/admin/import/routes?replace=true", content="SOL,PRX,1\n")
+    assert r.status_code == 404
+    assert (await client.get("/admin/db-pools")).status_code == 404
+
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    for headers in ({}, {"X-Admin-Token": "wrong"}):
+        r = await client.post(
+            "/admin/import/routes?replace=true", headers=headers, content="SOL,PRX,1\n")
+        assert r.status_code == 401
+    r = await client.get("/admin/profiles", headers={"X-Admin-Token": "secret"})
+    assert r.status_code == 200
+    assert (await client.get("/gates/SOL/to/PRX")).json()["total_hu"] == 90
+
+
+@pytest.mark.asyncio
+async def test_debug_header_captures_profile(client, monkeypatch, admin_headers):
+    """A request with the profiling token is profiled and listed by id."""
+    r = await client.get("/gates/SOL/to/ALS", headers={"X-Debug-Profile": "secret"})
+    assert "x-profile-id" not in r.headers  # disabled without a token
+
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    r = await client.get("/gates/SOL/to/ALS", headers={"X-Debug-Profile": "wrong"})
+    assert "x-profile-id" not in r.headers
+    r = await client.get("/gates/SOL/to/ALS", headers={"X-Debug-Profile": "secret"})
+    assert r.status_code == 200
+    profile_id = int(r.headers["x-profile-id"])
+
+    profiles = (await client.get("/admin/profiles", headers=admin_headers)).json()
+    captured = next(p for p in profiles if p["id"] == profile_id)
+    assert captured["path"] == "/gates/SOL/to/ALS"
+    assert captured["status"] == 200
+    assert captured["reason"] == "header"
+    assert captured["entries"]
+
+
+def _timing_phases(response) -> dict:
+    phases = {}
+    for part in response.headers["server-timing"].split(","):
+        name, dur = part.strip().split(";dur=")
+        phases[name] = float(dur)
+    return phases
+
+
+@pytest.mark.asyncio
+async def test_server_timing_breaks_down_phases(client):
+    """Gate and transport responses carry per-phase Server-Timing headers."""
+    graph_store.invalidate()
+    r = await client.get("/gates/SOL/to/ALS")
+    phases = _timing_phases(r)
+    # First request after invalidation reloads the snapshot.
+    assert {"db", "graph_build", "search", "serialize", "total"} <= set(phases)
+    assert phases["total"] >= phases["db"] + phases["search"]
+
+    r = await client.get("/gates/SOL/to/ALS")
+    assert "db" not in _timing_phases(r)
+
+    r = await client.get("/transport/10?passengers=2")
+    assert {"pricing", "serialize", "total"} <= set(_timing_phases(r))
+
+    r = await client.get("/gates/XXX/to/ALS")
+    assert r.status_code == 404
+    assert "total" in _timing_phases(r)
+
+
+@pytest.mark.asyncio
+async def test_db_pool_stats(client, admin_headers):
+    """Pool stats list the primary engine with a masked URL."""
+    r = await client.get("/admin/db-pools", headers=admin_headers)
+    assert r.status_code == 200
+    pools = r.json()
+    assert pools[0]["name"] == "primary"
+    assert pools[0]["healthy"] is True
+    assert ":***@" in pools[0]["url"]
+
+    text = (await client.get("/metrics")).text
+    assert 'db_pool_healthy{pool="primary"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_journey_quote_combines_three_calls(client):
+    """One quote equals transport + outbound path + inbound path."""
+    r = await client.get(
+        "/journeys/quote?from=SOL&to=ALS&distance=1&passengers=7&parking=2")
+    assert r.status_code == 200
+    quote = r.json()
+
+    transport = (await client.get("/transport/1?passengers=7&parking=2")).json()
+    outbound = (await client.get("/gates/SOL/to/ALS?passengers=7")).json()
+    inbound = (await client.get("/gates/ALS/to/SOL?passengers=7")).json()
+
+    assert quote["transport"] == transport
+    assert quote["outbound"] == outbound
+    assert quote["inbound"] == inbound
+    expected_hyperspace = outbound["hyperspace_cost_gbp"] + inbound["hyperspace_cost_gbp"]
+    assert quote["hyperspace_cost_gbp"] == pytest.approx(expected_hyperspace)
+    assert quote["total_cost_gbp"] == pytest.approx(
+        expected_hyperspace + transport["total_cost_gbp"])
+
+
+@pytest.mark.asyncio
+async def test_journey_quote_errors(client):
+    """Unknown gates, same-gate journeys and invalid distances are rejected."""
+    r = await client.get("/journeys/quote?from=SOL&to=XXX&distance=1&passengers=1")
+    assert r.status_code == 404
+    r = await client.get("/journeys/quote?from=SOL&to=SOL&distance=1&passengers=1")
+    assert r.status_code == 404
+    assert r.json()["detail"] == "No route from 'SOL' to 'SOL'"
+    r = await client.get("/journeys/quote?from=SOL&to=ALS&distance=0&passengers=1")
+    assert r.status_code == 400
+    r = await client.get("/journeys/quote?from=SOL&to=ALS&distance=1&passengers=0")
+    assert r.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_transport_validation_errors(client):
     """Invalid transport inputs return proper HTTP status codes."""
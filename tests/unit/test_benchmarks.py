@@ -0,0 +1,63 @@
+"""Unit tests for the synthetic network generator and benchmark reports."""
+
+import pytest
+
+from app.algorithms.dijkstra import shortest_path_tree
+from app.algorithms.graph import build_snapshot
+from benchmarks.engines import compare_engines
+from benchmarks.generator import NetworkSpec, gate_code, generate_network
+from benchmarks.report import compare, load_results, write_results
+from benchmarks.suite import BenchmarkResult
+
+
+def test_generator_is_seeded_and_strongly_connected():
+    """Same spec -> same network; every gate reaches every other gate."""
+    spec = NetworkSpec(gates=60, out_degree=3, hu_distribution="lognormal", seed=4)
+    gates, edges = generate_network(spec)
+    assert generate_network(spec) == (gates, edges)
+    assert generate_network(NetworkSpec(gates=60, out_degree=3, seed=5))[1] != edges
+
+    assert len(gates) == 60 and gates[0] == ("AAA", "Gate AAA")
+    assert len({(u, v) for u, v, _ in edges}) == len(edges)
+    assert all(u != v and spec.hu_min <= w <= spec.hu_max for u, v, w in edges)
+
+    snapshot = build_snapshot(gates, edges, version=1)
+    assert len(shortest_path_tree(snapshot.adjacency, "AAA").dist) == 60
+
+
+def test_dense_shape_and_spec_validation():
+    """Dense networks scale with density; bad specs are rejected."""
+    _, edges = generate_network(NetworkSpec(gates=40, shape="dense", density=0.5))
+    assert 40 * 39 * 0.35 < len(edges) < 40 * 39 * 0.65
+    assert gate_code(26 * 26 + 27) == "BBB"
+    with pytest.raises(ValueError):
+        generate_network(NetworkSpec(gates=10, out_degree=10))
+
+
+def test_results_round_trip_and_compare(tmp_path):
+    """Results survive JSON and regressions beyond the threshold are flagged."""
+    def result(name, median):
+        return BenchmarkResult(name=name, size="small", params="p", ops=10,
+                               repeats=3, min_s=median, median_s=median)
+
+    path = tmp_path / "base.json"
+    write_results([result("path_csr", 1.0), result("graph_build", 2.0)], path)
+    _, baseline = load_results(path)
+    assert baseline[("path_csr", "small")].per_op_us == pytest.approx(1e5)
+
+    current = {r.key: r for r in [result("path_csr", 1.5), result("graph_build", 2.1)]}
+    _, regressions = compare(baseline, current, threshold=0.10)
+    assert regressions == [("path_csr", "small")]
+
+
+@pytest.mark.asyncio
+async def test_engines_agree_on_the_same_network():
+    """Memory and SQL engines return the same totals for every query."""
+    results = await compare_engines("tiny", queries=10)
+    assert [r.engine for r in results] == ["csr", "sql"]
+    assert all(r.mismatches == 0 and r.queries == 10 for r in results)
+
+    # A 1-route bound cannot settle most queries: they fall back, still correct.
+    results = await compare_engines("tiny", queries=10, max_hops=1)
+    assert results[1].mismatches == 0
+    assert results[1].fallbacks > 0
@@ -0,0 +1,61 @@
+"""Unit tests for streaming bulk-import parsing and validation."""
+
+import pytest
+
+from app.db.bulk_import import decode_lines, iter_edges, iter_gates
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(rows):
+    return [row async for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_csv_and_ndjson_edges_parse_to_the_same_records():
+    """CSV (with optional header) and NDJSON yield identical edge tuples."""
+    csv_lines = ["from_code,to_code,hu_distance", "SOL,PRX,90", "", "PRX,SOL, 85"]
+    ndjson_lines = [
+        '{"from_code": "SOL", "to_code": "PRX", "hu_distance": 90}',
+        '{"from_code": "PRX", "to_code": "SOL", "hu_distance": 85}',
+    ]
+    expected = [("SOL", "PRX", 90), ("PRX", "SOL", 85)]
+    assert await _collect(iter_edges(_aiter(csv_lines), "csv")) == expected
+    assert await _collect(iter_edges(_aiter(ndjson_lines), "ndjson")) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("line, message", [
+    ("SO,PRX,90", "line 2: from_code must be a 3-letter uppercase code"),
+    ("sol,PRX,90", "line 2: from_code must be a 3-letter uppercase code"),
+    ("SOL,ÅÉÎ,90", "line 2: to_code must be a 3-letter uppercase code"),
+    ("SOL,PRX,0", "line 2: hu_distance must be a positive integer"),
+    ("SOL,PRX,1.5", "line 2: hu_distance must be a positive integer"),
+    ("SOL,SOL,5", "line 2: route must join two different gates"),
+    ("SOL,ALS,5", "line 2: duplicate route SOL->ALS"),
+    ("SOL,PRX", "line 2: expected 3 columns"),
+])
+async def test_invalid_edges_report_their_line(line, message):
+    """Validation stops at the first bad row and names its line number."""
+    with pytest.raises(ValueError, match=message):
+        await _collect(iter_edges(_aiter(["SOL,ALS,5", line]), "csv"))
+
+
+@pytest.mark.asyncio
+async def test_gates_reject_missing_names():
+    """Gate rows need a non-empty name."""
+    rows = await _collect(iter_gates(_aiter(['{"code": "SOL", "name": "Sol"}']), "ndjson"))
+    assert rows == [("SOL", "Sol")]
+    with pytest.raises(ValueError, match="line 1: name"):
+        await _collect(iter_gates(_aiter(["SOL, "]), "csv"))
+
+
+@pytest.mark.asyncio
+async def test_decode_lines_handles_split_chunks():
+    """Lines and multi-byte characters may straddle chunk boundaries."""
+    body = "AAA,Ä name\nBBB,Beta".encode()
+    chunks = [body[:5], body[5:7], body[7:]]
+    assert await _collect(decode_lines(_aiter(chunks))) == ["AAA,Ä name", "BBB,Beta"]
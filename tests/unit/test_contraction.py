@@ -0,0 +1,61 @@
+"""Unit tests for contraction-hierarchy preprocessing and queries."""
+
+import random
+
+from app.algorithms.contraction import build_contraction_hierarchy
+from app.algorithms.dijkstra import build_adjacency, dijkstra_shortest_path
+
+
+def _random_edges(seed: int, nodes: int, edges: int):
+    rng = random.Random(seed)
+    names = [f"N{i:03d}" for i in range(nodes)]
+    pairs = {(rng.choice(names), rng.choice(names)) for _ in range(edges)}
+    return names, [(u, v, rng.randint(1, 30)) for u, v in pairs if u != v]
+
+
+def test_contraction_matches_dijkstra_on_random_graphs():
+    """Queries return Dijkstra's cost and a valid, fully unpacked gate path."""
+    for seed in range(6):
+        names, edges = _random_edges(seed, nodes=45, edges=150)
+        weights = {(u, v): w for u, v, w in edges}
+        ch = build_contraction_hierarchy(build_adjacency(edges), names)
+        rng = random.Random(seed)
+        for _ in range(80):
+            start, target = rng.choice(names), rng.choice(names)
+            if start == target:
+                continue
+            expected = dijkstra_shortest_path(edges, start, target)
+            result = ch.path(start, target)
+            if expected is None:
+                assert result is None
+                continue
+            assert result is not None
+            assert result.total_weight == expected.total_weight
+            assert result.path[0] == start and result.path[-1] == target
+            # Every hop must be an original directed edge (shortcuts unpacked).
+            assert sum(
+                weights[(u, v)] for u, v in zip(result.path, result.path[1:])
+            ) == result.total_weight
+
+
+def test_contraction_respects_edge_direction():
+    """A one-way chain is only traversable forwards after contraction."""
+    edges = [("A", "B", 1), ("B", "C", 1), ("C", "D", 1)]
+    ch = build_contraction_hierarchy(build_adjacency(edges))
+    assert ch.path("A", "D").path == ["A", "B", "C", "D"]
+    assert ch.path("D", "A") is None
+    assert ch.path("A", "ZZZ") is None
+
+
+def test_contraction_with_tiny_witness_limit_stays_correct():
+    """Aborted witness searches only add redundant shortcuts."""
+    names, edges = _random_edges(seed=42, nodes=30, edges=100)
+    ch = build_contraction_hierarchy(
+        build_adjacency(edges), names, witness_settle_limit=1)
+    for start in names[:10]:
+        for target in names[-10:]:
+            expected = dijkstra_shortest_path(edges, start, target)
+            result = ch.path(start, target)
+            assert (result is None) == (expected is None)
+            if expected is not None and start != target:
+                assert result.total_weight == expected.total_weight
@@ -0,0 +1,45 @@
+"""Unit tests for the CSR graph representation and its Dijkstra."""
+
+import random
+
+import pytest
+
+from app.algorithms.csr import csr_from_edges, csr_shortest_path
+from app.algorithms.dijkstra import dijkstra_shortest_path
+
+
+def test_csr_layout_interns_codes_and_groups_edges():
+    """Edges are grouped by source id with offsets delimiting each row."""
+    graph = csr_from_edges([("B", "A", 2), ("A", "B", 1), ("A", "C", 3)], nodes=["D"])
+    assert graph.codes == ("A", "B", "C", "D")
+    assert list(graph.offsets) == [0, 2, 3, 3, 3]
+    assert graph.edge_count == 3
+    row = graph.index["A"]
+    out = {
+        (graph.codes[graph.targets[e]], graph.weights[e])
+        for e in range(graph.offsets[row], graph.offsets[row + 1])
+    }
+    assert out == {("B", 1), ("C", 3)}
+
+
+def test_csr_dijkstra_matches_dict_dijkstra():
+    """Same paths (including tie-breaks) as the dict-based implementation."""
+    rng = random.Random(11)
+    names = [f"N{i:03d}" for i in range(60)]
+    pairs = {(rng.choice(names), rng.choice(names)) for _ in range(240)}
+    edges = [(u, v, rng.randint(1, 20)) for u, v in pairs if u != v]
+    graph = csr_from_edges(edges)
+
+    for _ in range(200):
+        start, target = rng.choice(names), rng.choice(names)
+        assert csr_shortest_path(graph, start, target) == dijkstra_shortest_path(
+            edges, start, target)
+
+
+def test_csr_unknown_nodes_and_invalid_weights():
+    """Unknown nodes are unreachable; non-positive weights are rejected."""
+    graph = csr_from_edges([("A", "B", 1)])
+    assert csr_shortest_path(graph, "A", "Z") is None
+    assert csr_shortest_path(graph, "B", "A") is None
+    with pytest.raises(ValueError):
+        csr_from_edges([("A", "B", -1)])
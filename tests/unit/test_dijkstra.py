@@ -2,7 +2,11 @@
 
 import pytest
 
-from app.algorithms.dijkstra import dijkstra_shortest_path
+from app.algorithms.dijkstra import (
+    build_adjacency,
+    dijkstra_shortest_path,
+    shortest_path_tree,
+)
 
 
 def test_dijkstra_basic_path():
@@ -34,3 +38,19 @@ def test_dijkstra_rejects_non_positive_weights():
     """Validates Dijkstra precondition for positive weights."""
     with pytest.raises(ValueError):
         dijkstra_shortest_path([("A", "B", 0)], "A", "B")
+
+
+def test_shortest_path_tree_matches_point_queries():
+    """One full search answers every target like individual searches do."""
+    edges = [
+        ("A", "B", 1),
+        ("B", "C", 2),
+        ("A", "C", 10),
+        ("C", "D", 1),
+        ("E", "A", 1),
+    ]
+    tree = shortest_path_tree(build_adjacency(edges), "A")
+    for target in ["B", "C", "D"]:
+        assert tree.path_to(target) == dijkstra_shortest_path(edges, "A", target)
+    # E only has an outgoing edge into A, so it is not reachable from A.
+    assert tree.path_to("E") is None
@@ -0,0 +1,87 @@
+"""Unit tests for incremental all-pairs routing-table updates."""
+
+import random
+
+import pytest
+
+from app.algorithms.dijkstra import build_adjacency
+from app.algorithms.dynamic import EdgeChange, diff_adjacency, update_routing_table
+from app.algorithms.routing_table import build_routing_table
+
+
+def _random_edges(rng: random.Random, names, count: int):
+    pairs = {(rng.choice(names), rng.choice(names)) for _ in range(count)}
+    return {(u, v): rng.randint(1, 50) for u, v in pairs if u != v}
+
+
+def _assert_same_routing(updated, expected, weights):
+    """Distances match a full rebuild and every next-hop path is a real path."""
+    assert updated.codes == expected.codes
+    assert list(updated.dist) == list(expected.dist)
+    for start in updated.codes:
+        for target in updated.codes:
+            result = updated.path(start, target)
+            if result is None:
+                continue
+            hops = zip(result.path, result.path[1:])
+            assert sum(weights[hop] for hop in hops) == result.total_weight
+
+
+def test_diff_adjacency_reports_each_kind_of_change():
+    """Reweights, inserts and deletes are listed; unchanged edges are not."""
+    old = build_adjacency([("A", "B", 1), ("B", "C", 2), ("C", "A", 3)])
+    new = build_adjacency([("A", "B", 1), ("B", "C", 5), ("A", "C", 4)])
+    assert diff_adjacency(old, new) == [
+        EdgeChange("A", "C", None, 4),
+        EdgeChange("B", "C", 2, 5),
+        EdgeChange("C", "A", 3, None),
+    ]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_incremental_updates_match_full_rebuild(seed):
+    """Random raises, cuts, inserts and deletes give the rebuilt distances."""
+    rng = random.Random(seed)
+    names = [f"N{i:02d}" for i in range(30)]
+    weights = _random_edges(rng, names, 90)
+    table = build_routing_table(build_adjacency(
+        (u, v, w) for (u, v), w in weights.items()), names, version=1)
+
+    for version in range(2, 12):
+        old_adjacency = build_adjacency((u, v, w) for (u, v), w in weights.items())
+        for _ in range(rng.randint(1, 4)):
+            edge = rng.choice(sorted(weights))
+            kind = rng.choice(["raise", "cut", "delete", "insert"])
+            if kind == "raise":
+                weights[edge] += rng.randint(1, 40)
+            elif kind == "cut":
+                weights[edge] = max(1, weights[edge] - rng.randint(1, 40))
+            elif kind == "delete":
+                del weights[edge]
+            else:
+                u, v = rng.sample(names, 2)
+                weights[(u, v)] = rng.randint(1, 50)
+        new_adjacency = build_adjacency((u, v, w) for (u, v), w in weights.items())
+
+        updated = update_routing_table(
+            table, old_adjacency, new_adjacency, version, max_changes=10)
+        expected = build_routing_table(new_adjacency, names, version=version)
+        assert updated.version == version
+        _assert_same_routing(updated, expected, weights)
+        table = updated
+
+
+def test_update_falls_back_past_threshold_or_on_new_nodes():
+    """None asks the caller for a full rebuild; the input table is untouched."""
+    old = build_adjacency([("A", "B", 1), ("B", "C", 1)])
+    table = build_routing_table(old, ["A", "B", "C"], version=1)
+    before = list(table.dist)
+
+    cheaper = build_adjacency([("A", "B", 1), ("B", "C", 1), ("A", "C", 1)])
+    assert update_routing_table(table, old, cheaper, 2, max_changes=0) is None
+    new_node = build_adjacency([("A", "B", 1), ("B", "C", 1), ("C", "D", 1)])
+    assert update_routing_table(table, old, new_node, 2, max_changes=5) is None
+
+    updated = update_routing_table(table, old, cheaper, 2, max_changes=5)
+    assert updated.path("A", "C").path == ["A", "C"]
+    assert list(table.dist) == before
@@ -0,0 +1,50 @@
+"""Unit tests for the immutable graph snapshot."""
+
+import pytest
+
+from app.algorithms.dijkstra import shortest_path_on_adjacency
+from app.algorithms.graph import build_snapshot
+
+
+def test_snapshot_indexes_gates_and_adjacency():
+    """Snapshot exposes gate lookup plus directed adjacency usable by Dijkstra."""
+    snapshot = build_snapshot(
+        gates=[("AAA", "Alpha"), ("BBB", "Beta"), ("CCC", "Gamma")],
+        edges=[("AAA", "BBB", 1), ("BBB", "CCC", 2), ("AAA", "CCC", 10)],
+        version=7,
+    )
+    assert snapshot.version == 7
+    assert snapshot.edge_count == 3
+    assert snapshot.has_gate("BBB")
+    assert not snapshot.has_gate("ZZZ")
+
+    result = shortest_path_on_adjacency(snapshot.adjacency, "AAA", "CCC")
+    assert result is not None
+    assert result.path == ["AAA", "BBB", "CCC"]
+    assert result.total_weight == 3
+
+
+def test_snapshot_is_read_only():
+    """Snapshots cannot be mutated in place; changes require a new snapshot."""
+    snapshot = build_snapshot([("AAA", "Alpha")], [("AAA", "BBB", 1)], version=1)
+    with pytest.raises(TypeError):
+        snapshot.adjacency["AAA"] = ()  # type: ignore[index]
+    with pytest.raises(TypeError):
+        snapshot.gates["ZZZ"] = "Zeta"  # type: ignore[index]
+
+
+def test_snapshot_rejects_non_positive_weights():
+    """Weights are validated once, when the snapshot is built."""
+    with pytest.raises(ValueError):
+        build_snapshot([("AAA", "Alpha")], [("AAA", "BBB", 0)], version=1)
+
+
+def test_snapshot_fingerprint_tracks_content_only():
+    """Equal networks share a fingerprint regardless of row order or version."""
+    gates = [("AAA", "Alpha"), ("BBB", "Beta")]
+    edges = [("AAA", "BBB", 1), ("BBB", "AAA", 2)]
+    a = build_snapshot(gates, edges, version=1)
+    b = build_snapshot(list(reversed(gates)), list(reversed(edges)), version=2)
+    c = build_snapshot(gates, [("AAA", "BBB", 1), ("BBB", "AAA", 3)], version=1)
+    assert a.fingerprint == b.fingerprint
+    assert a.fingerprint != c.fingerprint
@@ -0,0 +1,42 @@
+"""Unit tests for the in-process Prometheus metrics registry."""
+
+import pytest
+
+from app.core.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and inclusive of their upper bound."""
+    registry = Registry()
+    hist = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value, route="/gates")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{route="/gates",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/gates",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/gates",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/gates"} 3.65' in lines
+    assert 'latency_seconds_count{route="/gates"} 4' in lines
+
+
+def test_counter_gauge_and_label_checks():
+    """Counters only go up, gauges both ways, and label sets must match."""
+    registry = Registry()
+    counter = registry.register(Counter("plans_total", "Plans.", ("mode",)))
+    gauge = registry.register(Gauge("in_flight", "In flight."))
+    counter.inc(mode='say "hi"')
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+    assert 'plans_total{mode="say \\"hi\\""} 1' in text
+    assert "in_flight 1" in text
+    with pytest.raises(ValueError):
+        counter.inc(-1, mode="x")
+    with pytest.raises(ValueError):
+        counter.inc(route="x")
+    with pytest.raises(ValueError):
+        registry.register(Counter("plans_total", "Again."))
@@ -0,0 +1,42 @@
+"""Unit tests for request-profile capture and the ring buffer."""
+
+import cProfile
+from datetime import datetime, timezone
+
+from app.core.profiling import ProfileStore, RequestProfile, top_entries
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_top_entries_sorted_by_cumulative_time():
+    """Entries are the heaviest functions by cumulative time, capped at limit."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    _busy(20_000)
+    profiler.disable()
+
+    entries = top_entries(profiler, limit=3)
+    assert len(entries) <= 3
+    cumulative = [e.cumulative_seconds for e in entries]
+    assert cumulative == sorted(cumulative, reverse=True)
+    assert any("_busy" in e.function for e in top_entries(profiler, limit=50))
+
+
+def test_store_is_bounded_and_single_slot():
+    """Oldest profiles are evicted; only one capture may run at a time."""
+    store = ProfileStore(capacity=2)
+    for _ in range(3):
+        store.add(RequestProfile(
+            id=store.next_id(), method="GET", path="/x", status=200,
+            duration_seconds=0.1, started_at=datetime.now(timezone.utc),
+            reason="sample", entries=(),
+        ))
+    assert [p.id for p in store.recent()] == [3, 2]
+
+    assert store.try_acquire()
+    assert not store.try_acquire()
+    store.release()
+    assert store.try_acquire()
+    store.release()
@@ -0,0 +1,44 @@
+"""Unit tests for read-replica rotation and health handling."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.session import Replica, ReplicaRouter
+
+
+def _replica(name: str, url: str = "sqlite+aiosqlite://") -> Replica:
+    engine = create_async_engine(url)
+    return Replica(
+        name=name,
+        engine=engine,
+        sessions=async_sessionmaker(bind=engine, class_=AsyncSession),
+    )
+
+
+def test_round_robin_skips_unhealthy_and_falls_back_to_primary():
+    """Healthy replicas rotate; when all are down, pick() returns None (primary)."""
+    a, b = _replica("a"), _replica("b")
+    router = ReplicaRouter([a, b])
+    assert [router.pick().name for _ in range(4)] == ["a", "b", "a", "b"]
+
+    router.mark_down(a)
+    assert [router.pick().name for _ in range(3)] == ["b", "b", "b"]
+
+    router.mark_down(b)
+    assert router.pick() is None
+    assert ReplicaRouter([]).pick() is None
+
+
+@pytest.mark.asyncio
+async def test_health_check_marks_unreachable_replicas_down(tmp_path):
+    """check() pings each replica and toggles its health."""
+    good = _replica("good", f"sqlite+aiosqlite:///{tmp_path / 'ok.db'}")
+    bad = _replica("bad", f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    router = ReplicaRouter([good, bad])
+    router.mark_down(good)
+
+    await router.check()
+    assert good.healthy
+    assert not bad.healthy
+    await good.engine.dispose()
+    await bad.engine.dispose()
@@ -0,0 +1,46 @@
+"""Unit tests for orjson responses and the per-snapshot body cache."""
+
+import json
+
+from fastapi import Response
+
+from app.algorithms.graph import build_snapshot
+from app.api.responses import ORJSONResponse, SnapshotBodyCache, prevalidated_response
+from app.api.schemas import CheapestPathOut
+
+
+def test_orjson_response_renders_models_like_pydantic():
+    """Constructed models render to the same JSON as model_dump_json()."""
+    model = CheapestPathOut(path=["SOL", "PRX"], total_hu=90, passengers=2,
+                            hyperspace_cost_gbp=18.0)
+    body = ORJSONResponse({"result": model}).body
+    assert json.loads(body) == {"result": json.loads(model.model_dump_json())}
+
+
+def test_prevalidated_response_keeps_injected_headers():
+    """ETag-style headers set on the injected Response are not lost."""
+    injected = Response()
+    injected.headers["ETag"] = '"abc"'
+    out = prevalidated_response({"ok": True}, injected)
+    assert out.headers["etag"] == '"abc"'
+    assert out.headers["content-type"] == "application/json"
+    assert json.loads(out.body) == {"ok": True}
+
+
+def test_body_cache_renders_once_per_snapshot():
+    """Bodies are reused until the network content changes."""
+    calls = []
+
+    def build():
+        calls.append(1)
+        return [{"code": "AAA"}]
+
+    cache = SnapshotBodyCache()
+    v1 = build_snapshot([("AAA", "A")], [], version=1)
+    assert cache.get(v1, "gates", build) == b'[{"code":"AAA"}]'
+    # Same content under a new version number is still a hit.
+    assert cache.get(build_snapshot([("AAA", "A")], [], version=2), "gates", build)
+    assert len(calls) == 1
+
+    cache.get(build_snapshot([("AAA", "Renamed")], [], version=3), "gates", build)
+    assert len(calls) == 2
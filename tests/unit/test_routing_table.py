@@ -0,0 +1,53 @@
+"""Unit tests for the all-pairs next-hop routing table."""
+
+import random
+
+from app.algorithms.dijkstra import build_adjacency, dijkstra_shortest_path
+from app.algorithms.routing_table import build_routing_table
+
+
+def _random_edges(seed: int, nodes: int, edges: int):
+    rng = random.Random(seed)
+    names = [f"N{i:02d}" for i in range(nodes)]
+    pairs = {(rng.choice(names), rng.choice(names)) for _ in range(edges)}
+    return names, [(u, v, rng.randint(1, 50)) for u, v in pairs if u != v]
+
+
+def test_routing_table_matches_dijkstra():
+    """Next-hop reconstruction yields the same cost as a fresh search."""
+    names, edges = _random_edges(seed=3, nodes=25, edges=80)
+    table = build_routing_table(build_adjacency(edges), names, version=1)
+
+    for start in names:
+        for target in names:
+            if start == target:
+                continue
+            expected = dijkstra_shortest_path(edges, start, target)
+            got = table.path(start, target)
+            if expected is None:
+                assert got is None
+                continue
+            assert got is not None
+            assert got.total_weight == expected.total_weight
+            assert got.path[0] == start and got.path[-1] == target
+
+
+def test_routing_table_directed_and_unknown_nodes():
+    """Reverse edges are not assumed and unknown nodes return None."""
+    table = build_routing_table(build_adjacency([("A", "B", 5)]), ["C"], version=1)
+    assert table.path("A", "B").path == ["A", "B"]
+    assert table.path("B", "A") is None
+    assert table.path("A", "C") is None
+    assert table.path("A", "Z") is None
+
+
+def test_routing_table_process_pool_build_is_identical():
+    """Spreading sources over a process pool produces the same matrices."""
+    names, edges = _random_edges(seed=9, nodes=20, edges=60)
+    adjacency = build_adjacency(edges)
+    serial = build_routing_table(adjacency, names, version=1)
+    pooled = build_routing_table(adjacency, names, version=1, workers=2)
+
+    assert pooled.dist == serial.dist
+    assert pooled.next_hop == serial.next_hop
+    assert serial.nbytes == len(serial.codes) ** 2 * (8 + 4)
@@ -0,0 +1,74 @@
+"""Unit tests for bidirectional Dijkstra and landmark A* (ALT)."""
+
+import random
+
+from app.algorithms.alt import alt_shortest_path, select_landmarks
+from app.algorithms.bidirectional import bidirectional_shortest_path
+from app.algorithms.dijkstra import (
+    build_adjacency,
+    build_reverse_adjacency,
+    dijkstra_shortest_path,
+    shortest_path_on_adjacency,
+)
+
+
+def _random_graph(seed: int, nodes: int, edges: int):
+    rng = random.Random(seed)
+    names = [f"N{i:03d}" for i in range(nodes)]
+    pairs = {(rng.choice(names), rng.choice(names)) for _ in range(edges)}
+    edge_list = [(u, v, rng.randint(1, 100)) for u, v in pairs if u != v]
+    graph = build_adjacency(edge_list)
+    return names, edge_list, graph, build_reverse_adjacency(graph)
+
+
+def test_engines_agree_with_dijkstra_on_random_graphs():
+    """Both engines return the same optimal cost (or None) as Dijkstra."""
+    for seed in range(5):
+        names, edges, graph, reverse = _random_graph(seed, nodes=40, edges=140)
+        landmarks = select_landmarks(graph, reverse, count=4)
+        rng = random.Random(seed)
+        for _ in range(60):
+            start, target = rng.choice(names), rng.choice(names)
+            if start == target:
+                continue
+            expected = dijkstra_shortest_path(edges, start, target)
+            for result in (
+                bidirectional_shortest_path(graph, reverse, start, target),
+                alt_shortest_path(graph, landmarks, start, target),
+            ):
+                if expected is None:
+                    assert result is None
+                    continue
+                assert result is not None
+                assert result.total_weight == expected.total_weight
+                assert result.path[0] == start and result.path[-1] == target
+                weights = {(u, v): w for u, v, w in edges}
+                assert sum(
+                    weights[(u, v)] for u, v in zip(result.path, result.path[1:])
+                ) == result.total_weight
+
+
+def test_bidirectional_respects_direction():
+    """The backward search uses the transpose, not an undirected view."""
+    graph = build_adjacency([("A", "B", 5), ("B", "C", 1)])
+    reverse = build_reverse_adjacency(graph)
+    assert bidirectional_shortest_path(graph, reverse, "A", "C").path == ["A", "B", "C"]
+    assert bidirectional_shortest_path(graph, reverse, "C", "A") is None
+
+
+def test_engines_report_settled_nodes():
+    """A long chain with a cheap dead-end fan shows ALT settling fewer nodes."""
+    edges = [(f"C{i}", f"C{i + 1}", 10) for i in range(30)]
+    edges += [("C0", f"F{i}", 1) for i in range(50)]
+    graph = build_adjacency(edges)
+    reverse = build_reverse_adjacency(graph)
+    landmarks = select_landmarks(graph, reverse, count=3)
+
+    plain = shortest_path_on_adjacency(graph, "C0", "C30")
+    bidi = bidirectional_shortest_path(graph, reverse, "C0", "C30")
+    alt = alt_shortest_path(graph, landmarks, "C0", "C30")
+
+    assert plain == bidi == alt
+    assert plain.settled > 50
+    assert 0 < bidi.settled < plain.settled
+    assert 0 < alt.settled < plain.settled
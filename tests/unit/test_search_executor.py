@@ -0,0 +1,76 @@
+"""Unit tests for inline vs pooled cheapest-path execution."""
+
+import pytest
+
+from app.algorithms.csr import csr_shortest_path
+from app.algorithms.graph import build_snapshot
+from app.core.config import settings
+from app.core.metrics import SEARCH_EXECUTOR_QUEUE_DEPTH, SEARCH_EXECUTOR_SEARCHES
+from app.services.search_executor import SearchExecutor
+
+GATES = [("AAA", "A"), ("BBB", "B"), ("CCC", "C"), ("DDD", "D")]
+EDGES = [("AAA", "BBB", 5), ("BBB", "CCC", 5), ("AAA", "CCC", 20), ("CCC", "DDD", 1)]
+
+
+@pytest.mark.asyncio
+async def test_small_graphs_stay_inline(monkeypatch):
+    """Below the edge threshold no pool is created, whatever the mode."""
+    monkeypatch.setattr(settings, "search_executor", "process")
+    monkeypatch.setattr(settings, "search_offload_min_edges", 100)
+    snapshot = build_snapshot(GATES, EDGES, version=1)
+    executor = SearchExecutor()
+    before = SEARCH_EXECUTOR_SEARCHES.value(executor="inline")
+
+    result = await executor.shortest_path(snapshot, "AAA", "DDD")
+    assert result.path == ["AAA", "BBB", "CCC", "DDD"]
+    assert executor._pool is None
+    assert SEARCH_EXECUTOR_SEARCHES.value(executor="inline") == before + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_pooled_search_matches_inline(monkeypatch, kind):
+    """Offloaded searches give the inline answer and follow graph updates."""
+    monkeypatch.setattr(settings, "search_executor", kind)
+    monkeypatch.setattr(settings, "search_offload_min_edges", 0)
+    monkeypatch.setattr(settings, "search_workers", 1)
+    executor = SearchExecutor()
+    try:
+        snapshot = build_snapshot(GATES, EDGES, version=1)
+        executor.prepare(snapshot)
+        result = await executor.shortest_path(snapshot, "AAA", "DDD")
+        assert result == csr_shortest_path(snapshot.csr, "AAA", "DDD")
+        assert await executor.shortest_path(snapshot, "DDD", "AAA") is None
+        assert SEARCH_EXECUTOR_QUEUE_DEPTH.value(executor=kind) == 0
+
+        # A new snapshot must not be answered from the old graph.
+        updated = build_snapshot(GATES, EDGES + [("AAA", "DDD", 2)], version=2)
+        executor.prepare(updated)
+        result = await executor.shortest_path(updated, "AAA", "DDD")
+        assert result.path == ["AAA", "DDD"]
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_searches_use_threads_until_the_pool_is_prepared(monkeypatch):
+    """No workers are spawned from a request; prepare() starts them off the loop."""
+    monkeypatch.setattr(settings, "search_executor", "process")
+    monkeypatch.setattr(settings, "search_offload_min_edges", 0)
+    monkeypatch.setattr(settings, "search_workers", 1)
+    executor = SearchExecutor()
+    try:
+        snapshot = build_snapshot(GATES, EDGES, version=1)
+        before = SEARCH_EXECUTOR_SEARCHES.value(executor="thread")
+        result = await executor.shortest_path(snapshot, "AAA", "DDD")
+        assert result.path == ["AAA", "BBB", "CCC", "DDD"]
+        assert executor._pool is None
+        assert SEARCH_EXECUTOR_SEARCHES.value(executor="thread") == before + 1
+
+        executor.prepare(snapshot)
+        assert executor._pool_kind == "process" and executor._pool_version == 1
+        # A stale snapshot never replaces a newer pool.
+        executor.prepare(build_snapshot(GATES, EDGES, version=0))
+        assert executor._pool_version == 1
+    finally:
+        executor.shutdown()
@@ -0,0 +1,80 @@
+"""Unit tests for publishing and attaching mmap-backed graph structures."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.algorithms.csr import csr_shortest_path
+from app.algorithms.graph import build_snapshot
+from app.algorithms.routing_table import build_routing_table
+from app.services.shared_graph import SharedGraphStore, owned_csr
+
+GATES = [("AAA", "A"), ("BBB", "B"), ("CCC", "C"), ("DDD", "D")]
+EDGES = [("AAA", "BBB", 5), ("BBB", "CCC", 5), ("AAA", "CCC", 20), ("CCC", "DDD", 1)]
+
+
+def _search_in_other_process(directory: str, fingerprint: str):
+    graph = SharedGraphStore(directory).attach_csr(fingerprint)
+    return csr_shortest_path(graph, "AAA", "DDD")
+
+
+def test_csr_is_published_once_and_attached_read_only(tmp_path):
+    """Workers share one file; the mapped arrays answer searches but are immutable."""
+    snapshot = build_snapshot(GATES, EDGES, version=1)
+    shared = SharedGraphStore(tmp_path).csr_for(snapshot)
+    assert isinstance(shared.targets, memoryview)
+    assert csr_shortest_path(shared, "AAA", "DDD") == csr_shortest_path(
+        snapshot.csr, "AAA", "DDD")
+    with pytest.raises(TypeError):
+        shared.weights[0] = 1
+
+    # Another "worker" with its own version counter attaches the same file.
+    other = build_snapshot(GATES, EDGES, version=7)
+    assert SharedGraphStore(tmp_path).csr_for(other).codes == shared.codes
+    assert len(list(tmp_path.glob("csr-*.bin"))) == 1
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        result = pool.submit(
+            _search_in_other_process, str(tmp_path), snapshot.fingerprint).result()
+    assert result.path == ["AAA", "BBB", "CCC", "DDD"]
+    assert owned_csr(shared).targets.tolist() == list(snapshot.csr.targets)
+
+
+def test_routing_table_built_once_and_old_versions_pruned(tmp_path):
+    """The second worker attaches instead of building; only `keep` versions stay."""
+    builds = []
+
+    def build(snapshot):
+        def run():
+            builds.append(snapshot.version)
+            return build_routing_table(snapshot.adjacency, list(snapshot.gates), snapshot.version)
+        return run
+
+    first = build_snapshot(GATES, EDGES, version=1)
+    table = SharedGraphStore(tmp_path).routing_table_for(first, build(first))
+    second_worker = build_snapshot(GATES, EDGES, version=3)
+    attached = SharedGraphStore(tmp_path).routing_table_for(second_worker, build(second_worker))
+    assert builds == [1]
+    assert attached.version == 3
+    assert attached.path("AAA", "DDD") == table.path("AAA", "DDD")
+
+    store = SharedGraphStore(tmp_path, keep=2)
+    for hu in (2, 3, 4):
+        changed = build_snapshot(GATES, EDGES[:-1] + [("CCC", "DDD", hu)], version=hu)
+        store.routing_table_for(changed, build(changed))
+    assert len(list(tmp_path.glob("table-*.bin"))) == 2
+
+
+def test_pruned_before_attach_falls_back_to_local_copies(tmp_path, monkeypatch):
+    """A file pruned by another worker right after publishing never yields None."""
+    store = SharedGraphStore(tmp_path)
+    snapshot = build_snapshot(GATES, EDGES, version=1)
+    table = build_routing_table(snapshot.adjacency, list(snapshot.gates), snapshot.version)
+    monkeypatch.setattr(store, "attach_csr", lambda fingerprint: None)
+    monkeypatch.setattr(store, "attach_routing_table", lambda snapshot: None)
+
+    assert store.csr_for(snapshot) is snapshot.csr
+    assert store.routing_table_for(snapshot, lambda: table) is table
+    # Lock files are per kind and network, so a table build never blocks CSR attaches.
+    assert {p.name for p in tmp_path.glob(".*.lock")} == {
+        f".csr-{snapshot.fingerprint}.lock", f".table-{snapshot.fingerprint}.lock"}
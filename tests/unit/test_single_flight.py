@@ -0,0 +1,91 @@
+"""Unit tests for coalescing identical concurrent calls."""
+
+import asyncio
+import contextvars
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    """Callers with the same key get one call's result; other keys run separately."""
+    flight = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def call(value):
+        calls.append(value)
+        await release.wait()
+        return value
+
+    pending = [
+        asyncio.ensure_future(flight.do("a", lambda: call(1))),
+        asyncio.ensure_future(flight.do("a", lambda: call(2))),
+        asyncio.ensure_future(flight.do("b", lambda: call(3))),
+    ]
+    await asyncio.sleep(0)
+    assert flight.in_flight() == 2
+    release.set()
+
+    assert await asyncio.gather(*pending) == [(1, False), (1, True), (3, False)]
+    assert calls == [1, 3]
+    assert flight.in_flight() == 0
+    # Finished calls are not cached.
+    assert await flight.do("a", lambda: call(4)) == (4, False)
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise LookupError("boom")
+
+    results = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+    assert all(isinstance(r, LookupError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    """The shared call survives one caller leaving and stops once all have."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("k", call))
+    second = asyncio.ensure_future(flight.do("k", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == ("done", True)
+
+    release.clear()
+    only = asyncio.ensure_future(flight.do("k", call))
+    await asyncio.sleep(0)
+    task = flight._flights["k"].task
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_call_does_not_run_in_the_first_callers_context():
+    """Per-request context (e.g. Server-Timing collectors) is not shared with the call."""
+    request = contextvars.ContextVar("request", default=None)
+    request.set("first")
+
+    async def call():
+        return request.get()
+
+    assert await SingleFlight().do("k", call) == (None, False)
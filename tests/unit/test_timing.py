@@ -0,0 +1,31 @@
+"""Unit tests for Server-Timing phase collection."""
+
+from app.core.timing import current_timing, start_timing, stop_timing, timed
+
+
+def test_phases_accumulate_and_render_in_first_seen_order():
+    """Repeated phases sum; the header lists phases in ms in first-seen order."""
+    token = start_timing()
+    try:
+        with timed("db"):
+            pass
+        with timed("search"):
+            pass
+        with timed("db"):
+            pass
+        timing = current_timing()
+        timing.add("db", 0.0015)
+        header = timing.header_value()
+    finally:
+        stop_timing(token)
+
+    assert list(timing.phases) == ["db", "search"]
+    assert header.startswith("db;dur=1.5") and ", search;dur=" in header
+    assert current_timing() is None
+
+
+def test_timed_is_a_no_op_outside_a_request():
+    """Without a collector, timed() just runs the block."""
+    with timed("db"):
+        value = 42
+    assert value == 42 and current_timing() is None
@@ -0,0 +1,59 @@
+"""Parity tests for the vectorised transport planner."""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.algorithms.transport_batch import compute_transport_plans
+from app.algorithms.transport_planner import compute_transport_plan
+
+_COLUMNS = [
+    "hstc_trips",
+    "personal_trips",
+    "hstc_trip_cost_gbp",
+    "personal_trip_cost_gbp",
+    "total_capacity",
+    "total_cost_gbp",
+    "hstc_total_gbp",
+    "personal_total_gbp",
+    "hstc_only_total_gbp",
+    "personal_only_total_gbp",
+]
+
+
+def test_batch_matches_scalar_planner_row_by_row():
+    """Every column equals the scalar planner's value for that row."""
+    rng = random.Random(5)
+    rows = []
+    for _ in range(5000):
+        # Mix integers, 1-3 decimal places and exact half-cent boundaries.
+        distance = rng.choice([
+            rng.randint(1, 500),
+            round(rng.uniform(0.01, 500), rng.randint(1, 3)),
+            rng.randint(1, 2000) / 200,
+        ])
+        rows.append((distance, rng.randint(1, 40), rng.randint(0, 10)))
+    # Known tie / rounding edge cases from the scalar tests.
+    rows += [(1, 4, 0), (1, 5, 0), (1, 6, 0), (1.5, 4, 0), (1.5, 5, 0), (1, 7, 2)]
+
+    d, p, k = (np.array(col) for col in zip(*rows))
+    batch = compute_transport_plans(d, p, k)
+
+    for i, (distance, passengers, parking) in enumerate(rows):
+        plan = compute_transport_plan(distance, passengers, parking)
+        for name in _COLUMNS:
+            assert getattr(batch, name)[i] == getattr(plan, name), (name, rows[i])
+        assert bool(batch.hstc_chosen[i]) == (plan.hstc_trips > 0)
+
+
+def test_batch_validation_errors():
+    """Invalid rows and mismatched columns are rejected like the scalar planner."""
+    with pytest.raises(ValueError, match="distance_au"):
+        compute_transport_plans([1.0, 0.0], [1, 1], [0, 0])
+    with pytest.raises(ValueError, match="passengers"):
+        compute_transport_plans([1.0], [0], [0])
+    with pytest.raises(ValueError, match="parking_days"):
+        compute_transport_plans([1.0], [1], [-1])
+    with pytest.raises(ValueError, match="same length"):
+        compute_transport_plans([1.0, 2.0], [1], [0])
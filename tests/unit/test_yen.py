@@ -0,0 +1,51 @@
+"""Unit tests for K-shortest loop-free paths (Yen's algorithm)."""
+
+import random
+
+from app.algorithms.dijkstra import build_adjacency, build_reverse_adjacency
+from app.algorithms.yen import k_shortest_paths
+
+
+def _all_simple_path_costs(edges, start, target):
+    graph = build_adjacency(edges)
+    costs = []
+
+    def walk(node, seen, cost):
+        if node == target:
+            costs.append(cost)
+            return
+        for neighbor, weight in graph.get(node, ()):
+            if neighbor not in seen:
+                walk(neighbor, seen | {neighbor}, cost + weight)
+
+    walk(start, {start}, 0)
+    return sorted(costs)
+
+
+def test_k_shortest_matches_brute_force_costs():
+    """The K returned costs equal the K smallest simple-path costs."""
+    for seed in range(8):
+        rng = random.Random(seed)
+        names = [f"N{i}" for i in range(9)]
+        pairs = {(rng.choice(names), rng.choice(names)) for _ in range(24)}
+        edges = [(u, v, rng.randint(1, 9)) for u, v in pairs if u != v]
+        graph = build_adjacency(edges)
+        reverse = build_reverse_adjacency(graph)
+
+        for start, target in [("N0", "N8"), ("N3", "N5")]:
+            expected = _all_simple_path_costs(edges, start, target)[:5]
+            paths = k_shortest_paths(graph, reverse, start, target, k=5)
+            assert [p.total_weight for p in paths] == expected
+            for p in paths:
+                assert p.path[0] == start and p.path[-1] == target
+                assert len(set(p.path)) == len(p.path)
+            assert len({tuple(p.path) for p in paths}) == len(paths)
+
+
+def test_k_shortest_stops_when_alternatives_run_out():
+    """Returns fewer than k paths when the graph has fewer simple paths."""
+    edges = [("A", "B", 1), ("B", "C", 1), ("A", "C", 5), ("C", "A", 1)]
+    graph = build_adjacency(edges)
+    paths = k_shortest_paths(graph, build_reverse_adjacency(graph), "A", "C", k=10)
+    assert [p.path for p in paths] == [["A", "B", "C"], ["A", "C"]]
+    assert k_shortest_paths(graph, build_reverse_adjacency(graph), "C", "B", k=0) == []